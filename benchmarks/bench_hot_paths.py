@@ -0,0 +1,257 @@
+"""
+Benchmarks for the finance and catalogue hot paths.
+
+Each case is timed on synthetic inputs of growing size (70 items up to
+10^6) and reported as best-of-N wall time, throughput and the scaling
+exponent between consecutive sizes (1.0 = linear). Results can be saved
+as a baseline and later checked against it:
+
+    python benchmarks/bench_hot_paths.py                    # report
+    python benchmarks/bench_hot_paths.py --full             # include 10^6
+    python benchmarks/bench_hot_paths.py --save-baseline    # store timings
+    python benchmarks/bench_hot_paths.py --check            # exit 1 on regression
+
+Cases are named after the page functions whose work they cover.
+"""
+import argparse
+import atexit
+import json
+import math
+import random
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.archetypes import ArchetypeMatrix, load_archetypes  # noqa: E402
+from utils.catalogue import CATALOGUE_PATH, load_catalogue  # noqa: E402
+from utils.finance import compute_irr, compute_npv, npv_surface  # noqa: E402
+from utils.irr import irr_batch  # noqa: E402
+from utils.search import SearchIndex  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+SIZES = (70, 1_000, 10_000, 100_000)
+FULL_SIZES = SIZES + (1_000_000,)
+RATES = np.linspace(0.0, 0.4, 24)
+YEARS = 10
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[int], Callable[[], Any]]
+    max_n: int = FULL_SIZES[-1]
+
+
+# ----------------------------
+# Synthetic inputs
+# ----------------------------
+def synthetic_cash_flows(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    flows = rng.uniform(0, 60_000, (n, YEARS + 1))
+    flows[:, 0] = -rng.uniform(50_000, 250_000, n)
+    return flows
+
+
+def synthetic_catalogue(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """n models shaped like data/business_models.json, cycling real entries."""
+    with open(CATALOGUE_PATH, "r", encoding="utf-8") as f:
+        real = json.load(f)
+    rng = random.Random(seed)
+    vocab = sorted({t for bm in real for t in bm["tags"]})
+    words = sorted({w for bm in real for w in bm["description"].split()})
+    models = []
+    for i in range(n):
+        base = dict(real[i % len(real)])
+        base["id"] = f"BM{i:07d}"
+        base["name"] = f"{base['name']} {i}"
+        base["tags"] = rng.sample(vocab, 4)
+        base["description"] = " ".join(rng.choices(words, k=14))
+        base["difficulty"] = rng.randint(1, 5)
+        models.append(base)
+    return models
+
+
+_catalogues: Dict[int, List[Dict[str, Any]]] = {}
+
+
+def catalogue(n: int) -> List[Dict[str, Any]]:
+    if n not in _catalogues:
+        _catalogues[n] = synthetic_catalogue(n)
+    return _catalogues[n]
+
+
+# ----------------------------
+# Cases
+# ----------------------------
+def _npv_surface(n):
+    flows = synthetic_cash_flows(n)
+    return lambda: npv_surface(flows, RATES)
+
+
+def _compute_npv(n):
+    series = [list(enumerate(row)) for row in synthetic_cash_flows(n)]
+    return lambda: [compute_npv(s, 0.12) for s in series]
+
+
+def _irr_batch(n):
+    flows = synthetic_cash_flows(n)
+    return lambda: irr_batch(flows)
+
+
+def _compute_irr(n):
+    series = [list(enumerate(row)) for row in synthetic_cash_flows(n)]
+    return lambda: [compute_irr(s) for s in series]
+
+
+def _load_archetype_matrix(n):
+    models, archetypes = catalogue(n), load_archetypes()
+    return lambda: ArchetypeMatrix(models, archetypes)
+
+
+def _filter_by_archetype(n):
+    archetypes = load_archetypes()
+    matrix = ArchetypeMatrix(catalogue(n), archetypes)
+    names = list(archetypes)
+    return lambda: [matrix.top_n(a, 5) for a in names]
+
+
+def _search_index_build(n):
+    models = catalogue(n)
+    return lambda: SearchIndex(models)
+
+
+def _filter_by_search(n):
+    index = SearchIndex(catalogue(n))
+    queries = ["saas", "carbon credit", "comm", "platform data", "fran"]
+    return lambda: [index.search(q) for q in queries]
+
+
+def _catalogue_file(n) -> Path:
+    tmp = Path(tempfile.mkdtemp(prefix="bench-catalogue-"))
+    atexit.register(shutil.rmtree, tmp, ignore_errors=True)
+    source = tmp / "business_models.json"
+    source.write_text(json.dumps(catalogue(n)), encoding="utf-8")
+    return source
+
+
+def _load_business_models(n):
+    source = _catalogue_file(n)
+
+    def run():
+        for f in source.parent.glob("*.bin"):
+            f.unlink()
+        for f in source.parent.glob("*.pkl"):
+            f.unlink()
+        return load_catalogue(source, cache_dir=source.parent)
+
+    return run
+
+
+def _load_business_models_snapshot(n):
+    source = _catalogue_file(n)
+    load_catalogue(source, cache_dir=source.parent)
+    return lambda: load_catalogue(source, cache_dir=source.parent)
+
+
+CASES = [
+    Case("npv_surface", _npv_surface),
+    Case("compute_npv", _compute_npv, max_n=10_000),
+    Case("irr_batch", _irr_batch),
+    Case("compute_irr", _compute_irr, max_n=1_000),
+    Case("load_archetype_matrix", _load_archetype_matrix),
+    Case("filter_by_archetype", _filter_by_archetype),
+    Case("search_index_build", _search_index_build, max_n=100_000),
+    Case("filter_by_search", _filter_by_search, max_n=100_000),
+    Case("load_business_models", _load_business_models, max_n=100_000),
+    Case("load_business_models_snapshot", _load_business_models_snapshot, max_n=100_000),
+]
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+def time_case(fn: Callable[[], Any], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, repeat: int, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for case in CASES:
+        if only and case.name not in only:
+            continue
+        timings: Dict[str, float] = {}
+        prev = None
+        for n in sizes:
+            if n > case.max_n:
+                continue
+            seconds = time_case(case.setup(n), repeat)
+            timings[str(n)] = seconds
+            slope = ""
+            if prev is not None and prev[1] > 0:
+                slope = f"{math.log(seconds / prev[1]) / math.log(n / prev[0]):5.2f}"
+            print(f"{case.name:<30} {n:>9,} {seconds * 1e3:>11.3f} ms {n / seconds:>14,.0f}/s {slope:>8}")
+            prev = (n, seconds)
+        results[case.name] = timings
+    return results
+
+
+def check(results, baseline, tolerance: float) -> List[str]:
+    failures = []
+    for name, timings in results.items():
+        for n, seconds in timings.items():
+            ref = baseline.get(name, {}).get(n)
+            if ref is not None and seconds > ref * (1 + tolerance):
+                failures.append(f"{name} n={n}: {seconds * 1e3:.2f} ms vs baseline {ref * 1e3:.2f} ms")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--full", action="store_true", help="include 10^6-item runs")
+    parser.add_argument("--sizes", type=int, nargs="+", help="override the sizes to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="run only these cases")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown (0.5 = 50%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (FULL_SIZES if args.full else SIZES)
+    print(f"{'case':<30} {'n':>9} {'best time':>14} {'throughput':>16} {'scaling':>8}")
+    results = run(sizes, args.repeat, args.only)
+
+    if args.save_baseline:
+        stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        for name, timings in results.items():
+            stored.setdefault(name, {}).update(timings)
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}", file=sys.stderr)
+            return 2
+        failures = check(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in failures:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
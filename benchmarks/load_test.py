@@ -0,0 +1,358 @@
+"""
+Classroom-scale load test for the Streamlit pages.
+
+Drives N simulated sessions at once through scripted interactions
+(scripts are dealt round-robin across sessions) using Streamlit's
+headless AppTest. Sessions run on threads of this one process, the way a
+Streamlit server runs every session's reruns, sharing its caches and
+memory. AppTest swaps process-global runtime state on every run, so
+reruns are executed one at a time; a rerun's latency includes the time it
+waited for its turn, which is what a student sees once the server's
+interpreter is saturated. For every concurrency level the report shows
+rerun latency percentiles, mean service time (the rerun alone),
+throughput and the peak resident memory of the process.
+
+    python benchmarks/load_test.py                          # 1, 5, 10, 25 sessions
+    python benchmarks/load_test.py --sessions 1 10 50 --rounds 5
+    python benchmarks/load_test.py --scripts financial --think-ms 500
+    python benchmarks/load_test.py --json load.json         # keep raw results
+
+Scripts, one or more per page:
+    trl              TRL, archetype, costs and growth for the report (01)
+    business_models  archetype buttons, typed searches, show-all, table view (02)
+    financial        NPV and IRR inputs and buttons, cost inputs, Monte Carlo
+                     draws and cash-flow grid size (03)
+    market           measure, segment filters and breakdowns, sizing (04)
+    stage_gate       simulated futures and reruns of the simulation (05)
+    prior_art        described inventions searched at several k (06)
+    risk             driver spread, tornado metric and prices (07)
+    financing        ranking metric, loan tenors and horizon (08)
+
+The prior-art page runs against a synthetic collection of --abstracts
+documents built in a temporary directory (PRIOR_ART_DIR), so the shared
+collection under data/prior_art/ is never touched.
+"""
+import argparse
+import atexit
+import json
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from utils.archetypes import load_archetypes  # noqa: E402
+from utils.catalogue import CATALOGUE_PATH  # noqa: E402
+
+LEVELS = (1, 5, 10, 25)
+TIMEOUT = 120
+SEARCHES = ["saas", "carbon", "community", "franchise", "platform data", "subscription", "market"]
+INVENTIONS = [
+    "A solar-powered cold room that stores excess energy as ice for night-time cooling",
+    "Subscription platform matching small farmers with refrigerated transport capacity",
+    "Low-cost water filter cartridge made from agricultural waste with a refill service",
+    "Battery swapping network for electric motorcycles used by delivery riders",
+    "Sensor kit that predicts pump failures in municipal water systems from vibration data",
+]
+
+# A script yields (step name, action); the harness reruns the app after
+# each action and times that rerun.
+Step = Tuple[str, Callable[[AppTest], object]]
+Script = Callable[[random.Random], Iterator[Step]]
+
+
+# ----------------------------
+# Interaction scripts
+# ----------------------------
+def business_models(rng: random.Random) -> Iterator[Step]:
+    archetype = rng.choice(list(load_archetypes()))
+    yield "archetype", lambda at: next(b for b in at.button if b.label == archetype).click()
+    query = rng.choice(SEARCHES)
+    # Typing: one rerun per keystroke burst, as Streamlit commits on blur/enter
+    for end in sorted({max(2, len(query) // 2), len(query)}):
+        yield "search", lambda at, text=query[:end]: at.text_input[0].input(text)
+    yield "show_all", lambda at: at.checkbox[0].check()
+    yield "table_view", lambda at: at.radio(key="bm_view").set_value("Compact table")
+    yield "cards_view", lambda at: at.radio(key="bm_view").set_value("Cards")
+    yield "clear", lambda at: (at.text_input[0].input(""), at.checkbox[0].uncheck())
+
+
+def financial(rng: random.Random) -> Iterator[Step]:
+    yield "costs", lambda at: at.number_input(key="cost_fixed").set_value(float(rng.randrange(10_000, 200_000, 1_000)))
+    yield "npv_inputs", lambda at: (
+        at.number_input(key="npv_init").set_value(float(rng.randrange(50_000, 200_000, 5_000))),
+        at.slider(key="npv_rate").set_value(rng.randint(5, 30)),
+    )
+    yield "npv_calc", lambda at: at.button(key="npv_btn").click()
+    yield "irr_inputs", lambda at: (
+        at.number_input(key="irr_init").set_value(float(rng.randrange(50_000, 200_000, 5_000))),
+        at.number_input(key="irr_cf_0").set_value(float(rng.randrange(-50_000, 150_000, 5_000))),
+    )
+    yield "irr_calc", lambda at: at.button(key="irr_btn").click()
+    yield "monte_carlo", lambda at: at.select_slider(key="mc_draws").set_value(rng.choice([10_000, 100_000]))
+    yield "cash_grid", lambda at: at.select_slider(key="cf_steps").set_value(rng.choice([5, 10, 15]))
+
+
+def trl(rng: random.Random) -> Iterator[Step]:
+    yield "level", lambda at: at.slider(key="trl_level").set_value(rng.randint(1, 9))
+    yield "archetype", lambda at: at.selectbox(key="trl_archetype").select_index(
+        rng.randrange(len(at.selectbox(key="trl_archetype").options))
+    )
+    yield "costs", lambda at: (
+        at.number_input(key="trl_price").set_value(float(rng.randrange(200, 2_000, 50))),
+        at.number_input(key="trl_fixed").set_value(float(rng.randrange(5_000, 100_000, 1_000))),
+    )
+    yield "growth", lambda at: at.slider(key="trl_growth").set_value(rng.randint(0, 100))
+
+
+def market(rng: random.Random) -> Iterator[Step]:
+    yield "filters", lambda at: at.multiselect(key="ms_filter_cols").set_value(
+        rng.sample(at.multiselect(key="ms_filter_cols").options, 2)
+    )
+    yield "size", lambda at: (
+        at.selectbox(key="ms_measure").select_index(rng.randrange(len(at.selectbox(key="ms_measure").options))),
+        at.slider(key="ms_share").set_value(round(rng.uniform(1, 20), 1)),
+        at.multiselect(key="ms_group").set_value(rng.sample(at.multiselect(key="ms_group").options, 1)),
+        at.button(key="FormSubmitter:ms_form-Size the market").click(),
+    )
+    yield "clear", lambda at: at.multiselect(key="ms_filter_cols").set_value([])
+
+
+def stage_gate(rng: random.Random) -> Iterator[Step]:
+    for _ in range(2):
+        yield "simulate", lambda at: (
+            at.select_slider(key="sg_runs").set_value(rng.choice([1_000, 5_000, 10_000, 25_000])),
+            at.button(key="FormSubmitter:sg_form-Run simulation").click(),
+        )
+
+
+def prior_art(rng: random.Random) -> Iterator[Step]:
+    for text in rng.sample(INVENTIONS, 2):
+        yield "search", lambda at, text=text: at.text_area(key="ip_query").input(text)
+    yield "top_k", lambda at: at.slider(key="ip_k").set_value(rng.choice([5, 20, 50]))
+    yield "clear", lambda at: at.text_area(key="ip_query").input("")
+
+
+def risk(rng: random.Random) -> Iterator[Step]:
+    yield "spread", lambda at: at.slider(key="rk_spread").set_value(rng.choice([10, 20, 30, 50]))
+    yield "metric", lambda at: at.radio(key="rk_metric").set_value(rng.choice(["npv", "profit"]))
+    yield "price", lambda at: at.number_input(key="rk_price").set_value(float(rng.randrange(300, 1_200, 50)))
+
+
+def financing(rng: random.Random) -> Iterator[Step]:
+    yield "metric", lambda at: at.selectbox(key="fo_metric").select_index(
+        rng.randrange(len(at.selectbox(key="fo_metric").options))
+    )
+    yield "tenors", lambda at: at.multiselect(key="fo_loan_tenor").set_value(
+        sorted(rng.sample([12, 24, 36, 48, 60, 72, 84], 4))
+    )
+    yield "horizon", lambda at: at.slider(key="fo_horizon").set_value(rng.choice([36, 60, 84, 120]))
+
+
+SCRIPTS: Dict[str, Tuple[str, Script]] = {
+    "trl": ("pages/01_TRL_levels.py", trl),
+    "business_models": ("pages/02_Business_Models.py", business_models),
+    "financial": ("pages/03_Financial_Projections.py", financial),
+    "market": ("pages/04_Market_Study_Guide.py", market),
+    "stage_gate": ("pages/05_Commercialisation.py", stage_gate),
+    "prior_art": ("pages/06_IP_Management.py", prior_art),
+    "risk": ("pages/07_Risk.py", risk),
+    "financing": ("pages/08_Financial Options.py", financing),
+}
+
+
+def synthetic_prior_art(directory: Path, n: int, seed: int = 0) -> None:
+    """n abstracts built from the catalogue's vocabulary, indexed under PRIOR_ART_DIR."""
+    with open(CATALOGUE_PATH, "r", encoding="utf-8") as f:
+        words = sorted({w for bm in json.load(f) for w in bm["description"].split()})
+    words += sorted({w for text in INVENTIONS for w in text.lower().split()})
+    rng = random.Random(seed)
+    corpus = directory / "prior_art"
+    corpus.mkdir()
+    with open(corpus / "abstracts.jsonl", "w", encoding="utf-8") as f:
+        for i in range(n):
+            abstract = " ".join(rng.choices(words, k=rng.randint(60, 160)))
+            f.write(json.dumps({"id": f"LT{i:07d}", "title": " ".join(rng.choices(words, k=6)), "abstract": abstract}) + "\n")
+    os.environ["PRIOR_ART_DIR"] = str(corpus)
+
+    from utils import prior_art as pa  # reads PRIOR_ART_DIR on import
+
+    pa.PriorArtIndex().add_files(pa.corpus_files())
+
+
+# ----------------------------
+# Measurement
+# ----------------------------
+def rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PeakMemory:
+    """Samples RSS on a background thread and keeps the maximum."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __enter__(self) -> "PeakMemory":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+
+# AppTest is not safe to run concurrently; see the module docstring.
+RUN_LOCK = threading.Lock()
+
+
+@dataclass
+class SessionResult:
+    script: str
+    latencies: List[Tuple[str, float]] = field(default_factory=list)
+    service: List[float] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+def run_session(script: str, rounds: int, think: float, seed: int, start: threading.Barrier) -> SessionResult:
+    page, steps = SCRIPTS[script]
+    rng = random.Random(seed)
+    result = SessionResult(script)
+    at = AppTest.from_file(str(ROOT / page), default_timeout=TIMEOUT)
+    start.wait()
+
+    def rerun(step: str) -> None:
+        t0 = time.perf_counter()
+        with RUN_LOCK:
+            t1 = time.perf_counter()
+            at.run()
+            t2 = time.perf_counter()
+        result.latencies.append((step, t2 - t0))
+        result.service.append(t2 - t1)
+        if at.exception:
+            result.errors.append(f"{step}: {at.exception[0].message}")
+
+    rerun("first_load")
+    for _ in range(rounds):
+        for step, action in steps(rng):
+            if think:
+                time.sleep(rng.uniform(0.5, 1.5) * think)
+            try:
+                action(at)
+            except Exception as exc:  # a widget missing after an earlier failure
+                result.errors.append(f"{step}: {exc!r}")
+                continue
+            rerun(step)
+    return result
+
+
+def run_level(sessions: int, scripts: List[str], rounds: int, think: float, seed: int) -> Dict[str, object]:
+    barrier = threading.Barrier(sessions)
+    with PeakMemory() as memory, ThreadPoolExecutor(max_workers=sessions) as pool:
+        t0 = time.perf_counter()
+        futures = [
+            pool.submit(run_session, scripts[i % len(scripts)], rounds, think, seed + i, barrier)
+            for i in range(sessions)
+        ]
+        results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - t0
+
+    def percentiles(values: List[float]) -> Dict[str, float]:
+        if not values:
+            return {}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {"p50_ms": p50 * 1e3, "p95_ms": p95 * 1e3, "p99_ms": p99 * 1e3, "reruns": len(values)}
+
+    latencies = [s for r in results for _, s in r.latencies]
+    service = [s for r in results for s in r.service]
+    by_step: Dict[str, List[float]] = {}
+    for r in results:
+        for step, s in r.latencies:
+            by_step.setdefault(f"{r.script}.{step}", []).append(s)
+    return {
+        "sessions": sessions,
+        "seconds": elapsed,
+        "reruns_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_service_ms": float(np.mean(service)) * 1e3 if service else 0.0,
+        "peak_rss_mb": memory.peak / 2**20,
+        "errors": [e for r in results for e in r.errors],
+        **percentiles(latencies),
+        "steps": {step: percentiles(values) for step, values in sorted(by_step.items())},
+    }
+
+
+# ----------------------------
+# Report
+# ----------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(LEVELS), help="concurrency levels to run")
+    parser.add_argument("--scripts", nargs="+", choices=sorted(SCRIPTS), default=sorted(SCRIPTS))
+    parser.add_argument("--rounds", type=int, default=3, help="times each session repeats its script")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between interactions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--abstracts", type=int, default=20_000, help="documents in the synthetic prior-art collection")
+    parser.add_argument("--steps", action="store_true", help="also print percentiles per interaction step")
+    parser.add_argument("--json", type=Path, help="write the full results here")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    if "prior_art" in args.scripts:
+        workdir = Path(tempfile.mkdtemp(prefix="load_test_"))
+        atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+        synthetic_prior_art(workdir, args.abstracts, args.seed)
+    print(
+        f"{'sessions':>8} {'reruns':>7} {'reruns/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'service ms':>11} {'peak RSS':>10} {'errors':>7}"
+    )
+    levels = []
+    for n in args.sessions:
+        level = run_level(n, args.scripts, args.rounds, args.think_ms / 1000, args.seed)
+        levels.append(level)
+        print(
+            f"{n:>8} {level['reruns']:>7} {level['reruns_per_second']:>9.1f} {level['p50_ms']:>9.1f} "
+            f"{level['p95_ms']:>9.1f} {level['p99_ms']:>9.1f} {level['mean_service_ms']:>11.1f} "
+            f"{level['peak_rss_mb']:>7.0f} MB {len(level['errors']):>7}"
+        )
+        if args.steps:
+            for step, p in level["steps"].items():
+                print(f"    {step:<32} {p['reruns']:>6} {p['p50_ms']:>9.1f} {p['p95_ms']:>9.1f} {p['p99_ms']:>9.1f}")
+
+    for level in levels:
+        for error in level["errors"][:5]:
+            print(f"ERROR sessions={level['sessions']} {error}", file=sys.stderr)
+
+    if args.json:
+        args.json.write_text(json.dumps({"args": vars(args) | {"json": str(args.json)}, "levels": levels}, indent=2) + "\n")
+    return 1 if any(level["errors"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import pandas as pd
+import streamlit as st
+
+from utils.instrumentation import REGISTRY, diagnostics_allowed
+
+# ----------------------------
+# Access
+# ----------------------------
+# Innovation_education.py only registers this page for
+# ?token=<DIAGNOSTICS_TOKEN>; the check is repeated in case the script is
+# run on its own.
+if not diagnostics_allowed(st.query_params.get("token", "")):
+    st.info("Nothing to see here.")
+    st.stop()
+
+st.title("Diagnostics")
+
+data = REGISTRY.to_dict()
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Uptime", f"{data['uptime_seconds'] / 3600:.1f} h")
+col2.metric("Sessions seen", data["sessions"]["seen"])
+col3.metric("Active sessions (5 min)", data["sessions"]["active"])
+
+# ----------------------------
+# Rerun latency
+# ----------------------------
+st.header("Rerun latency")
+st.caption("Percentiles are bucket upper bounds. A blank section is the whole page rerun.")
+
+def to_ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+latency = data["latency"]
+if latency:
+    st.dataframe(
+        pd.DataFrame([
+            {
+                "Page": e["page"],
+                "Section": e["section"] or "",
+                "Runs": e["count"],
+                "Mean (ms)": e["sum_seconds"] / e["count"] * 1000 if e["count"] else 0.0,
+                "p50 (ms)": to_ms(e["p50"]),
+                "p95 (ms)": to_ms(e["p95"]),
+                "p99 (ms)": to_ms(e["p99"]),
+                "Total (s)": e["sum_seconds"],
+            }
+            for e in latency
+        ]),
+        hide_index=True,
+    )
+
+    labels = [f"{e['page']} · {e['section']}" if e["section"] else e["page"] for e in latency]
+    chosen = st.selectbox("Histogram for", range(len(latency)), format_func=labels.__getitem__, key="diag_hist")
+    buckets = latency[chosen]["buckets"]
+    st.bar_chart(pd.DataFrame({"Reruns": list(buckets.values())}, index=pd.Index(list(buckets), name="≤ seconds")))
+else:
+    st.write("No reruns recorded yet.")
+
+# ----------------------------
+# Caches
+# ----------------------------
+st.header("Caches")
+if data["cache"]:
+    st.dataframe(
+        pd.DataFrame([
+            {
+                "Cache": name,
+                "Hits": c["hits"],
+                "Misses": c["misses"],
+                "Hit rate": c["hits"] / max(c["hits"] + c["misses"], 1),
+            }
+            for name, c in data["cache"].items()
+        ]),
+        hide_index=True,
+    )
+else:
+    st.write("No cache lookups recorded yet.")
+
+# ----------------------------
+# Export
+# ----------------------------
+st.header("Export")
+col_json, col_prom, col_reset = st.columns(3)
+col_json.download_button("Download JSON", REGISTRY.to_json(), file_name="metrics.json", mime="application/json")
+col_prom.download_button("Download Prometheus text", REGISTRY.to_prometheus(), file_name="metrics.prom", mime="text/plain")
+if col_reset.button("Reset counters", key="diag_reset"):
+    REGISTRY.reset()
+    st.rerun()
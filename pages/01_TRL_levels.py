@@ -1,5 +1,47 @@
+import io
+import re
+import time
+
+import pandas as pd
 import streamlit as st
 
+from utils import reports
+from utils.archetypes import load_archetypes
+from utils.instrumentation import PageTimer, counted_cache
+from utils.pools import WORKERS, process_pool
+from utils.stage_gate import DEFAULT_GATES
+from utils.trl import TRL_LEVELS
+
+page_timer = PageTimer("TRL Levels")
+
+FORMAT_LABELS = {"pdf": "PDF", "md": "Markdown", "html": "HTML"}
+
+
+@counted_cache(st.cache_data(max_entries=64), "render_report")
+def render_report(project, fmt):
+    return reports.render(project, fmt)
+
+
+@counted_cache(st.cache_data(show_spinner="Rendering reports…", max_entries=4), "cohort_reports")
+def cohort_zip(csv_bytes, formats):
+    projects = list(reports.read_projects(io.BytesIO(csv_bytes)))
+    buffer = io.BytesIO()
+    executor = process_pool() if WORKERS > 1 and len(projects) > reports.REPORTS_PER_TASK else None
+    written = reports.write_zip(projects, buffer, formats, workers=1 if executor is None else WORKERS, executor=executor)
+    return buffer.getvalue(), len(projects), written
+
+
+def sample_cohort():
+    return pd.DataFrame([
+        {"id": "P-001", "name": "Solar cold room", "trl": 4, "archetype": "Tech Builder", "keywords": "solar",
+         "price": 450, "variable_cost": 180, "fixed_costs": 25000, "units": 150, "growth": 0.25,
+         "initial": 400000, "discount_rate": 0.12, "years": 5},
+        {"id": "P-002", "name": "Water quality app", "trl": 7, "archetype": "", "keywords": "subscription",
+         "price": 99, "variable_cost": 10, "fixed_costs": 40000, "units": 800, "growth": 0.4,
+         "initial": 250000, "discount_rate": 0.15, "years": 5},
+    ], columns=list(reports.PROJECT_COLUMNS)).to_csv(index=False).encode("utf-8")
+
+
 st.title("Technology Readiness Levels (TRL) — Education Module")
 st.caption("Davoren Insights: Learning → Tools → Application")
 
@@ -31,67 +73,16 @@ st.markdown("---")
 # -------------------------
 st.header("The Nine TRL Levels — Explained Clearly")
 
-trl_data = {
-    "TRL 1 — Basic Principles Observed": """
-    • Pure scientific exploration  
-    • Curiosity-driven research  
-    • No prototype, no design, no concept yet  
-    """,
-
-    "TRL 2 — Technology Concept Formulated": """
-    • You've seen something interesting  
-    • You can define a potential application  
-    • Still no experimental proof  
-    """,
-
-    "TRL 3 — Experimental Proof-of-Concept": """
-    • Laboratory validation  
-    • Simulations, modelling, early experiments  
-    • Digital twin or computational model is allowed  
-    • You can *prove* the idea might work  
-    """,
-
-    "TRL 4 — Lab Validation of Components": """
-    • Components tested together  
-    • Bench setups  
-    • Early integration begins  
-    • Still controlled environment  
-    """,
-
-    "TRL 5 — Relevant Environment Validation": """
-    • More representative conditions  
-    • Environmental factors introduced  
-    • Higher fidelity prototype  
-    """,
-
-    "TRL 6 — Prototype Demonstration": """
-    • Full prototype  
-    • Demonstrated in a relevant environment  
-    • Can show performance under partial real-world conditions  
-    """,
-
-    "TRL 7 — System Prototype in Operational Environment": """
-    • Pilot plant  
-    • Live operational testing  
-    • Integrated with real-world interfaces  
-    """,
-
-    "TRL 8 — Completed & Certified System": """
-    • Technology is complete  
-    • Certifications, compliance, validation tests  
-    • Manufacturing process established  
-    """,
-
-    "TRL 9 — Market Deployment": """
-    • Technology is in full operation  
-    • Commercial adoption  
-    • Scaling, replication, and business growth  
-    """
-}
-
-for level, desc in trl_data.items():
+for trl, (level, desc) in enumerate(TRL_LEVELS.items(), start=1):
     with st.expander(level, expanded=False):
         st.markdown(desc)
+        if trl <= len(DEFAULT_GATES):
+            gate = DEFAULT_GATES[trl - 1]
+            st.caption(
+                f"Typical step to TRL {trl + 1}: {gate.duration[0]:.0f}–{gate.duration[2]:.0f} months, "
+                f"R{gate.cost[0] / 1e6:,.2g}m–R{gate.cost[2] / 1e6:,.2g}m, "
+                f"about {gate.pass_rate:.0%} of projects pass the gate."
+            )
 
 
 st.markdown("---")
@@ -118,6 +109,11 @@ Examples:
 • TRL 7–9 = Market funding, customers, manufacturing  
 """)
 
+st.caption(
+    "Planning a whole cohort? The **Commercialisation** page simulates how many projects reach the market, "
+    "how long it takes and what funding they need, gate by gate."
+)
+
 
 # -------------------------
 # CROSS-LINK TO INNOVATION MENTOR
@@ -139,12 +135,69 @@ st.header("Video Explainer (Coming Soon)")
 st.write("Your TRL mini-lecture will appear here. You can embed a YouTube link once uploaded.")
 
 
+st.markdown("---")
+
 # -------------------------
-# OPTIONAL: DOWNLOAD SUMMARY
+# PROJECT REPORT
 # -------------------------
+st.header("Download a TRL Report")
+st.write("""
+Describe your project to get a one-page report: where it sits on the TRL scale and what the next gate
+usually takes, the business models that fit it, and a quick financial snapshot.
+""")
+
+archetypes = [""] + list(load_archetypes())
+col1, col2 = st.columns(2)
+with col1:
+    name = st.text_input("Project name", "My innovation", key="trl_name")
+    trl = st.slider("Current TRL", 1, 9, 4, key="trl_level")
+    archetype = st.selectbox("Archetype", archetypes, format_func=lambda a: a or "—", key="trl_archetype")
+    keywords = st.text_input("Keywords", placeholder="e.g. solar, subscription", key="trl_keywords")
+with col2:
+    price = st.number_input("Selling price (R)", min_value=0.0, value=500.0, key="trl_price")
+    variable_cost = st.number_input("Variable cost per unit (R)", min_value=0.0, value=200.0, key="trl_variable")
+    fixed_costs = st.number_input("Monthly fixed costs (R)", min_value=0.0, value=20000.0, key="trl_fixed")
+    units = st.number_input("Units sold per month", min_value=0.0, value=100.0, key="trl_units")
+    initial = st.number_input("Initial investment (R)", min_value=0.0, value=250000.0, key="trl_initial")
+    growth = st.slider("Yearly unit growth (%)", 0, 100, 20, key="trl_growth")
+
+project = reports.Project(
+    name=name or "My innovation", trl=trl, archetype=archetype, keywords=keywords, price=price,
+    variable_cost=variable_cost, fixed_costs=fixed_costs, units=units, growth=growth / 100, initial=initial,
+)
+fmt = st.radio("Format", list(FORMAT_LABELS), format_func=FORMAT_LABELS.get, horizontal=True, key="trl_format")
+slug = re.sub(r"[^A-Za-z0-9]+", "_", project.name).strip("_") or "project"
 st.download_button(
-    label="Download TRL Summary (PDF coming soon)",
-    data="TRL Summary text placeholder",
-    file_name="TRL_summary.txt"
+    label=f"Download TRL Report ({FORMAT_LABELS[fmt]})",
+    data=render_report(project, fmt),
+    file_name=f"TRL_report_{slug}.{fmt}",
+    mime=reports.FORMATS[fmt],
+    key="trl_download",
 )
 
+# -------------------------
+# COHORT REPORTS
+# -------------------------
+with st.expander("Reports for a whole cohort"):
+    st.write(
+        "Upload a CSV with one row per project to get every report in a single zip. "
+        f"Columns: {', '.join(reports.PROJECT_COLUMNS)} — only name and trl are required."
+    )
+    st.download_button("Download a sample CSV", sample_cohort(), "cohort_sample.csv", "text/csv", key="trl_sample")
+    upload = st.file_uploader("Cohort CSV", type=["csv"], key="trl_cohort")
+    formats = st.multiselect(
+        "Formats", list(FORMAT_LABELS), default=["pdf"], format_func=FORMAT_LABELS.get, key="trl_cohort_formats"
+    )
+    if upload is not None and formats:
+        start = time.perf_counter()
+        try:
+            data, n_projects, written = cohort_zip(upload.getvalue(), tuple(formats))
+        except (ValueError, KeyError) as exc:
+            st.error(f"Check the cohort file: {exc}")
+        else:
+            st.caption(f"{written:,} reports for {n_projects:,} projects in {time.perf_counter() - start:.1f} s.")
+            st.download_button(
+                "Download reports (zip)", data, "TRL_reports.zip", "application/zip", key="trl_cohort_download"
+            )
+
+page_timer.stop()
@@ -1,103 +1,139 @@
-import json
+import math
+import time
+
+import numpy as np
+import pandas as pd
 import streamlit as st
-from typing import List, Dict, Any
+
+from utils import workspace
+from utils.archetypes import ArchetypeMatrix, load_archetypes
+from utils.catalogue import Catalogue, CatalogueView, ModelRecord, load_catalogue
+from utils.facets import FACETS, FacetIndex
+from utils.instrumentation import REGISTRY, PageTimer, counted_cache
+from utils.search import SearchIndex
+from utils.similarity import SimilarityIndex, load_similarity
+
+PAGE = "Business Models"
+page_timer = PageTimer(PAGE)
+
+# Archetype, filters and view settings are saved with workspace projects.
+workspace.sidebar(PAGE, ("bm_", "selected_archetype"))
 
 # ----------------------------
 # Load business models
 # ----------------------------
-@st.cache_data
-def load_business_models() -> List[Dict[str, Any]]:
-    with open("data/business_models.json", "r") as f:
-        return json.load(f)
+@counted_cache(st.cache_resource, "load_business_models")
+def get_catalogue() -> Catalogue:
+    """
+    Read-only catalogue shared by all sessions in the process; detail
+    fields stay on disk until a card asks for them.
+    """
+    return load_catalogue()
+
+
+def load_business_models() -> CatalogueView:
+    """
+    A view over the whole shared catalogue. Nothing is copied per session.
+    """
+    return get_catalogue().view()
+
+
+@counted_cache(st.cache_resource, "load_search_index")
+def load_search_index() -> SearchIndex:
+    return SearchIndex(list(get_catalogue().iter_records()))
+
+
+@counted_cache(st.cache_resource, "load_similarity")
+def load_similarity_index() -> SimilarityIndex:
+    """
+    Nearest-neighbour table, patched incrementally when the catalogue
+    file changes.
+    """
+    return load_similarity(get_catalogue())
+
+
+@counted_cache(st.cache_resource, "load_facet_index")
+def load_facet_index() -> FacetIndex:
+    return FacetIndex(get_catalogue())
+
 
 business_models = load_business_models()
+search_index = load_search_index()
+similarity_index = load_similarity_index()
+facet_index = load_facet_index()
 
 # ----------------------------
 # Archetype definitions
 # ----------------------------
-ARCHETYPES = {
-    "Digital & SaaS": [
-        "software", "data", "AI", "cloud", "digital", "platform", "developer"
-    ],
-    "Hardware & Infrastructure": [
-        "hardware", "infrastructure", "IoT", "manufacturing", "high_capex"
-    ],
-    "Finance & Funding": [
-        "finance", "fund", "loan", "equity", "blended", "royalties"
-    ],
-    "Impact & Community": [
-        "impact", "green", "sustainability", "community", "local", "cooperative"
-    ],
-    "IP, Knowledge & Services": [
-        "IP", "research", "knowledge", "education", "services", "consulting"
-    ],
-}
+ARCHETYPES = load_archetypes()
 
 ARCHETYPE_ORDER = list(ARCHETYPES.keys())
 
 
-def score_for_archetype(bm: Dict[str, Any], archetype: str) -> int:
-    """
-    Simple overlap score between model tags and archetype tags.
-    """
-    tags = [t.lower() for t in bm.get("tags", [])]
-    target_tags = [t.lower() for t in ARCHETYPES.get(archetype, [])]
-    return sum(1 for t in tags if t in target_tags)
+@counted_cache(st.cache_resource, "load_archetype_matrix")
+def load_archetype_matrix() -> ArchetypeMatrix:
+    return ArchetypeMatrix(load_business_models(), ARCHETYPES)
+
+
+archetype_matrix = load_archetype_matrix()
 
 
 def filter_by_archetype(
-    models: List[Dict[str, Any]], archetype: str, top_n: int = 5
-) -> List[Dict[str, Any]]:
+    models: CatalogueView, archetype: str, top_n: int = 5
+) -> CatalogueView:
     """
     Return top N models most aligned with the chosen archetype.
     """
-    scored = []
-    for bm in models:
-        s = score_for_archetype(bm, archetype)
-        if s > 0:
-            scored.append((s, bm))
-
-    if not scored:
-        # if nothing matches (shouldn’t really happen), just fall back
-        return models[:top_n]
-
-    # Sort: highest score first, then easier difficulty, then name
-    scored.sort(
-        key=lambda x: (
-            -x[0],
-            x[1].get("difficulty", 3),
-            x[1].get("name", ""),
-        )
-    )
-    return [bm for _, bm in scored[:top_n]]
+    return models.take(archetype_matrix.top_n(archetype, top_n))
 
 
-def filter_by_search(
-    models: List[Dict[str, Any]], query: str
-) -> List[Dict[str, Any]]:
+def filter_by_search(models: CatalogueView, query: str) -> CatalogueView:
     """
-    Filter models by free-text search over name, description, and tags.
+    Rank models against a free-text query using the prebuilt search index
+    (name, tags, description, use cases, examples), best match first.
     """
-    if not query:
+    if not query or not query.strip():
         return models
 
-    q = query.lower().strip()
-    results = []
-    for bm in models:
-        haystack = " ".join(
-            [
-                bm.get("id", ""),
-                bm.get("name", ""),
-                bm.get("description", ""),
-                " ".join(bm.get("tags", [])),
-            ]
-        ).lower()
-        if q in haystack:
-            results.append(bm)
-    return results
+    ranked = np.fromiter((pos for pos, _ in search_index.search(query)), dtype=np.int32)
+    return models.take(ranked)
 
 
-def render_model_card(bm: Dict[str, Any]) -> None:
+def facet_label(field: str, value: str, count: int) -> str:
+    shown = f"{value} / 5" if field == "difficulty" and value.isdigit() else value
+    return f"{shown} ({count})"
+
+
+def filter_by_facets(models: CatalogueView) -> CatalogueView:
+    """
+    Sidebar facet filters with live counts. Values within a facet are
+    alternatives (OR); facets narrow each other (AND). Counts are taken
+    within `models`, applying the other facets' selections.
+    """
+    start_t = time.perf_counter()
+    base = facet_index.mask(models.positions)
+    selections = {field: st.session_state.get(f"bm_facet_{field}", []) for field in FACETS}
+    counts = facet_index.counts(selections, base)
+    matched = facet_index.select(selections, base)
+    elapsed = time.perf_counter() - start_t
+
+    with st.sidebar:
+        st.markdown("### Filter models")
+        for field, label in FACETS.items():
+            st.multiselect(
+                label,
+                facet_index.values[field],
+                format_func=lambda v, f=field: facet_label(f, v, counts[f].get(v, 0)),
+                key=f"bm_facet_{field}",
+            )
+        st.caption(f"Counts updated in {elapsed * 1000:.2f} ms")
+
+    if not any(selections.values()):
+        return models
+    return models.take(models.positions[facet_index.contains(matched, models.positions)])
+
+
+def render_model_card(bm: ModelRecord) -> None:
     """
     Render a single business model as a Streamlit 'card'.
     Pure Streamlit — no HTML.
@@ -136,31 +172,57 @@ def render_model_card(bm: Dict[str, Any]) -> None:
         with col3:
             st.metric("Time to revenue", str(time_to_revenue))
 
-        # Expanders for deeper teaching content
-        rev = bm.get("revenue_streams", [])
+        # Expanders for deeper teaching content, loaded on demand
+        details = get_catalogue().details(bm.position)
+
+        rev = details.get("revenue_streams", [])
         if rev:
             with st.expander("Revenue streams"):
                 for item in rev:
                     st.write(f"- {item}")
 
-        use_cases = bm.get("use_cases", [])
+        use_cases = details.get("use_cases", [])
         if use_cases:
             with st.expander("Use cases"):
                 for item in use_cases:
                     st.write(f"- {item}")
 
-        examples = bm.get("examples", [])
+        examples = details.get("examples", [])
         if examples:
             with st.expander("Example companies / analogues"):
                 for item in examples:
                     st.write(f"- {item}")
 
-        risks = bm.get("risks", [])
+        risks = details.get("risks", [])
         if risks:
             with st.expander("Key risks and watch-outs"):
                 for item in risks:
                     st.write(f"- {item}")
 
+        similar = similarity_index.neighbours(bm.id)
+        if similar:
+            catalogue = get_catalogue()
+            with st.expander("Similar models"):
+                for model_id, score in similar:
+                    name = catalogue.names[catalogue.position(model_id)]
+                    st.write(f"- **{name}** ({model_id}) — {score:.0%} similar")
+
+
+def models_table(models: CatalogueView) -> pd.DataFrame:
+    """
+    One compact row per model for the table view.
+    """
+    return pd.DataFrame(
+        {
+            "ID": [bm.get("id", "") for bm in models],
+            "Name": [bm.get("name", "") for bm in models],
+            "Difficulty": [bm.get("difficulty") for bm in models],
+            "Capital": [bm.get("capital_requirement", "-") for bm in models],
+            "Time to revenue": [bm.get("time_to_revenue", "-") for bm in models],
+            "Tags": [", ".join(bm.get("tags", [])) for bm in models],
+        }
+    )
+
 
 # ----------------------------
 # Page layout
@@ -170,18 +232,22 @@ st.title("Business Model Library")
 st.write(
     "Use this page to **learn** and **teach** different business model patterns. "
     "Start by choosing an archetype that feels closest to your innovation, or "
-    "browse/search all 70 models."
+    f"browse/search all {len(business_models)} models."
 )
 
 # Archetype selection
 st.markdown("### Step 1 – Choose your primary archetype")
 
+def choose_archetype(arch: str) -> None:
+    # A callback, so the choice is in session state before the rerun (and its autosave) starts.
+    st.session_state["selected_archetype"] = arch
+
+
 arch_cols = st.columns(len(ARCHETYPE_ORDER))
 selected_arch = None
 for i, arch in enumerate(ARCHETYPE_ORDER):
     with arch_cols[i]:
-        if st.button(arch, use_container_width=True):
-            st.session_state["selected_archetype"] = arch
+        st.button(arch, use_container_width=True, on_click=choose_archetype, args=(arch,))
 
 # Default archetype in state
 if "selected_archetype" not in st.session_state:
@@ -200,10 +266,10 @@ with col_search:
         placeholder="e.g. SaaS, carbon, community, franchise...",
     )
 with col_toggle:
-    show_all = st.checkbox("Show all 70 models", value=False)
+    show_all = st.checkbox(f"Show all {len(business_models)} models", value=False)
 
 # Decide which models to show
-models_to_show: List[Dict[str, Any]]
+models_to_show: CatalogueView
 
 if show_all:
     models_to_show = business_models
@@ -214,16 +280,55 @@ else:
 
 # Apply search on whatever base set we’re using
 models_to_show = filter_by_search(models_to_show, search_query)
+models_to_show = filter_by_facets(models_to_show)
+facet_selection = tuple(tuple(st.session_state.get(f"bm_facet_{field}", [])) for field in FACETS)
 
 st.markdown("### Step 3 – Explore the models")
 
 if not models_to_show:
     st.warning(
-        "No business models match this combination of archetype and search. "
-        "Try clearing the search text or switching archetype."
+        "No business models match this combination of archetype, search and filters. "
+        "Try clearing the search text or filters, or switching archetype."
     )
 else:
-    for bm in models_to_show:
-        render_model_card(bm)
+    col_view, col_size, col_page = st.columns([2, 1, 1])
+    with col_view:
+        view = st.radio(
+            "View", ["Cards", "Compact table"], horizontal=True, key="bm_view"
+        )
+    with col_size:
+        page_size = st.selectbox("Cards per page", [5, 10, 20, 50], key="bm_page_size")
+
+    n_pages = max(1, math.ceil(len(models_to_show) / page_size))
+
+    # Back to page 1 whenever the result set or page size changes
+    listing = (show_all, selected_arch, search_query, facet_selection, page_size)
+    if st.session_state.get("bm_listing") != listing:
+        st.session_state["bm_listing"] = listing
+        st.session_state["bm_page"] = 1
+
+    with col_page:
+        page = st.number_input(
+            f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key="bm_page"
+        )
+
+    start_t = time.perf_counter()
+    if view == "Compact table":
+        st.dataframe(models_table(models_to_show), hide_index=True)
+        st.caption(
+            f"{len(models_to_show)} models · rendered in "
+            f"{(time.perf_counter() - start_t) * 1000:.0f} ms"
+        )
+    else:
+        start = (int(page) - 1) * page_size
+        visible = models_to_show[start:start + page_size]
+        for bm in visible:
+            render_model_card(bm)
+        st.caption(
+            f"Showing {start + 1}–{start + len(visible)} of {len(models_to_show)} models · "
+            f"page rendered in {(time.perf_counter() - start_t) * 1000:.0f} ms"
+        )
+    REGISTRY.observe(PAGE, view, time.perf_counter() - start_t)
 
 
+page_timer.stop()
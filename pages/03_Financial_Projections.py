@@ -1,7 +1,24 @@
 import streamlit as st
 import math
+from datetime import date
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from utils import breakeven, cashflow, finance, workspace
+from utils.irr import xirr
+from utils.instrumentation import PageTimer, counted_cache, timed_section
+from utils.montecarlo import DISTRIBUTIONS, Driver, simulate_profit
+
+PAGE = "Financial Projections"
 
 st.set_page_config(page_title="Financial Literacy for Innovators", layout="wide")
+page_timer = PageTimer(PAGE)
+
+# Every tab's inputs (widget keys with these prefixes) are saved with workspace projects.
+INPUT_PREFIXES = ("cost_", "pr_", "cf_", "npv_", "irr_", "val_", "sc_", "mc_", "adj_")
+workspace.sidebar(PAGE, INPUT_PREFIXES)
 
 st.title("📊 Financial Literacy for Innovators")
 st.caption("A complete educational module that teaches innovators core financial concepts using examples, visuals and interactive tools.")
@@ -10,49 +27,94 @@ st.caption("A complete educational module that teaches innovators core financial
 # Helper Functions
 # ================================================================
 
-def compute_npv(cash_flows, discount_rate):
-    npv = 0.0
-    for t, cf in cash_flows:
-        npv += cf / ((1 + discount_rate) ** t)
-    return npv
-
-def compute_irr(cash_flows, tol=1e-4, max_iter=1000):
-    npv0 = compute_npv(cash_flows, 0.0)
-    npv_high = compute_npv(cash_flows, 5.0)
-    if npv0 * npv_high > 0:
-        return None
-    low, high = 0.0, 5.0
-    for _ in range(max_iter):
-        mid = (low + high) / 2
-        npv_mid = compute_npv(cash_flows, mid)
-        if abs(npv_mid) < tol:
-            return mid
-        if npv0 * npv_mid < 0:
-            high = mid
-        else:
-            low = mid
-    return None
+@counted_cache(st.cache_data(show_spinner="Running simulation…", max_entries=32), "run_monte_carlo")
+@workspace.persisted("run_monte_carlo", depends=(simulate_profit,))
+def run_monte_carlo(rev_mean, rev_spread, cost_mean, cost_spread, distribution,
+                    correlation, draws, initial, years, rate):
+    """
+    Cached per input set, so switching tabs or rerunning never re-samples.
+    """
+    return simulate_profit(
+        Driver(rev_mean, rev_spread, distribution),
+        Driver(cost_mean, cost_spread, distribution),
+        draws=draws,
+        correlation=correlation,
+        initial_investment=initial,
+        years=years,
+        discount_rate=rate,
+    )
+
+
+def histogram_frame(summary, label, bins=60):
+    """Trim empty tails and re-bin a simulated histogram into a chart-sized DataFrame."""
+    filled = np.flatnonzero(summary.counts)
+    counts = summary.counts[filled[0]:filled[-1] + 1]
+    edges = summary.edges[filled[0]:filled[-1] + 2]
+    step = max(len(counts) // bins, 1)
+    starts = np.arange(0, len(counts), step)
+    grouped = np.add.reduceat(counts, starts)
+    centres = (edges[starts] + edges[np.minimum(starts + step, len(edges) - 1)]) / 2
+    return pd.DataFrame({"Share of draws": grouped / grouped.sum()}, index=pd.Index(np.round(centres), name=label))
+
+
+@counted_cache(st.cache_data(max_entries=16), "break_even_grid")
+def break_even_grid(price_range, var_range, fixed_range, units, resolution):
+    """One grid per set of ranges; moving the fixed-cost slider only picks a slice."""
+    return breakeven.grid(price_range, var_range, fixed_range, units, (resolution, resolution, 21))
+
+
+@counted_cache(st.cache_data(max_entries=64), "break_even_heatmap")
+def break_even_heatmap(price_range, var_range, fixed_range, units, resolution, fixed_index, colour_by):
+    surface = break_even_grid(price_range, var_range, fixed_range, units, resolution)
+    values = surface.profit if colour_by == "Monthly profit" else surface.break_even
+    return pd.DataFrame(breakeven.heatmap_cells(values[fixed_index], surface.prices, surface.variable_costs))
+
+
+def no_irr_message(label, flows):
+    """Why `label` (IRR or XIRR) has no value for these flows."""
+    signs = np.sign(np.asarray(flows, dtype=float))
+    signs = signs[signs != 0]
+    if len(signs) < 2 or (signs == signs[0]).all():
+        return f"No {label} exists for these cash flows — they never change sign."
+    return (
+        f"No {label} exists for these cash flows — they change sign, but NPV is not zero at any "
+        "discount rate. Use NPV at your discount rate instead."
+    )
+
+
+def table_steps(table, key, amount):
+    """(key, amount) pairs from an edited table, skipping incomplete rows."""
+    rows = table[[key, amount]].dropna()
+    return tuple(zip(rows[key].astype(float), rows[amount].astype(float)))
+
+
+@counted_cache(st.cache_data(show_spinner="Projecting plans…", max_entries=32), "run_cash_projection")
+@workspace.persisted("run_cash_projection", depends=(cashflow,))
+def run_cash_projection(base, months, growth_values, revenue_values):
+    """
+    The base plan and a growth x starting-revenue grid around it, each
+    projected in one vectorised pass.
+    """
+    plans, _ = cashflow.grid(
+        base, growth=[g / 100 for g in growth_values], revenue=[base.revenue * r / 100 for r in revenue_values]
+    )
+    return cashflow.project([base], months), cashflow.project(plans, months)
+
 
 # ================================================================
 # Tabs
 # ================================================================
-
-tabs = st.tabs([
-    "Costs",
-    "Pricing",
-    "Cash Flow",
-    "DCF & NPV",
-    "IRR",
-    "Valuation",
-    "Risk & Scenarios",
-    "Adjusted Revenue",
-    "Financial Story"
-])
+# Each tab is a fragment: changing one of its widgets reruns that tab
+# only, not the whole page. Tabs are timed as sections of the page, and
+# autosave their inputs themselves since a fragment rerun skips the sidebar.
 
 # ================================================================
 # TAB 1 — COSTS
 # ================================================================
-with tabs[0]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "Costs")
+def costs_tab():
     st.header("1. Understanding Costs")
 
     st.markdown("""
@@ -97,19 +159,96 @@ Examples: retesting, redesign, unexpected shipping, broken prototypes.
         price = st.number_input("Selling price per unit (R)", min_value=0.0, value=600.0, key="cost_price")
         units = st.number_input("Expected units sold per month", min_value=0, value=120, key="cost_units")
 
-    margin = price - var_cost
-    st.write(f"**Margin per unit:** R{margin:,.2f}")
+    be = finance.break_even(fixed_costs, var_cost, price)
+    st.write(f"**Margin per unit:** R{be.margin:,.2f}")
 
-    if margin > 0:
-        breakeven = fixed_costs / margin
-        st.success(f"Break-even point: **{breakeven:,.1f} units/month**")
+    if be.units is not None:
+        st.success(f"Break-even point: **{be.units:,.1f} units/month**")
     else:
         st.error("Selling price must exceed variable cost.")
 
+    if not st.toggle("🗺️ Explore ranges of price and costs", key="cost_explore"):
+        return
+
+    st.markdown("""
+Instead of one point, see every combination at once: each square is a price and variable cost,
+coloured by the monthly profit at your expected volume (or by the break-even volume). Move the
+fixed-cost slider to see how the profitable region shrinks as overheads grow.
+""")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        price_range = (
+            st.number_input("Price from (R)", min_value=0.0, value=100.0, key="cost_price_lo"),
+            st.number_input("Price to (R)", min_value=0.0, value=1200.0, key="cost_price_hi"),
+        )
+    with col2:
+        var_range = (
+            st.number_input("Variable cost from (R)", min_value=0.0, value=0.0, key="cost_var_lo"),
+            st.number_input("Variable cost to (R)", min_value=0.0, value=600.0, key="cost_var_hi"),
+        )
+    with col3:
+        fixed_range = (
+            st.number_input("Fixed costs from (R)", min_value=0.0, value=20000.0, key="cost_fixed_lo"),
+            st.number_input("Fixed costs to (R)", min_value=0.0, value=120000.0, key="cost_fixed_hi"),
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        resolution = st.select_slider("Grid points per axis", [50, 100, 200, 400], value=200, key="cost_grid_res")
+    with col2:
+        colour_by = st.radio("Colour by", ["Monthly profit", "Break-even units"], horizontal=True, key="cost_colour")
+
+    try:
+        surface = break_even_grid(price_range, var_range, fixed_range, float(units), resolution)
+    except ValueError as exc:
+        st.error(f"Check the ranges: {exc}")
+        return
+
+    fixed_level = st.select_slider(
+        "Fixed costs (R / month)", surface.fixed_costs.tolist(),
+        value=surface.fixed_costs[np.abs(surface.fixed_costs - fixed_costs).argmin()],
+        format_func=lambda f: f"R{f:,.0f}", key="cost_fixed_level",
+    )
+    k = int(np.abs(surface.fixed_costs - fixed_level).argmin())
+    cells = break_even_heatmap(price_range, var_range, fixed_range, float(units), resolution, k, colour_by)
+
+    feasible = surface.feasible[k].mean()
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Profitable combinations", f"{feasible:.0%}")
+    m2.metric(f"Lowest price at R{var_cost:,.0f} variable cost",
+              f"R{var_cost + fixed_level / units:,.2f}" if units > 0 else "—")
+    m3.metric("Grid points", f"{surface.profit.size:,}", f"{len(cells):,} cells drawn", delta_color="off")
+
+    if colour_by == "Monthly profit":
+        colour = alt.Color("value:Q", title="Monthly profit (R)", scale=alt.Scale(scheme="redblue", domainMid=0))
+    else:
+        colour = alt.Color("value:Q", title="Break-even units", scale=alt.Scale(scheme="viridis", reverse=True))
+    st.altair_chart(
+        alt.Chart(cells).mark_rect().encode(
+            x=alt.X("x0:Q", title="Price (R)", scale=alt.Scale(domain=[cells.x0.min(), cells.x1.max()], nice=False)),
+            x2="x1:Q",
+            y=alt.Y("y0:Q", title="Variable cost (R)", scale=alt.Scale(domain=[cells.y0.min(), cells.y1.max()], nice=False)),
+            y2="y1:Q",
+            color=colour,
+            tooltip=[alt.Tooltip("value:Q", title=colour_by, format=",.0f")],
+        )
+        + alt.Chart(pd.DataFrame({"Price": [price], "Variable cost": [var_cost]}))
+        .mark_point(shape="diamond", size=120, color="black", filled=True)
+        .encode(x="Price:Q", y="Variable cost:Q", tooltip=["Price", "Variable cost"])
+    )
+    st.caption(
+        "The diamond marks your current inputs. Blank squares under Break-even units are prices at or below "
+        "the variable cost, which never break even. Flat regions are drawn as larger blocks; the break-even "
+        "line keeps full detail."
+    )
+
 # ================================================================
 # TAB 2 — PRICING
 # ================================================================
-with tabs[1]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "Pricing")
+def pricing_tab():
     st.header("2. Pricing Strategies")
 
     st.markdown("""
@@ -146,8 +285,7 @@ Useful for crowded markets.
     with col3:
         years = st.number_input("Contract length (years)", 1, 1, key="pr_years")
 
-    total_value = saving * years
-    suggested_price = total_value * (pct / 100)
+    total_value, suggested_price = finance.value_based_price(saving, pct, years)
 
     st.write(f"**Total created value:** R{total_value:,.0f}")
     st.success(f"Suggested value-based price: **R{suggested_price:,.0f}**")
@@ -155,7 +293,10 @@ Useful for crowded markets.
 # ================================================================
 # TAB 3 — CASH FLOW
 # ================================================================
-with tabs[2]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "Cash Flow")
+def cash_flow_tab():
     st.header("3. Cash Flow Explained")
 
     st.markdown("""
@@ -180,24 +321,128 @@ Companies die because they run out of **cash**, not because of poor profit margi
     with col4:
         cash = st.number_input("Cash available (R)", min_value=0.0, value=300000.0, key="cf_cash")
 
-    gross = revenue - variable
-    net = gross - fixed
-    burn = max(variable + fixed - revenue, 0)
-    runway = cash / burn if burn > 0 else float("inf")
+    summary = finance.cash_flow_summary(revenue, variable, fixed, cash)
 
-    st.write(f"**Gross profit:** R{gross:,.0f}")
-    st.write(f"**Net profit:** R{net:,.0f}")
-    st.write(f"**Burn rate:** R{burn:,.0f}")
+    st.write(f"**Gross profit:** R{summary.gross:,.0f}")
+    st.write(f"**Net profit:** R{summary.net:,.0f}")
+    st.write(f"**Burn rate:** R{summary.burn:,.0f}")
 
-    if burn > 0:
-        st.warning(f"Runway: **{runway:,.1f} months**")
+    if summary.burn > 0:
+        st.warning(f"Runway: **{summary.runway:,.1f} months**")
     else:
         st.success("No burn — cash flow positive.")
 
+    st.markdown("---")
+    st.markdown("### 📈 Multi-year Cash Projection")
+    st.markdown("""
+One month is a snapshot. Over several years revenue grows, the team grows, some costs jump when
+you outgrow a tier, and funding rounds land. The projection starts from the figures above and
+plays your plan out month by month — then repeats it for a whole range of growth rates and
+starting revenues, so you can see which plans run out of cash and when.
+""")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        months = st.select_slider("Months to project", [36, 60, 84, 120], value=60, key="cf_months")
+    with col2:
+        growth = st.slider("Yearly revenue growth (%)", -50, 200, 30, key="cf_growth")
+    with col3:
+        start = st.date_input("First month", date.today().replace(day=1), key="cf_start")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.caption("**Hiring steps** — monthly cost added from a month onwards")
+        hires = workspace.editor(
+            "cf_hires",
+            pd.DataFrame({"Month": [6, 18], "Monthly cost (R)": [35000.0, 45000.0]}),
+            num_rows="dynamic",
+        )
+    with col2:
+        st.caption("**Semi-variable tiers** — monthly cost once revenue reaches a level")
+        tiers = workspace.editor(
+            "cf_tiers",
+            pd.DataFrame({"Revenue from (R)": [0.0, 250000.0, 500000.0], "Monthly cost (R)": [3000.0, 9000.0, 20000.0]}),
+            num_rows="dynamic",
+        )
+    with col3:
+        st.caption("**Funding injections** — cash received in a month")
+        funding = workspace.editor(
+            "cf_funding",
+            pd.DataFrame({"Month": [12], "Amount (R)": [1_000_000.0]}),
+            num_rows="dynamic",
+        )
+
+    st.markdown("#### Plans to compare")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        growth_range = st.slider("Growth from / to (%)", -50, 200, (0, 100), key="cf_growth_range")
+    with col2:
+        revenue_range = st.slider("Starting revenue from / to (% of above)", 10, 300, (50, 150), key="cf_rev_range")
+    with col3:
+        steps = st.select_slider("Steps per range", [5, 10, 15, 20], value=10, key="cf_steps")
+
+    base = cashflow.Plan(
+        cash=cash,
+        revenue=revenue,
+        variable_share=variable / revenue if revenue > 0 else 0.0,
+        fixed=fixed + (variable if revenue <= 0 else 0.0),
+        growth=growth / 100,
+        hires=table_steps(hires, "Month", "Monthly cost (R)"),
+        tiers=table_steps(tiers, "Revenue from (R)", "Monthly cost (R)"),
+        funding=table_steps(funding, "Month", "Amount (R)"),
+    )
+    growth_values = tuple(np.round(np.linspace(*growth_range, steps), 1))
+    revenue_values = tuple(np.round(np.linspace(*revenue_range, steps), 1))
+    try:
+        plan, explored = run_cash_projection(base, months, growth_values, revenue_values)
+    except ValueError as exc:
+        st.error(f"Check the plan: {exc}")
+        return
+
+    out = plan.runway_dates(start)[0]
+    low = int(plan.cash[0].argmin())
+    positive = plan.break_even[0]
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Cash runs out", f"{out:%b %Y}" if out else f"Not within {months} months")
+    m2.metric("Lowest cash", f"R{plan.cash[0, low]:,.0f}", f"month {low + 1}", delta_color="off")
+    m3.metric("Cash-flow positive from", f"month {positive:.0f}" if not np.isnan(positive) else "—")
+    m4.metric("Plans that run out of cash", f"{(~np.isnan(explored.runway_out)).mean():.0%}",
+              f"of {len(explored)} compared", delta_color="off")
+
+    p10, p50, p90 = explored.cash_percentiles((10, 50, 90))
+    st.line_chart(
+        pd.DataFrame(
+            {"Your plan": plan.cash[0], "Compared plans — median": p50, "10th percentile": p10, "90th percentile": p90},
+            index=pd.Index(plan.months, name="Month"),
+        ),
+        y_label="Cash (R)",
+    )
+
+    runway = pd.DataFrame({
+        "Growth (%)": np.repeat(growth_values, len(revenue_values)),
+        "Starting revenue (%)": np.tile(revenue_values, len(growth_values)),
+        "Runway (months)": np.nan_to_num(explored.runway_out, nan=months + 1),
+    })
+    st.altair_chart(
+        alt.Chart(runway).mark_rect().encode(
+            x=alt.X("Starting revenue (%):O", axis=alt.Axis(labelAngle=0)),
+            y=alt.Y("Growth (%):O", sort="descending"),
+            color=alt.Color("Runway (months):Q", scale=alt.Scale(scheme="redyellowgreen", domain=[0, months + 1])),
+            tooltip=["Growth (%)", "Starting revenue (%)", "Runway (months)"],
+        )
+    )
+    st.caption(
+        f"Months until cash runs out for each combination of growth and starting revenue; "
+        f"{months + 1} means it never does within {months} months."
+    )
+
 # ================================================================
 # TAB 4 — DCF & NPV
 # ================================================================
-with tabs[3]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "DCF & NPV")
+def npv_tab():
     st.header("4. DCF & NPV")
 
     st.markdown("""
@@ -230,16 +475,25 @@ Negative NPV = destroys value.
             flows.append(cf)
 
     if st.button("Calculate NPV", key="npv_btn"):
-        r = rate / 100
-        cash_flows = [(0, -initial)] + [(t+1, flows[t]) for t in range(years)]
-        npv = compute_npv(cash_flows, r)
+        analysis = finance.npv_analysis(initial, tuple(flows), rate / 100)
+        npv = analysis.npv
         st.write(f"**NPV = R{npv:,.2f}**")
         st.success("Positive NPV — project adds value.") if npv > 0 else st.error("Negative NPV — project destroys value.")
 
+        # NPV profile: the same cash flows evaluated across a sweep of rates
+        st.markdown("### NPV profile")
+        st.caption("How the NPV changes as the discount rate moves. Where the curve crosses zero is the IRR.")
+        st.line_chart(
+            pd.DataFrame({"NPV (R)": analysis.profile}, index=pd.Index(analysis.rates * 100, name="Discount rate (%)"))
+        )
+
 # ================================================================
 # TAB 5 — IRR
 # ================================================================
-with tabs[4]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "IRR")
+def irr_tab():
     st.header("5. Internal Rate of Return (IRR)")
 
     st.markdown("""
@@ -267,18 +521,47 @@ Investors love IRR because it accounts for:
             irr_list.append(val)
 
     if st.button("Calculate IRR", key="irr_btn"):
-        cash_flows = [(0, -irr_initial)] + [(t+1, irr_list[t]) for t in range(irr_years)]
-        irr = compute_irr(cash_flows)
-        if irr is None:
-            st.error("IRR could not be computed.")
+        result = finance.irr_analysis(irr_initial, tuple(irr_list))
+        if result.rate is None:
+            st.error(no_irr_message("IRR", (-irr_initial,) + tuple(irr_list)))
         else:
-            irr_pct = irr * 100
-            st.write(f"**IRR = {irr_pct:.2f}%**")
+            st.write(f"**IRR = {result.rate * 100:.2f}%**")
+            st.caption(f"Solved in {result.iterations} iterations.")
+            if result.multiple:
+                roots = ", ".join(f"{r * 100:.2f}%" for r in result.roots)
+                st.warning(
+                    f"These cash flows change sign more than once and have several IRRs ({roots}). "
+                    "Use NPV at your discount rate to decide instead."
+                )
+
+    with st.expander("📅 Cash flows on real dates (XIRR)"):
+        st.markdown("""
+Real projects rarely pay out exactly once a year. **XIRR** uses the actual
+date of each cash flow, so a payment in month 3 counts differently from one in month 11.
+""")
+        dated = workspace.editor(
+            "xirr_table",
+            pd.DataFrame({
+                "Date": pd.to_datetime(["2025-01-01", "2025-06-30", "2026-03-15", "2027-01-01"]),
+                "Cash flow (R)": [-200000.0, 60000.0, 90000.0, 120000.0],
+            }),
+            num_rows="dynamic",
+        ).dropna()
+        if st.button("Calculate XIRR", key="xirr_btn") and len(dated) > 1:
+            dated = dated.sort_values("Date")
+            result = xirr(dated["Cash flow (R)"].to_numpy(), dated["Date"].to_numpy())
+            if result.rate is None:
+                st.error(no_irr_message("XIRR", dated["Cash flow (R)"].to_numpy()))
+            else:
+                st.write(f"**XIRR = {result.rate * 100:.2f}%**")
 
 # ================================================================
 # TAB 6 — VALUATION
 # ================================================================
-with tabs[5]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "Valuation")
+def valuation_tab():
     st.header("6. Early-Stage Valuation")
 
     st.markdown("""
@@ -298,13 +581,16 @@ DCF is too early — scorecards are ideal.
     with colC: tr = st.slider("Traction", 0, 10, 5, key="val_tr")
     with colD: mk = st.slider("Market size", 0, 10, 8, key="val_mk")
 
-    score = team*0.3 + ip*0.25 + tr*0.2 + mk*0.25
+    score = finance.valuation_score(team, ip, tr, mk)
     st.success(f"Valuation Scorecard: **{score:.1f} / 10**")
 
 # ================================================================
 # TAB 7 — RISK & SCENARIOS
 # ================================================================
-with tabs[6]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "Risk & Scenarios")
+def scenarios_tab():
     st.header("7. Risk & Scenario Thinking")
 
     st.markdown("""
@@ -322,24 +608,70 @@ Scenario analysis helps innovators:
         st.markdown("### Best Case")
         inc = st.slider("Revenue +%", 0, 200, 30, key="sc_inc")
         dec = st.slider("Cost -%", 0, 50, 10, key="sc_dec")
-        profit_best = base_rev*(1+inc/100) - base_cost*(1-dec/100)
-        st.success(f"Profit: R{profit_best:,.0f}")
-
     with col2:
         st.markdown("### Expected")
-        st.info(f"Profit: R{base_rev - base_cost:,.0f}")
-
     with col3:
         st.markdown("### Worst Case")
         down = st.slider("Revenue -%", 0, 100, 30, key="sc_down")
         up = st.slider("Cost +%", 0, 100, 20, key="sc_up")
-        profit_worst = base_rev*(1-down/100) - base_cost*(1+up/100)
-        st.error(f"Profit: R{profit_worst:,.0f}")
+
+    profits = finance.scenario_profits(base_rev, base_cost, inc, dec, down, up)
+    col1.success(f"Profit: R{profits.best:,.0f}")
+    col2.info(f"Profit: R{profits.expected:,.0f}")
+    col3.error(f"Profit: R{profits.worst:,.0f}")
+    st.caption(
+        "🌪️ Which assumption matters most? The **Risk** page moves price, costs, units, "
+        "growth and discount rate one at a time and ranks them in a tornado chart."
+    )
+
+    st.markdown("---")
+    st.markdown("### 🎲 Monte Carlo Simulation")
+    st.markdown("""
+Three scenarios hide how *likely* each outcome is. A Monte Carlo simulation draws
+thousands of possible revenue and cost outcomes and shows the full range of profit,
+including the **probability of making a loss**.
+""")
+
+    mc1, mc2, mc3 = st.columns(3)
+    with mc1:
+        mc_dist = st.selectbox("Distribution", DISTRIBUTIONS, key="mc_dist")
+        mc_draws = st.select_slider("Number of draws", [10_000, 100_000, 1_000_000], value=100_000, key="mc_draws")
+    with mc2:
+        mc_rev_vol = st.slider("Revenue uncertainty (%)", 0, 100, 20, key="mc_rev_vol")
+        mc_cost_vol = st.slider("Cost uncertainty (%)", 0, 100, 10, key="mc_cost_vol")
+    with mc3:
+        mc_corr = st.slider("Revenue–cost correlation", -1.0, 1.0, 0.3, 0.05, key="mc_corr")
+        mc_years = st.slider("Years of profit for NPV", 1, 10, 5, key="mc_years")
+        mc_rate = st.slider("Discount rate (%)", 1, 40, 12, key="mc_rate")
+    mc_init = st.number_input("Initial investment (R)", min_value=0.0, value=500_000.0, key="mc_init")
+
+    sim = run_monte_carlo(
+        base_rev, mc_rev_vol / 100, base_cost, mc_cost_vol / 100, mc_dist,
+        mc_corr, mc_draws, mc_init, mc_years, mc_rate / 100,
+    )
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Mean profit", f"R{sim.profit.mean:,.0f}")
+    m2.metric("Probability of loss", f"{sim.profit.p_loss:.1%}")
+    m3.metric("Mean NPV", f"R{sim.npv.mean:,.0f}")
+    m4.metric("Probability NPV < 0", f"{sim.npv.p_loss:.1%}")
+
+    st.dataframe(
+        pd.DataFrame({
+            "Profit (R)": sim.profit.percentiles,
+            "NPV (R)": sim.npv.percentiles,
+        }).rename(index=lambda q: f"P{q:g}").style.format("R{:,.0f}")
+    )
+    st.bar_chart(histogram_frame(sim.profit, "Profit (R)"))
+    st.caption(f"Based on {sim.draws:,} simulated draws.")
 
 # ================================================================
 # TAB 8 — ADJUSTED REVENUE
 # ================================================================
-with tabs[7]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "Adjusted Revenue")
+def adjusted_revenue_tab():
     st.header("8. Adjusted Revenue")
 
     st.markdown("""
@@ -356,13 +688,16 @@ Innovation often creates **indirect value**:
     with c3: carb = st.number_input("Carbon credits", 0.0, 100000.0, key="adj_car")
     with c4: lic = st.number_input("Licensing revenue", 0.0, 80000.0, key="adj_lic")
 
-    adjusted = direct + sav + carb + lic
+    adjusted = finance.adjusted_revenue(direct, sav, carb, lic)
     st.success(f"Adjusted Revenue: **R{adjusted:,.0f}**")
 
 # ================================================================
 # TAB 9 — FINANCIAL STORY
 # ================================================================
-with tabs[8]:
+@st.fragment
+@workspace.autosaved(PAGE, INPUT_PREFIXES)
+@timed_section(PAGE, "Financial Story")
+def story_tab():
     st.header("9. The Financial Story")
 
     st.markdown("""
@@ -392,3 +727,35 @@ This is used for pitches, incubators, and funding agencies.
         st.info(f"4. Our margin model works because: **{m}**.")
         st.info(f"5. Funding will: **{f}**.")
 
+
+# ================================================================
+# Layout
+# ================================================================
+
+tabs = st.tabs([
+    "Costs",
+    "Pricing",
+    "Cash Flow",
+    "DCF & NPV",
+    "IRR",
+    "Valuation",
+    "Risk & Scenarios",
+    "Adjusted Revenue",
+    "Financial Story"
+])
+
+for tab, render in zip(tabs, [
+    costs_tab,
+    pricing_tab,
+    cash_flow_tab,
+    npv_tab,
+    irr_tab,
+    valuation_tab,
+    scenarios_tab,
+    adjusted_revenue_tab,
+    story_tab,
+]):
+    with tab:
+        render()
+
+page_timer.stop()
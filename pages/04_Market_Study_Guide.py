@@ -1 +1,190 @@
+from pathlib import Path
 
+import streamlit as st
+
+from utils import market_sizing
+from utils.instrumentation import PageTimer, counted_cache
+
+PAGE = "Market Study Guide"
+
+st.set_page_config(page_title="Market Study Guide", layout="wide")
+page_timer = PageTimer(PAGE)
+
+st.title("🗺️ Market Study Guide")
+st.caption("Size your market from real data: total, serviceable and obtainable.")
+
+st.markdown("""
+Investors ask three questions about your market:
+
+- **TAM — Total Addressable Market.** Everyone who *could* use a solution like yours, valued per year.
+- **SAM — Serviceable Available Market.** The part of the TAM your product, channel and region can actually reach.
+- **SOM — Serviceable Obtainable Market.** The share of the SAM you can realistically win in the next few years.
+
+A credible market study builds these **bottom-up**: count the customers in a dataset (firms, households,
+sites), multiply by what each one is worth to you, then narrow down with the segments you can serve.
+""")
+
+with st.expander("📘 Where to find market data"):
+    st.markdown("""
+- **Firm registries** — company registers and industry databases (count firms by sector, size and region).
+- **Household data** — census and household survey tables (households by region, income and settlement type).
+- **Energy and utilities** — consumption by region or customer class from regulators and utilities.
+
+Export the table as CSV or Parquet and place it in `data/market/` on the server. Files can be several GB:
+they are read in chunks, and a CSV is converted once to a columnar snapshot so later questions are fast.
+""")
+
+st.markdown("---")
+
+# ================================================================
+# Helper Functions
+# ================================================================
+COUNT_ROWS = "(count rows)"
+
+
+@counted_cache(st.cache_data(show_spinner="Preparing dataset…", max_entries=16), "market_columnar")
+def prepare(path: str, mtime_ns: int, size: int):
+    """Build the columnar snapshot once and describe its columns; keyed on the file version."""
+    return market_sizing.column_stats(market_sizing.columnar(Path(path)))
+
+
+@counted_cache(st.cache_data(show_spinner="Sizing the market…", max_entries=64), "market_size")
+def size_market(path: str, mtime_ns: int, size: int, measure, unit_value, filters, share, group_by):
+    return market_sizing.market_size(
+        Path(path), measure, unit_value, filters, share, group_by
+    )
+
+
+def money(value):
+    return f"R{value:,.0f}"
+
+
+# ================================================================
+# Dataset
+# ================================================================
+st.header("1. Choose a dataset")
+datasets = market_sizing.list_datasets()
+if not datasets:
+    st.info(f"No datasets found in `{market_sizing.MARKET_DIR}`.")
+    if st.button("Create a sample household dataset to practise on", key="ms_sample"):
+        with st.spinner("Writing sample data…"):
+            market_sizing.write_sample_dataset(market_sizing.MARKET_DIR / "sample_households.csv")
+        st.rerun()
+    page_timer.stop()
+    st.stop()
+
+path = st.selectbox("Dataset", datasets, format_func=lambda p: p.name, key="ms_dataset")
+stat = path.stat()
+st.caption(f"{stat.st_size / 2**20:,.1f} MB")
+try:
+    stats = prepare(str(path), stat.st_mtime_ns, stat.st_size)
+except ValueError as exc:
+    st.error(f"This file cannot be read: {exc}")
+    page_timer.stop()
+    st.stop()
+
+numeric = [name for name, s in stats.items() if s.numeric]
+text = [name for name, s in stats.items() if not s.numeric]
+
+# ================================================================
+# Market definition
+# ================================================================
+st.header("2. Define the market")
+filter_columns = st.multiselect(
+    "Narrow to the segments you can serve (SAM) using these columns", list(stats), key="ms_filter_cols"
+)
+
+with st.form("ms_form"):
+    col1, col2 = st.columns(2)
+    with col1:
+        measure = st.selectbox(
+            "What does each row count?", [COUNT_ROWS] + numeric, key="ms_measure",
+            help="e.g. `households` in a census table, or one row per firm in a registry.",
+        )
+    with col2:
+        unit_value = st.number_input(
+            "Value per unit per year (R)", min_value=0.0, value=1000.0, step=100.0, key="ms_unit",
+            help="What one household, firm or kWh is worth to you in a year.",
+        )
+
+    filters = []
+    for name in filter_columns:
+        s = stats[name]
+        if s.numeric and s.minimum is not None and s.minimum < s.maximum:
+            low, high = st.slider(name, s.minimum, s.maximum, (s.minimum, s.maximum), key=f"ms_range_{name}")
+            if low > s.minimum:
+                filters.append((name, ">=", low))
+            if high < s.maximum:
+                filters.append((name, "<=", high))
+        elif not s.numeric:
+            if s.truncated:
+                st.caption(
+                    f"`{name}` has more than {market_sizing.MAX_DISTINCT} values; only the first are listed. "
+                    "Values you remove are excluded, values not listed stay in."
+                )
+            chosen = st.multiselect(name, s.values, default=list(s.values), key=f"ms_values_{name}")
+            if len(chosen) < len(s.values):
+                if s.truncated:
+                    # Exclude what was deselected, so rows with unlisted values stay in the market.
+                    filters.append((name, "not in", tuple(v for v in s.values if v not in chosen)))
+                else:
+                    filters.append((name, "in", tuple(chosen)))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        share = st.slider("Share of the SAM you can win (SOM, %)", 0.1, 50.0, 5.0, step=0.1, key="ms_share") / 100
+    with col2:
+        group_by = st.multiselect("Break down by", text, key="ms_group")
+    submitted = st.form_submit_button("Size the market")
+
+query = (
+    None if measure == COUNT_ROWS else measure,
+    unit_value,
+    tuple(filters),
+    share,
+    tuple(group_by),
+)
+if submitted:
+    st.session_state["ms_query"] = (str(path), query)
+
+# ================================================================
+# Results
+# ================================================================
+last = st.session_state.get("ms_query")
+if last and last[0] == str(path):
+    result = size_market(str(path), stat.st_mtime_ns, stat.st_size, *last[1])
+    _, last_unit, last_filters, last_share, last_group = last[1]
+
+    st.header("3. Your market")
+    m1, m2, m3 = st.columns(3)
+    m1.metric("TAM", money(result.tam))
+    m2.metric("SAM", money(result.sam), f"{result.sam / result.tam:.1%} of TAM" if result.tam else None)
+    m3.metric("SOM", money(result.som), f"{last_share:.1%} of SAM", delta_color="off")
+    st.caption(f"{result.matched:,} of {result.rows:,} rows are in your segment.")
+
+    if last_filters:
+        st.markdown("**Segment:** " + "; ".join(
+            f"{c} {op} {', '.join(map(str, v)) if isinstance(v, tuple) else f'{v:,.4g}'}" for c, op, v in last_filters
+        ))
+
+    if result.groups is not None and len(result.groups):
+        st.markdown("#### Breakdown")
+        labels = result.groups[list(last_group)].astype(str).agg(" · ".join, axis=1)
+        top = result.groups.assign(Segment=labels).head(20).set_index("Segment")
+        st.bar_chart(top[["sam", "som"]].rename(columns={"sam": "SAM (R)", "som": "SOM (R)"}))
+        st.dataframe(
+            result.groups.rename(columns={"tam": "TAM (R)", "sam": "SAM (R)", "som": "SOM (R)"})
+            .style.format({"TAM (R)": "{:,.0f}", "SAM (R)": "{:,.0f}", "SOM (R)": "{:,.0f}"}),
+            hide_index=True,
+        )
+
+    st.info("""
+**Sense-check before you present:**
+- Is the SOM share backed by a sales plan (reps, channels, conversion rates)?
+- Would a top-down figure from an industry report land in the same order of magnitude?
+- Does the SAM exclude customers you cannot reach yet (regions, languages, regulation)?
+""")
+else:
+    st.caption("Set up the market and press **Size the market**.")
+
+page_timer.stop()
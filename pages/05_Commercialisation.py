@@ -1 +1,182 @@
+import time
 
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import stage_gate
+from utils.instrumentation import PageTimer, counted_cache
+from utils.pools import WORKERS, process_pool
+
+PAGE = "Commercialisation"
+
+st.set_page_config(page_title="Commercialisation", layout="wide")
+page_timer = PageTimer(PAGE)
+
+st.title("🚀 Commercialisation")
+st.caption("From lab to market: how long it takes, what it costs, and how many make it.")
+
+st.markdown("""
+Most innovation programmes run a **stage-gate** process: at each step up the TRL scale a project
+spends time and money, then faces a review that decides whether it continues. Few projects pass
+every gate, and the ones that do take years — so a cohort's funding need is a *distribution*, not a number.
+
+This simulator plays out thousands of possible futures for a whole cohort, gate by gate, and
+shows what budget and timeline you should plan for.
+""")
+
+st.markdown("---")
+
+# ================================================================
+# Helper Functions
+# ================================================================
+GATE_COLUMNS = ["Min months", "Likely months", "Max months", "Min cost (R)", "Likely cost (R)", "Max cost (R)", "Pass rate (%)"]
+
+
+@counted_cache(st.cache_data(show_spinner="Simulating the portfolio…", max_entries=32), "stage_gate")
+def run_portfolio(cohort, gate_rows, trajectories):
+    gates = [stage_gate.Gate(tuple(row[0:3]), tuple(row[3:6]), row[6] / 100) for row in gate_rows]
+    executor = process_pool() if WORKERS > 1 else None
+    return stage_gate.simulate(dict(cohort), gates, trajectories, seed=0, executor=executor)
+
+
+def rand(value):
+    if abs(value) >= 1e6:
+        return f"R{value / 1e6:,.1f}m"
+    return f"R{value / 1e3:,.0f}k"
+
+
+def default_gates():
+    return pd.DataFrame(
+        [[*g.duration, *g.cost, g.pass_rate * 100] for g in stage_gate.DEFAULT_GATES],
+        columns=GATE_COLUMNS,
+        index=[f"TRL {i} → {i + 1}" for i in range(1, stage_gate.MARKET_TRL)],
+    )
+
+
+# ================================================================
+# Inputs
+# ================================================================
+with st.form("sg_form"):
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.markdown("#### Your cohort")
+        cohort_table = st.data_editor(
+            pd.DataFrame(
+                {"Projects": [0, 0, 5, 8, 0, 5, 2, 0, 0]},
+                index=pd.Index(range(1, stage_gate.MARKET_TRL + 1), name="Starting TRL"),
+            ),
+            column_config={"Projects": st.column_config.NumberColumn(min_value=0, max_value=500, step=1)},
+            key="sg_cohort",
+        )
+    with col2:
+        st.markdown("#### Stage gates")
+        st.caption("Typical figures for hardware-led innovation — replace them with your programme's own data.")
+        gate_table = st.data_editor(
+            default_gates(),
+            column_config={
+                "Pass rate (%)": st.column_config.NumberColumn(min_value=0, max_value=100, step=1),
+                **{c: st.column_config.NumberColumn(min_value=0, format="localized") for c in GATE_COLUMNS[3:6]},
+            },
+            key="sg_gates",
+        )
+    trajectories = st.select_slider(
+        "Simulated futures", [1_000, 5_000, 10_000, 25_000, 50_000], value=10_000, key="sg_runs",
+        help="More futures give steadier percentiles and take longer.",
+    )
+    st.form_submit_button("Run simulation")
+
+cohort = tuple((int(trl), int(n)) for trl, n in cohort_table["Projects"].fillna(0).items() if n > 0)
+gate_rows = tuple(tuple(float(v) for v in row) for row in gate_table[GATE_COLUMNS].fillna(0).to_numpy())
+
+if not cohort:
+    st.info("Add at least one project to the cohort.")
+    page_timer.stop()
+    st.stop()
+
+start = time.perf_counter()
+try:
+    result = run_portfolio(cohort, gate_rows, trajectories)
+except ValueError as exc:
+    st.error(f"Check the stage gates: {exc}")
+    page_timer.stop()
+    st.stop()
+elapsed = time.perf_counter() - start
+
+# ================================================================
+# Results
+# ================================================================
+st.header("What to plan for")
+projects = sum(n for _, n in cohort)
+p50, p90 = np.percentile(result.funding, [50, 90])
+first = result.first_launch[~np.isnan(result.first_launch)]
+
+m1, m2, m3, m4 = st.columns(4)
+m1.metric("Projects", projects)
+m2.metric("Expected launches", f"{result.launches.mean():.1f}",
+          f"{(result.launches > 0).mean():.0%} chance of at least one", delta_color="off")
+m3.metric("Funding need (median)", rand(p50), f"{rand(p90)} at 90% confidence", delta_color="off")
+m4.metric("First launch (median)", f"{np.median(first):.0f} months" if first.size else "—")
+st.caption(f"{trajectories:,} simulated futures in {elapsed:.2f} s.")
+
+# ================================================================
+# Funding need
+# ================================================================
+st.markdown("#### Total funding need of the cohort")
+counts, edges = np.histogram(result.funding, bins=40)
+st.altair_chart(
+    alt.Chart(pd.DataFrame({"From": edges[:-1] / 1e6, "To": edges[1:] / 1e6, "Futures": counts}))
+    .mark_bar()
+    .encode(x=alt.X("From:Q", title="Total funding (R million)"), x2="To:Q", y="Futures:Q")
+    + alt.Chart(pd.DataFrame({"Funding": [p50 / 1e6, p90 / 1e6], "Level": ["Median", "90% confidence"]}))
+    .mark_rule(color="black", strokeDash=[4, 4])
+    .encode(x="Funding:Q", tooltip=["Level", alt.Tooltip("Funding:Q", format=",.1f")])
+)
+st.caption("Budgeting at the 90% line covers the cohort's needs in nine futures out of ten.")
+
+st.markdown("#### Spend per year")
+spent = np.flatnonzero(result.yearly_spend.any(axis=0))
+last_year = int(spent.max()) + 1 if spent.size else 1
+yearly = pd.DataFrame(
+    {
+        "Average": result.yearly_spend.mean(axis=0),
+        "Median": np.percentile(result.yearly_spend, 50, axis=0),
+        "90% confidence": np.percentile(result.yearly_spend, 90, axis=0),
+    },
+    index=pd.Index(np.arange(1, stage_gate.YEARS + 1), name="Year"),
+).iloc[:last_year] / 1e6
+st.line_chart(yearly, y_label="R million")
+
+# ================================================================
+# By starting TRL
+# ================================================================
+st.markdown("#### By starting TRL")
+st.dataframe(
+    pd.DataFrame([
+        {
+            "Starting TRL": trl,
+            "Projects": n,
+            "Chance of reaching market": result.launch_probability(trl),
+            "Expected launches": result.launch_probability(trl) * n,
+            "Median months to market": result.time_to_market(trl, 0.5),
+            "90th percentile months": result.time_to_market(trl, 0.9),
+        }
+        for trl, n in cohort
+    ]).style.format({
+        "Chance of reaching market": "{:.1%}",
+        "Expected launches": "{:.1f}",
+        "Median months to market": "{:.0f}",
+        "90th percentile months": "{:.0f}",
+    }, na_rep="—"),
+    hide_index=True,
+)
+
+st.info("""
+**Using the results:**
+- Early-TRL projects are cheap to start but rarely reach the market — fund many, expect few.
+- Late-stage gates cost the most; the pass rates of TRL 6 → 8 drive most of the budget.
+- Compare the yearly spend with your funding calendar to see when top-ups will be needed.
+""")
+
+page_timer.stop()
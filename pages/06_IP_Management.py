@@ -1 +1,178 @@
+import hashlib
+import time
+from pathlib import Path
 
+import streamlit as st
+
+from utils import prior_art
+from utils.instrumentation import PageTimer, counted_cache
+
+PAGE = "IP Management"
+
+st.set_page_config(page_title="IP Management", layout="wide")
+page_timer = PageTimer(PAGE)
+
+st.title("🛡️ IP Management")
+st.caption("Check what already exists before you file, pitch or build.")
+
+st.markdown("""
+A patent is only granted for an invention that is **new** and **not obvious** compared with everything
+published before the filing date — the *prior art*. Searching it early tells you:
+
+- **Novelty** — has someone already described your idea?
+- **Freedom to operate** — would your product use something another party has protected?
+- **White space** — where the crowded areas are, and where there is room to claim.
+
+Describe your invention below to find the closest documents in your local patent and abstract collection.
+This is a first screen, not a legal opinion: talk to a patent attorney before you file.
+""")
+
+corpus_dir = prior_art.CORPUS_DIR
+if corpus_dir.is_relative_to(prior_art.DATA_DIR.parent):
+    corpus_dir = corpus_dir.relative_to(prior_art.DATA_DIR.parent)
+
+with st.expander("📘 Building a prior-art collection"):
+    st.markdown(f"""
+- Export abstracts from a patent office or a publication database as **CSV** or **JSON Lines** with
+  `id`, `title` and `abstract` columns, or save documents as plain **.txt** files (first line = title).
+- Place the files in `{corpus_dir}/` on the server, or upload them below.
+- Only new or changed files are read, and only documents with new ids are indexed, so adding a
+  new export never rebuilds what is there. A document already in the index is never re-indexed:
+  to correct one, add it again under a new id.
+""")
+
+st.markdown("---")
+
+# ================================================================
+# Helper Functions
+# ================================================================
+@counted_cache(st.cache_resource, "prior_art_index")
+def load_index() -> prior_art.PriorArtIndex:
+    return prior_art.PriorArtIndex()
+
+
+def show_hits(hits, score_label):
+    for hit in hits:
+        with st.container(border=True):
+            st.markdown(f"**{hit.title or hit.id}** · `{hit.id}` · {score_label} **{hit.score:.2f}**")
+            st.caption(hit.snippet + ("…" if len(hit.snippet) >= prior_art.SNIPPET_CHARS else ""))
+
+
+index = load_index()
+
+# ================================================================
+# Collection
+# ================================================================
+st.header("1. Your prior-art collection")
+files = prior_art.corpus_files()
+pending = [p for p in files if index.meta["sources"].get(str(p)) != [p.stat().st_mtime_ns, p.stat().st_size]]
+
+c1, c2, c3 = st.columns(3)
+c1.metric("Documents indexed", f"{len(index):,}")
+c2.metric("Collection files", len(files))
+c3.metric("Index segments", len(index.segments))
+
+col1, col2 = st.columns(2)
+with col1:
+    if pending:
+        st.caption(f"{len(pending)} file(s) not indexed yet.")
+    if st.button("Index new files", key="ip_index", disabled=not pending):
+        try:
+            with st.spinner("Indexing…"):
+                added = index.add_files(pending)
+        except ValueError as exc:
+            st.error(f"A file could not be read: {exc}")
+        else:
+            st.toast(f"Added {added:,} documents.")
+            st.rerun()
+    if len(index.segments) > 1 and st.button("Compact the index", key="ip_compact",
+                                             help="Merge segments left by many small additions."):
+        with st.spinner("Compacting…"):
+            index.compact()
+        st.rerun()
+with col2:
+    uploads = st.file_uploader(
+        "Add files", type=["csv", "jsonl", "txt"], accept_multiple_files=True, key="ip_upload"
+    )
+    st.caption(
+        "⚠️ The collection is shared: added documents are stored on the server and everyone using "
+        "this app can find them in search results. Do not add confidential text."
+    )
+    if uploads and st.button("Add to the collection", key="ip_add"):
+        target = prior_art.CORPUS_DIR / "uploads"
+        target.mkdir(parents=True, exist_ok=True)
+        saved = []
+        for upload in uploads:
+            # Only the base name of the client's file name, so uploads stay in `target`.
+            name = Path(upload.name).name
+            if not name or name.startswith("."):
+                st.error(f"Skipped {upload.name!r}: not a valid file name.")
+                continue
+            # Prefixed with a hash of the content, so users uploading files with
+            # the same name never overwrite each other's source.
+            data = upload.getvalue()
+            path = target / f"{hashlib.sha256(data).hexdigest()[:12]}-{name}"
+            if not path.exists():
+                path.write_bytes(data)
+            saved.append(path)
+        try:
+            with st.spinner("Indexing…"):
+                added = index.add_files(saved) if saved else 0
+        except ValueError as exc:
+            st.error(f"A file could not be read: {exc}")
+        else:
+            if saved:
+                st.toast(f"Added {added:,} documents.")
+                st.rerun()
+
+if len(index) == 0:
+    st.info("The collection is empty. Add abstracts above to start searching.")
+    page_timer.stop()
+    st.stop()
+
+st.markdown("---")
+
+# ================================================================
+# Similar documents
+# ================================================================
+st.header("2. Search for similar documents")
+description = st.text_area(
+    "Describe your invention",
+    height=160,
+    key="ip_query",
+    placeholder="e.g. A solar-powered cold room that stores excess energy as ice for night-time cooling…",
+    help="Write it as you would an abstract: what it is, how it works, what problem it solves.",
+)
+k = st.slider("Number of results", 5, 50, 10, step=5, key="ip_k")
+
+if description.strip():
+    start = time.perf_counter()
+    hits = index.search(description, k)
+    elapsed = time.perf_counter() - start
+    st.caption(f"Searched {len(index):,} documents in {elapsed * 1000:,.0f} ms.")
+    if hits:
+        show_hits(hits, "similarity")
+        st.info("""
+**Reading the results:** a similarity above ~0.5 usually means the same idea described in other words —
+read that document's claims. Low scores across the board suggest open space, or that your
+collection does not cover the field yet.
+""")
+    else:
+        st.warning("No document shares any distinctive words with your description.")
+
+    # ================================================================
+    # Near duplicates
+    # ================================================================
+    if index.has_minhash:
+        st.header("3. Near-duplicate check")
+        st.caption("Finds documents that repeat your text almost word for word, e.g. a copied or re-filed abstract.")
+        threshold = st.slider("Minimum overlap", 0.3, 1.0, 0.5, step=0.05, key="ip_dup_threshold")
+        duplicates = index.near_duplicates(description, threshold)
+        if duplicates:
+            show_hits(duplicates, "overlap")
+        else:
+            st.success("No near-duplicates found.")
+else:
+    st.caption("Describe your invention to search the collection.")
+
+page_timer.stop()
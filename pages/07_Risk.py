@@ -1 +1,138 @@
+import altair as alt
+import pandas as pd
+import streamlit as st
 
+from utils import sensitivity
+from utils.instrumentation import PageTimer, counted_cache
+
+PAGE = "Risk"
+
+st.set_page_config(page_title="Risk & Sensitivity for Innovators", layout="wide")
+page_timer = PageTimer(PAGE)
+
+st.title("🌪️ Risk & Sensitivity")
+st.caption("Find out which assumptions your business case depends on most, before an investor asks.")
+
+st.markdown("""
+Scenarios move several assumptions at once. **Sensitivity analysis** moves *one* assumption at a time
+and keeps everything else fixed, so you can see which driver really moves your profit and NPV:
+
+- A **tornado chart** ranks drivers by how far the result swings across the range.
+- The **elasticity** is the % change in the result for a 1% change in the driver.
+  An elasticity of 5 on price means a 1% price cut costs 5% of the result.
+""")
+
+# ================================================================
+# Helper Functions
+# ================================================================
+METRIC_LABELS = {"npv": "NPV (R)", "profit": "Year-1 profit (R)"}
+
+
+@counted_cache(st.cache_data(max_entries=64), "sensitivity")
+def run_sensitivity(price, variable_cost, fixed_costs, units, discount_rate, growth, initial, years, spread, steps):
+    """Cached per input set; every what-if is evaluated in one batched pass."""
+    base = {
+        "price": price, "variable_cost": variable_cost, "fixed_costs": fixed_costs,
+        "units": units, "discount_rate": discount_rate, "growth": growth,
+    }
+    return sensitivity.analyse(base, initial, years, spread, steps)
+
+
+def tornado_chart(result, metric, spread):
+    drivers, low, high = sensitivity.tornado(result, metric)
+    base = result.base_npv if metric == "npv" else result.base_profit
+    labels = [sensitivity.DRIVERS[d] for d in drivers]
+    bars = pd.DataFrame({
+        "Driver": labels * 2,
+        "Driver at": [f"-{spread:.0%}"] * len(labels) + [f"+{spread:.0%}"] * len(labels),
+        "From": [base] * (2 * len(labels)),
+        "To": list(low) + list(high),
+    })
+    return (
+        alt.Chart(bars)
+        .mark_bar()
+        .encode(
+            y=alt.Y("Driver:N", sort=labels, title=None),
+            x=alt.X("From:Q", title=METRIC_LABELS[metric]),
+            x2="To:Q",
+            color=alt.Color("Driver at:N", scale=alt.Scale(range=["#E4572E", "#4A90E2"])),
+            tooltip=["Driver", "Driver at", alt.Tooltip("To:Q", format=",.0f", title=METRIC_LABELS[metric])],
+        )
+        + alt.Chart(pd.DataFrame({"Base": [base]})).mark_rule(color="black").encode(x="Base:Q")
+    )
+
+
+# ================================================================
+# Inputs
+# ================================================================
+st.markdown("### Your base case")
+col1, col2, col3 = st.columns(3)
+with col1:
+    price = st.number_input("Selling price per unit (R)", min_value=0.0, value=600.0, key="rk_price")
+    variable_cost = st.number_input("Variable cost per unit (R)", min_value=0.0, value=200.0, key="rk_var")
+with col2:
+    fixed_costs = st.number_input("Monthly fixed costs (R)", min_value=0.0, value=60000.0, key="rk_fixed")
+    units = st.number_input("Units sold per month", min_value=0.0, value=200.0, key="rk_units")
+with col3:
+    discount_rate = st.slider("Discount rate (%)", 1, 40, 12, key="rk_rate") / 100
+    growth = st.slider("Yearly growth in units (%)", 0, 200, 15, key="rk_growth") / 100
+
+col4, col5, col6 = st.columns(3)
+with col4:
+    initial = st.number_input("Initial investment (R)", min_value=0.0, value=500000.0, key="rk_init")
+with col5:
+    years = st.slider("Years of projection", 1, 10, 5, key="rk_years")
+with col6:
+    spread = st.slider("Move each driver by ± (%)", 5, 50, 20, step=5, key="rk_spread") / 100
+
+result = run_sensitivity(price, variable_cost, fixed_costs, units, discount_rate, growth, initial, years, spread, 9)
+
+m1, m2 = st.columns(2)
+m1.metric("Base year-1 profit", f"R{result.base_profit:,.0f}")
+m2.metric("Base NPV", f"R{result.base_npv:,.0f}")
+
+st.markdown("---")
+
+# ================================================================
+# Tornado
+# ================================================================
+st.header("Tornado chart")
+metric = st.radio("Result", list(METRIC_LABELS), format_func=METRIC_LABELS.get, horizontal=True, key="rk_metric")
+st.altair_chart(tornado_chart(result, metric, spread))
+st.caption(
+    "Each bar runs from the base case to the result with one driver moved down (red) or up (blue). "
+    "Drivers at the top matter most — test those assumptions first."
+)
+
+# ================================================================
+# Elasticities
+# ================================================================
+st.header("Elasticity table")
+values = result.npv if metric == "npv" else result.profit
+st.dataframe(
+    pd.DataFrame({
+        "Driver": [sensitivity.DRIVERS[d] for d in result.drivers],
+        "Base value": [result.base[d] for d in result.drivers],
+        "Profit elasticity": result.profit_elasticity,
+        "NPV elasticity": result.npv_elasticity,
+        f"{METRIC_LABELS[metric]} at -{spread:.0%}": values[:, 0],
+        f"{METRIC_LABELS[metric]} at +{spread:.0%}": values[:, -1],
+        "Swing (R)": abs(values[:, -1] - values[:, 0]),
+    }).sort_values("Swing (R)", ascending=False).style.format(precision=2, thousands=","),
+    hide_index=True,
+)
+st.caption("Drivers with a base value of zero cannot move in relative terms and show no effect.")
+
+# ================================================================
+# Spider chart
+# ================================================================
+st.header("How the result moves across the range")
+st.line_chart(
+    pd.DataFrame(
+        values.T,
+        columns=[sensitivity.DRIVERS[d] for d in result.drivers],
+        index=pd.Index(result.changes * 100, name="Change in driver (%)"),
+    )
+)
+
+page_timer.stop()
@@ -1 +1,278 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
 
+from utils import financing
+from utils.instrumentation import PageTimer, counted_cache, timed_section
+
+PAGE = "Financial Options"
+
+st.set_page_config(page_title="Financial Options for Innovators", layout="wide")
+page_timer = PageTimer(PAGE)
+
+st.title("💰 Financial Options for Innovators")
+st.caption("Compare loans, convertible notes, grants, equity and revenue-based financing across every combination of terms.")
+
+# ================================================================
+# Helper Functions
+# ================================================================
+METRICS = {
+    "PV cost (R)": "pv_cost",
+    "Effective annual rate (%)": "effective_rate",
+    "Total cost (R)": "total_cost",
+    "Peak monthly payment (R)": "peak_payment",
+    "Equity given up (%)": "dilution",
+}
+PERCENT_METRICS = {"effective_rate", "dilution"}
+
+
+def summary_frame(schedules, discount_rate, columns):
+    """One row per term combination: the swept terms, then every metric."""
+    metrics = financing.summarise(schedules, discount_rate)
+    frame = pd.DataFrame({label: schedules.terms[name] * scale for name, (label, scale) in columns.items()})
+    frame.insert(0, "Instrument", schedules.instrument)
+    for label, name in METRICS.items():
+        frame[label] = metrics[name] * (100 if name in PERCENT_METRICS else 1)
+    return frame
+
+
+@counted_cache(st.cache_data(max_entries=64), "financing_sweep")
+def sweep(instrument, horizon, discount_rate, exit_value, amount, options):
+    """
+    Build and summarise every combination of `options` (name -> tuple of
+    values) for one instrument. Cached per input set.
+    """
+    grid = financing.term_grid(**dict(options))
+    if instrument == "Loan":
+        valid = grid["grace"] < grid["tenor"]
+        grid = {k: v[valid] for k, v in grid.items()}
+        schedules = financing.loan_schedules(amount, grid["rate"], grid["tenor"], grid["grace"], horizon)
+        columns = {"annual_rate": ("Rate (%)", 100), "tenor": ("Tenor (months)", 1), "grace": ("Grace (months)", 1)}
+    elif instrument == "Convertible note":
+        schedules = financing.convertible_note_schedules(
+            amount, grid["interest"], grid["discount"], grid["cap"], grid["conversion_month"],
+            grid["round_pre_money"], exit_value, horizon,
+        )
+        columns = {
+            "interest": ("Interest (%)", 100), "discount": ("Discount (%)", 100), "cap": ("Cap (R)", 1),
+            "conversion_month": ("Converts (month)", 1),
+        }
+    elif instrument == "Grant":
+        schedules = financing.grant_schedules(amount, grid["admin"], grid["tranches"], horizon)
+        columns = {"admin": ("Admin burden (%)", 100), "tranches": ("Tranches", 1)}
+    elif instrument == "Equity":
+        schedules = financing.equity_schedules(amount, grid["pre_money"], exit_value, horizon)
+        columns = {"pre_money": ("Pre-money valuation (R)", 1)}
+    else:
+        schedules = financing.revenue_based_schedules(
+            amount, grid["revenue_share"], grid["cap_multiple"], grid["revenue"], grid["growth"], horizon
+        )
+        columns = {"revenue_share": ("Revenue share (%)", 100), "cap_multiple": ("Repayment cap (x)", 1)}
+    return summary_frame(schedules, discount_rate, columns)
+
+
+def show_ranked(frame, metric, limit=25):
+    ranked = frame.sort_values(metric, kind="stable").reset_index(drop=True)
+    st.caption(f"{len(frame):,} combinations evaluated · ranked by {metric.lower()}, lowest first.")
+    st.dataframe(ranked.head(limit).round(2), hide_index=True)
+    return ranked
+
+
+def compact(frame):
+    """Fold each instrument's own term columns into one readable Terms column."""
+    terms = frame.drop(columns=["Instrument", *METRICS])
+    text = [
+        ", ".join(f"{name} {value:,.4g}" for name, value in row.items() if pd.notna(value))
+        for row in terms.to_dict("records")
+    ]
+    return pd.concat(
+        [frame[["Instrument"]], pd.DataFrame({"Terms": text}, index=frame.index), frame[list(METRICS)].round(2)],
+        axis=1,
+    )
+
+
+def pct_range(label, lo, hi, value, step, key):
+    """A (low, high) slider in percent, returned as fractions."""
+    low, high = st.slider(label, lo, hi, value, step=step, key=key)
+    return low / 100, high / 100
+
+
+# ================================================================
+# Common Assumptions
+# ================================================================
+st.markdown("### Your funding need")
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    amount = st.number_input("Amount needed (R)", min_value=10000.0, value=1000000.0, step=50000.0, key="fo_amount")
+with col2:
+    horizon = st.slider("Comparison horizon (months)", 12, 120, 60, step=6, key="fo_horizon")
+with col3:
+    discount_rate = st.slider("Your own cost of money (%)", 1, 50, 15, key="fo_discount") / 100
+with col4:
+    exit_value = st.number_input(
+        "Company value at the horizon (R)", min_value=0.0, value=20000000.0, step=1000000.0, key="fo_exit"
+    )
+
+metric = st.selectbox("Rank options by", list(METRICS), key="fo_metric")
+st.caption(
+    "Every option is turned into a monthly cash schedule over the horizon. Debt still owed at the horizon is "
+    "repaid then, and equity is valued at the company value you expect. **PV cost** is what you pay minus "
+    "what you receive, in today's money at your own cost of money — negative means the option is a net gift."
+)
+
+st.markdown("---")
+
+# ================================================================
+# Instruments
+# ================================================================
+@timed_section(PAGE, "Loan")
+def loan_tab():
+    st.header("Amortising loans")
+    st.write("Interest-only during the grace period, then equal monthly payments until the end of the tenor.")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        low, high = pct_range("Interest rate range (%)", 0.0, 40.0, (6.0, 24.0), 0.5, "fo_loan_rate")
+        rates = tuple(np.round(np.arange(low, high + 1e-9, 0.005), 4))
+    with col2:
+        tenors = st.multiselect("Tenors (months)", list(range(12, 121, 12)), [12, 24, 36, 48, 60], key="fo_loan_tenor")
+    with col3:
+        graces = st.multiselect("Grace periods (months)", [0, 3, 6, 9, 12, 18, 24], [0, 3, 6, 12], key="fo_loan_grace")
+    if not tenors or not graces:
+        st.warning("Choose at least one tenor and one grace period.")
+        return None
+    frame = sweep("Loan", horizon, discount_rate, exit_value, amount,
+                  (("rate", rates), ("tenor", tuple(tenors)), ("grace", tuple(graces))))
+    if frame.empty:
+        st.warning("No grace period is shorter than any chosen tenor — choose a shorter grace period or a longer tenor.")
+        return None
+    ranked = show_ranked(frame, metric)
+
+    best = ranked.iloc[0]
+    schedule = financing.loan_schedules(
+        amount, best["Rate (%)"] / 100, best["Tenor (months)"], best["Grace (months)"], horizon
+    )
+    st.markdown("#### Best option: balance and monthly payment")
+    st.line_chart(pd.DataFrame(
+        {"Balance owed (R)": schedule.balance[0], "Payment (R)": np.maximum(-schedule.cash[0], 0)},
+        index=pd.Index(np.arange(horizon + 1), name="Month"),
+    ))
+    return frame
+
+
+@timed_section(PAGE, "Convertible note")
+def note_tab():
+    st.header("Convertible notes")
+    st.write("A loan that turns into shares at your next priced round, usually with a discount and a valuation cap.")
+    col1, col2 = st.columns(2)
+    with col1:
+        low, high = pct_range("Interest range (%)", 0.0, 20.0, (4.0, 10.0), 1.0, "fo_note_rate")
+        interests = tuple(np.round(np.arange(low, high + 1e-9, 0.01), 4))
+        discounts = st.multiselect("Discounts (%)", [0, 10, 15, 20, 25, 30], [15, 20, 25], key="fo_note_discount")
+    with col2:
+        round_pre = st.number_input("Expected pre-money at the priced round (R)", min_value=100000.0,
+                                    value=8000000.0, step=500000.0, key="fo_note_round")
+        caps = st.multiselect("Valuation caps (R m)", [2, 4, 6, 8, 10, 15, 20], [4, 6, 8, 10], key="fo_note_cap")
+        months = st.multiselect("Priced round in (months)", [6, 12, 18, 24, 36], [12, 18, 24], key="fo_note_month")
+    if not discounts or not caps or not months:
+        st.warning("Choose at least one discount, cap and conversion month.")
+        return None
+    frame = sweep("Convertible note", horizon, discount_rate, exit_value, amount, (
+        ("interest", interests),
+        ("discount", tuple(d / 100 for d in discounts)),
+        ("cap", tuple(c * 1e6 for c in caps)),
+        ("conversion_month", tuple(months)),
+        ("round_pre_money", (round_pre,)),
+    ))
+    show_ranked(frame, metric)
+    return frame
+
+
+@timed_section(PAGE, "Grant")
+def grant_tab():
+    st.header("Grants")
+    st.write("Non-repayable funding. The real cost is the time spent applying and reporting, and waiting for tranches.")
+    col1, col2 = st.columns(2)
+    with col1:
+        low, high = pct_range("Admin burden (% of grant)", 0.0, 30.0, (5.0, 15.0), 2.5, "fo_grant_admin")
+        admins = tuple(np.round(np.arange(low, high + 1e-9, 0.025), 4))
+    with col2:
+        tranches = st.multiselect("Paid in monthly tranches", [1, 2, 3, 4, 6, 12], [1, 4, 12], key="fo_grant_tranches")
+    if not tranches:
+        st.warning("Choose at least one tranche schedule.")
+        return None
+    frame = sweep("Grant", horizon, discount_rate, exit_value, amount,
+                  (("admin", admins), ("tranches", tuple(tranches))))
+    show_ranked(frame, metric)
+    return frame
+
+
+@timed_section(PAGE, "Equity")
+def equity_tab():
+    st.header("Equity rounds")
+    st.write("Investors buy shares at a pre-money valuation. Nothing is repaid, but they own part of the exit.")
+    low, high = st.slider("Pre-money valuation range (R m)", 0.5, 50.0, (2.0, 12.0), step=0.5, key="fo_eq_pre")
+    pre_money = tuple(np.round(np.arange(low, high + 1e-9, 0.5), 2) * 1e6)
+    frame = sweep("Equity", horizon, discount_rate, exit_value, amount, (("pre_money", pre_money),))
+    show_ranked(frame, metric)
+    return frame
+
+
+@timed_section(PAGE, "Revenue-based financing")
+def rbf_tab():
+    st.header("Revenue-based financing")
+    st.write("You repay a share of monthly revenue until a fixed multiple of the amount has been paid back.")
+    col1, col2 = st.columns(2)
+    with col1:
+        revenue = st.number_input("Current monthly revenue (R)", min_value=0.0, value=150000.0,
+                                  step=10000.0, key="fo_rbf_revenue")
+        growth = st.slider("Monthly revenue growth (%)", 0.0, 15.0, 3.0, step=0.5, key="fo_rbf_growth") / 100
+    with col2:
+        low, high = pct_range("Revenue share range (%)", 1.0, 25.0, (4.0, 12.0), 1.0, "fo_rbf_share")
+        shares = tuple(np.round(np.arange(low, high + 1e-9, 0.01), 4))
+        caps = st.multiselect("Repayment caps (x amount)", [1.2, 1.35, 1.5, 1.75, 2.0, 2.5], [1.35, 1.5, 2.0],
+                              key="fo_rbf_cap")
+    if not caps:
+        st.warning("Choose at least one repayment cap.")
+        return None
+    frame = sweep("Revenue-based financing", horizon, discount_rate, exit_value, amount, (
+        ("revenue_share", shares),
+        ("cap_multiple", tuple(caps)),
+        ("revenue", (revenue,)),
+        ("growth", (growth,)),
+    ))
+    show_ranked(frame, metric)
+    return frame
+
+
+@timed_section(PAGE, "Compare")
+def compare_tab(frames):
+    st.header("Compare every option")
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        st.info("Set up at least one instrument to compare.")
+        return
+    combined = pd.concat(frames, ignore_index=True)
+    ranked = combined.sort_values(metric, kind="stable")
+    best = compact(ranked.groupby("Instrument", sort=False).head(1))
+    st.markdown("#### Best terms per instrument")
+    st.dataframe(best, hide_index=True)
+    st.bar_chart(best.set_index("Instrument")[metric])
+    st.markdown("#### All combinations")
+    st.caption(f"{len(combined):,} combinations evaluated · ranked by {metric.lower()}, lowest first.")
+    st.dataframe(compact(ranked.head(50)), hide_index=True)
+
+
+# ================================================================
+# Layout
+# ================================================================
+tabs = st.tabs(["Loans", "Convertible notes", "Grants", "Equity", "Revenue-based", "Compare all"])
+
+frames = []
+for tab, render in zip(tabs, [loan_tab, note_tab, grant_tab, equity_tab, rbf_tab]):
+    with tab:
+        frames.append(render())
+
+with tabs[-1]:
+    compare_tab(frames)
+
+page_timer.stop()
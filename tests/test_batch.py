@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.batch import ChunkWriter, run, score_chunk
+
+PROJECTS = pd.DataFrame({
+    "id": ["A", "B"],
+    "fixed_costs": [1000.0, 1000.0], "var_cost": [60.0, 60.0], "price": [100.0, 50.0],
+    "revenue": [500.0, 1000.0], "variable": [200.0, 200.0], "fixed": [400.0, 400.0], "cash": [1000.0, 1000.0],
+    "initial": [100.0, 100.0], "cf_2": [0.0, 121.0], "cf_1": [110.0, np.nan], "discount_rate": [0.1, 0.0],
+    "team": [8, 0], "ip": [6, 0], "traction": [4, 0], "market": [2, 10],
+})
+
+
+def test_score_chunk_hand_values():
+    out = score_chunk(PROJECTS)
+    assert out["id"].tolist() == ["A", "B"]
+    assert out["margin"].tolist() == [40, -10]
+    assert out["break_even_units"][0] == 25 and np.isnan(out["break_even_units"][1])
+    assert out["gross"].tolist() == [300, 800] and out["net"].tolist() == [-100, 400]
+    assert out["burn"].tolist() == [100, 0] and out["runway_months"].tolist() == [10, np.inf]
+    # A: -100 + 110/1.1 = 0. B: a missing cf_1 counts as 0, so -100 + 121 undiscounted.
+    assert out["npv"].tolist() == pytest.approx([0, 21], abs=1e-9)
+    assert out["irr"].tolist() == pytest.approx([0.1, 0.1])
+    # 0.3 team + 0.25 ip + 0.2 traction + 0.25 market
+    assert out["valuation_score"].tolist() == pytest.approx([5.2, 2.5])
+
+
+def test_score_chunk_leaves_out_metrics_without_inputs():
+    out = score_chunk(PROJECTS[["id", "fixed_costs", "var_cost", "price"]])
+    assert list(out.columns) == ["id", "margin", "break_even_units"]
+
+
+def test_parquet_chunks_take_the_first_schema(tmp_path):
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "out.parquet"
+    writer = ChunkWriter(path)
+    writer.write(pd.DataFrame({"id": ["A", "B"], "n": [1, 2]}))
+    writer.write(pd.DataFrame({"id": ["C", "D"], "n": [3.0, np.nan]}))  # ints with a gap read as floats
+    writer.close()
+    table = pq.read_table(path)
+    assert str(table.schema.field("n").type) == "int64"
+    assert table.column("n").to_pylist() == [1, 2, 3, None]
+
+
+def test_parquet_chunk_with_an_incompatible_type(tmp_path):
+    writer = ChunkWriter(tmp_path / "out.parquet")
+    writer.write(pd.DataFrame({"n": [1, 2]}))
+    with pytest.raises(ValueError, match="changes type"):
+        writer.write(pd.DataFrame({"n": ["x", "y"]}))
+    writer.close()
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_run_streams_chunks_in_order(tmp_path, suffix):
+    source = tmp_path / "projects.csv"
+    pd.concat([PROJECTS] * 3, ignore_index=True).assign(id=list("ABCDEF")).to_csv(source, index=False)
+    target = tmp_path / f"scored{suffix}"
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert run(source, target, chunk_size=2, workers=1, executor=pool) == 6
+    scored = pd.read_csv(target) if suffix == ".csv" else pd.read_parquet(target)
+    assert scored["id"].tolist() == list("ABCDEF")
+    assert scored["margin"].tolist() == [40, -10] * 3
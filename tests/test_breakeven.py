@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from utils.breakeven import grid, heatmap_cells
+
+
+@pytest.fixture
+def small():
+    # prices 10, 20, 30; variable costs 10, 20; fixed costs 0, 100; 10 units.
+    return grid((10, 30), (10, 20), (0, 100), units=10, resolution=(3, 2, 2))
+
+
+def test_break_even_and_profit(small):
+    nan = np.nan
+    # margin [variable, price] = [[0, 10, 20], [-10, 0, 10]]
+    np.testing.assert_allclose(small.break_even[1], [[nan, 10, 5], [nan, nan, 10]])
+    np.testing.assert_allclose(small.break_even[0], [[nan, 0, 0], [nan, nan, 0]])
+    np.testing.assert_allclose(small.profit[1], [[-100, 0, 100], [-200, -100, 0]])
+    assert small.feasible[1].tolist() == [[False, False, True], [False, False, False]]
+
+
+def test_min_price(small):
+    # variable cost + fixed cost / units, indexed [fixed, variable]
+    np.testing.assert_allclose(small.min_price(), [[10, 20], [20, 30]])
+    no_volume = grid((10, 30), (10, 20), (0, 100), units=0, resolution=(3, 2, 2))
+    assert np.isinf(no_volume.min_price()).all()
+
+
+def test_ranges():
+    single = grid((10, 30), (5, 5), (100, 100), units=1, resolution=(3, 50, 50))
+    assert single.profit.shape == (1, 1, 3)
+    with pytest.raises(ValueError):
+        grid((30, 10), (5, 5), (0, 0), units=1)
+    with pytest.raises(ValueError):
+        grid((0, 1), (0, 1), (0, 1), units=1, resolution=(1000, 1000, 10))
+
+
+def areas(cells):
+    return (cells["x1"] - cells["x0"]) * (cells["y1"] - cells["y0"])
+
+
+def test_heatmap_cells_cover_the_grid_and_keep_the_mean():
+    x, y = np.arange(40.0), np.arange(30.0)
+    values = x[None, :] ** 2 - 10 * y[:, None]
+    cells = heatmap_cells(values, x, y, max_cells=100)
+    assert len(cells["value"]) <= 100
+    assert areas(cells).sum() == pytest.approx(40 * 30)  # unit spacing: area = points covered
+    assert (areas(cells) * cells["value"]).sum() == pytest.approx(values.sum())
+    assert cells["x0"].min() == -0.5 and cells["x1"].max() == 39.5
+
+
+def test_heatmap_cells_split_around_zero():
+    x, y = np.arange(32.0), np.arange(32.0)
+    values = np.broadcast_to(x - 20.5, (32, 32))  # profit changes sign between x = 20 and 21
+    cells = heatmap_cells(values, x, y, max_cells=200, tolerance=0.5)
+    narrow = cells["x1"] - cells["x0"] == 1
+    edges = set(cells["x0"][narrow]) | set(cells["x1"][narrow])
+    assert 20.5 in edges
+    assert (cells["x1"] - cells["x0"]).max() > 1  # far from zero stays coarse
+
+
+def test_heatmap_cells_of_flat_and_nan_values():
+    flat = heatmap_cells(np.full((10, 10), 3.0), np.arange(10.0), np.arange(10.0))
+    assert flat["value"].tolist() == [3.0]
+    values = np.full((4, 4), np.nan)
+    values[:, 2:] = [1.0, 2.0]  # break-even is nan where the margin is not positive
+    cells = heatmap_cells(values, np.arange(4.0), np.arange(4.0), max_cells=10)
+    nan = np.isnan(cells["value"])
+    assert nan.any() and (cells["x1"][nan] <= 1.5).all() and (cells["x0"][~nan] >= 1.5).all()
@@ -0,0 +1,71 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from utils.cashflow import Plan, grid, project
+
+# Each month: revenue 100 - variable 40 - fixed 50 = +10.
+BASE = Plan(cash=1000, revenue=100, variable_share=0.4, fixed=50)
+
+
+def test_steady_plan():
+    p = project([BASE], months=3)
+    assert p.months.tolist() == [1, 2, 3]
+    assert p.operating[0] == pytest.approx([10, 10, 10])
+    assert p.cash[0] == pytest.approx([1010, 1020, 1030])
+    assert np.isnan(p.runway_out[0]) and p.break_even[0] == 1
+
+
+def test_hires_add_cost_from_their_month():
+    plan = Plan(cash=15, revenue=100, variable_share=0.4, fixed=50, hires=((3, 30), (5, 10)))
+    p = project([plan], months=5)
+    assert p.costs[0] == pytest.approx([90, 90, 120, 120, 130])
+    assert p.cash[0] == pytest.approx([25, 35, 15, -5, -35])
+    assert p.runway_out[0] == 4 and p.break_even[0] == 1
+    assert p.runway_dates(date(2026, 11, 1)) == [date(2027, 2, 1)]
+
+
+def test_only_the_highest_tier_reached_is_paid():
+    # Revenue doubles over a year: 100 in month 1, 200 in month 13.
+    plan = Plan(cash=0, revenue=100, variable_share=0.4, fixed=50, growth=1.0, tiers=((150, 20), (50, 5), (300, 99)))
+    p = project([plan], months=13)
+    assert p.revenue[0, 12] == pytest.approx(200)
+    assert p.costs[0, 0] == pytest.approx(40 + 50 + 5)
+    assert p.costs[0, 12] == pytest.approx(80 + 50 + 20)
+
+
+def test_funding_lands_in_its_month():
+    plan = Plan(cash=0, revenue=0, variable_share=0, fixed=100, funding=((2, 500),))
+    p = project([plan], months=3)
+    assert p.funding[0] == pytest.approx([0, 500, 0])
+    assert p.cash[0] == pytest.approx([-100, 300, 200])
+    assert p.runway_out[0] == 1 and np.isnan(p.break_even[0])
+
+
+def test_plans_of_different_shapes_project_together():
+    plans = [BASE, Plan(cash=15, revenue=100, variable_share=0.4, fixed=50, hires=((3, 30),), tiers=((0, 1),))]
+    p = project(plans, months=4)
+    assert len(p) == 2
+    assert p.cash[0] == pytest.approx([1010, 1020, 1030, 1040])
+    assert p.cash[1] == pytest.approx([24, 33, 12, -9])
+    with pytest.raises(ValueError):
+        p.cash[0, 0] = 0  # results are read-only
+
+
+def test_grid_is_every_combination():
+    plans, combos = grid(BASE, growth=[0.0, 0.2], revenue=[100, 200])
+    assert combos == [
+        {"growth": 0.0, "revenue": 100}, {"growth": 0.0, "revenue": 200},
+        {"growth": 0.2, "revenue": 100}, {"growth": 0.2, "revenue": 200},
+    ]
+    assert [(p.growth, p.revenue, p.fixed) for p in plans][-1] == (0.2, 200, 50)
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        Plan(cash=0, revenue=0, variable_share=0, fixed=0, hires=((0, 1),))
+    with pytest.raises(ValueError):
+        project([BASE], months=0)
+    with pytest.raises(ValueError):
+        project([])
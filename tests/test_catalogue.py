@@ -0,0 +1,102 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from utils.catalogue import MISSING, DetailStore, load_catalogue, write_details
+
+MODELS = [
+    {
+        "id": "BM1", "name": "Subscription", "description": "Recurring fees", "tags": ["saas", "recurring"],
+        "difficulty": 2, "capital_requirement": "Low", "time_to_revenue": "Fast", "maturity_level": "Proven",
+        "revenue_streams": ["fees"], "use_cases": ["software"], "examples": ["Netflix"], "risks": ["churn"],
+    },
+    {
+        "id": "BM2", "name": "Franchise", "description": "Licensed outlets", "tags": ["retail"],
+        "capital_requirement": "High", "revenue_streams": ["royalties"], "examples": ["Nando's"],
+    },
+    {
+        "id": "BM3", "name": "Marketplace", "description": "Two-sided", "tags": ["platform", "saas"],
+        "difficulty": 4, "capital_requirement": "Low", "risks": ["chicken and egg"],
+    },
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "models.json"
+    path.write_text(json.dumps(MODELS), encoding="utf-8")
+    return path
+
+
+def load(source):
+    return load_catalogue(source, cache_dir=source.parent / "cache")
+
+
+def test_json_then_snapshot_round_trip(source):
+    first = load(source)
+    second = load(source)
+    assert first.load_report.source == "json"
+    assert second.load_report.source == "snapshot"
+    for catalogue in (first, second):
+        assert len(catalogue) == 3
+        assert [catalogue.record(i) for i in range(3)] == MODELS
+    assert second.model(1).difficulty is None
+    assert second.model(0).tags == ("saas", "recurring")
+    assert second.position("BM3") == 2
+    assert second.categories["capital_requirement"][1] == ("Low", "High")
+    assert second.categories["time_to_revenue"][0].tolist() == [0, MISSING, MISSING]
+
+
+def test_snapshot_arrays_are_read_only(source):
+    load(source)
+    catalogue = load(source)
+    with pytest.raises(ValueError):
+        catalogue.tag_codes[0] = 1
+
+
+def test_changed_source_rebuilds(source):
+    load(source)
+    changed = MODELS + [{"id": "BM4", "name": "Leasing", "description": "Rent", "tags": []}]
+    source.write_text(json.dumps(changed), encoding="utf-8")
+    catalogue = load(source)
+    assert catalogue.load_report.source == "json"
+    assert len(catalogue) == 4 and catalogue.record(3)["name"] == "Leasing"
+
+
+def test_touched_but_unchanged_source_is_restamped(source):
+    load(source)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load(source).load_report.source == "snapshot"  # hash matches
+    snapshot = pickle.loads((source.parent / "cache" / "models.snapshot.pkl").read_bytes())
+    assert snapshot["mtime_ns"] == source.stat().st_mtime_ns
+
+
+@pytest.mark.parametrize("content", [b"not a pickle", pickle.dumps([1, 2]), pickle.dumps({"version": -1})])
+def test_corrupt_snapshot_is_rebuilt(source, content):
+    load(source)
+    (source.parent / "cache" / "models.snapshot.pkl").write_bytes(content)
+    catalogue = load(source)
+    assert catalogue.load_report.source == "json" and len(catalogue) == 3
+    assert load(source).load_report.source == "snapshot"
+
+
+def test_details_file_random_access(tmp_path):
+    path = tmp_path / "d.bin"
+    write_details(MODELS, path)
+    store = DetailStore(path)
+    assert len(store) == 3
+    assert store[2] == {"risks": ["chicken and egg"]}
+    assert store[0]["examples"] == ["Netflix"]
+
+
+def test_many_categories_widen_the_codes(tmp_path):
+    models = [{"id": f"M{i}", "name": str(i), "tags": [], "maturity_level": f"level {i}"} for i in range(300)]
+    path = tmp_path / "big.json"
+    path.write_text(json.dumps(models), encoding="utf-8")
+    catalogue = load(path)
+    codes, categories = catalogue.categories["maturity_level"]
+    assert len(categories) == 300 and codes[299] == 299
+    assert load(path).category("maturity_level", 299) == "level 299"
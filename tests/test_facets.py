@@ -0,0 +1,104 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from utils.catalogue import load_catalogue
+from utils.facets import NOT_SET, FacetIndex, popcount
+
+MODELS = [
+    {"id": "M0", "name": "a", "difficulty": 1, "capital_requirement": "Low", "tags": ["saas", "b2b"]},
+    {"id": "M1", "name": "b", "difficulty": 2, "capital_requirement": "High", "tags": ["saas"]},
+    {"id": "M2", "name": "c", "difficulty": 2, "capital_requirement": "Low", "tags": ["retail"]},
+    {"id": "M3", "name": "d", "capital_requirement": "Medium", "tags": ["saas", "retail"]},
+    {"id": "M4", "name": "e", "difficulty": 1, "tags": []},
+]
+
+
+def catalogue(tmp_path, models):
+    path = tmp_path / "models.json"
+    path.write_text(json.dumps(models), encoding="utf-8")
+    return load_catalogue(path, cache_dir=tmp_path / "cache")
+
+
+@pytest.fixture
+def facets(tmp_path):
+    return FacetIndex(catalogue(tmp_path, MODELS))
+
+
+def test_values_in_natural_order(facets):
+    assert facets.values["difficulty"] == ("1", "2", NOT_SET)
+    assert facets.values["capital_requirement"] == ("Low", "Medium", "High", NOT_SET)
+    assert facets.values["tags"] == ("saas", "retail", "b2b")  # most common first
+    assert "time_to_revenue" in facets.values and facets.values["time_to_revenue"] == (NOT_SET,)
+
+
+def test_select_ors_within_and_ands_across_facets(facets):
+    def chosen(selections):
+        return np.flatnonzero(facets.contains(facets.select(selections), range(5))).tolist()
+
+    assert chosen({}) == [0, 1, 2, 3, 4]
+    assert chosen({"capital_requirement": ["Low", "High"]}) == [0, 1, 2]
+    assert chosen({"capital_requirement": ["Low"], "tags": ["saas"]}) == [0]
+    assert chosen({"tags": ["saas", "retail"], "difficulty": [NOT_SET]}) == [3]
+    assert chosen({"tags": ["unknown"]}) == []
+
+
+def test_counts_are_disjunctive(facets):
+    counts = facets.counts({"capital_requirement": ["Low"], "tags": ["saas"]})
+    # Capital counts ignore the capital selection: saas models are M0, M1, M3.
+    assert counts["capital_requirement"] == {"Low": 1, "Medium": 1, "High": 1, NOT_SET: 0}
+    # Tag counts ignore the tag selection: Low-capital models are M0, M2.
+    assert counts["tags"] == {"saas": 1, "retail": 1, "b2b": 1}
+    # Other facets apply both selections: only M0.
+    assert counts["difficulty"] == {"1": 1, "2": 0, NOT_SET: 0}
+
+
+def test_counts_respect_the_base_set(facets):
+    base = facets.mask([1, 2, 3])
+    counts = facets.counts({}, base)
+    assert counts["capital_requirement"] == {"Low": 1, "Medium": 1, "High": 1, NOT_SET: 0}
+    assert counts["tags"] == {"saas": 2, "retail": 2, "b2b": 0}
+
+
+def test_popcount_of_packed_words():
+    bits = np.packbits(np.array([1, 0, 1, 1] + [0] * 60 + [1] * 64, dtype=bool))
+    assert popcount(bits) == 67
+    assert popcount(bits.reshape(2, 8), axis=1).tolist() == [3, 64]
+
+
+def test_counts_match_brute_force_on_a_larger_catalogue(tmp_path):
+    rng = random.Random(3)
+    tags = ["saas", "retail", "b2b", "impact", "hardware"]
+    models = [
+        {
+            "id": f"M{i}", "name": str(i),
+            "difficulty": rng.choice([1, 2, 3, None]),
+            "capital_requirement": rng.choice(["Low", "Medium", "High", None]),
+            "tags": rng.sample(tags, rng.randint(0, 3)),
+        }
+        for i in range(203)  # not a multiple of 64
+    ]
+    for m in models:
+        if m["difficulty"] is None:
+            del m["difficulty"]
+        if m["capital_requirement"] is None:
+            del m["capital_requirement"]
+    facets = FacetIndex(catalogue(tmp_path, models))
+    selections = {"capital_requirement": ["Low", "High"], "tags": ["saas", "impact"]}
+
+    def matches(m, skip):
+        capital = skip == "capital_requirement" or m.get("capital_requirement") in ("Low", "High")
+        tagged = skip == "tags" or bool({"saas", "impact"} & set(m["tags"]))
+        return capital and tagged
+
+    counts = facets.counts(selections)
+    for tag in facets.values["tags"]:
+        assert counts["tags"][tag] == sum(matches(m, "tags") and tag in m["tags"] for m in models)
+    for value in facets.values["capital_requirement"]:
+        expected = sum(
+            matches(m, "capital_requirement") and m.get("capital_requirement", NOT_SET) == value for m in models
+        )
+        assert counts["capital_requirement"][value] == expected
+    assert popcount(facets.select(selections)) == sum(matches(m, None) for m in models)
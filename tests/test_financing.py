@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from utils.financing import (
+    convertible_note_schedules,
+    equity_schedules,
+    grant_schedules,
+    loan_schedules,
+    revenue_based_schedules,
+    summarise,
+    term_grid,
+)
+
+
+def test_term_grid_is_every_combination():
+    grid = term_grid(rate=[0.08, 0.1], tenor=[24, 36, 48])
+    assert grid["rate"].tolist() == [0.08] * 3 + [0.1] * 3
+    assert grid["tenor"].tolist() == [24, 36, 48] * 2
+
+
+def test_zero_rate_loan_repays_in_equal_parts():
+    s = loan_schedules(1200, 0.0, 12, 0, horizon=12)
+    assert s.cash[0] == pytest.approx([1200] + [-100] * 12)
+    assert s.balance[0] == pytest.approx([1200 - 100 * m for m in range(13)], abs=1e-9)
+    assert s.cost.sum() == 0
+    assert summarise(s, 0.1)["effective_rate"][0] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_loan_annuity_with_grace():
+    # 1% a month: interest only in month 1, then two equal payments.
+    payment = 1000 * 0.01 / (1 - 1.01 ** -2)  # 507.51
+    s = loan_schedules(1000, 0.12, 3, 1, horizon=4)
+    assert s.cash[0] == pytest.approx([1000, -10, -payment, -payment, 0])
+    assert s.cost[0] == pytest.approx([0, 10, 10, 0.01 * (1000 - (payment - 10)), 0])
+    assert s.balance[0, -2:] == pytest.approx([0, 0], abs=1e-9)
+    summary = summarise(s, 0.1)
+    assert summary["effective_rate"][0] == pytest.approx(1.01 ** 12 - 1, rel=1e-9)
+    assert summary["peak_payment"][0] == pytest.approx(payment)
+
+
+def test_loan_still_owed_at_the_horizon_is_settled():
+    s = loan_schedules(1200, 0.0, 24, 0, horizon=12)
+    assert s.cash[0, -1] == pytest.approx(-50 - 600)  # month 12's payment plus the rest
+    assert s.balance[0, -1] == 0
+    assert s.cash[0].sum() == pytest.approx(0)
+
+
+def test_loans_for_a_grid_of_terms():
+    grid = term_grid(annual_rate=[0.0, 0.12], tenor=[12, 24])
+    s = loan_schedules(1200, grid["annual_rate"], grid["tenor"], 0, horizon=24)
+    assert len(s) == 4
+    assert s.cash[:2, 1] == pytest.approx([-100, -50])
+    assert (s.balance[:, -1] == 0).all()
+
+
+def test_convertible_note_converts_at_the_cap():
+    s = convertible_note_schedules(100, 0.12, 0.2, 1000, 12, 2000, 10_000, horizon=24)
+    accrued = 112.0                   # 12% simple interest for a year
+    share = accrued / (1000 + accrued)  # cap 1000 < discounted round 1600
+    assert s.dilution[0] == pytest.approx(share)
+    assert s.cash[0, 0] == 100 and s.cash[0, -1] == pytest.approx(-share * 10_000)
+    assert s.cost[0, 1:13] == pytest.approx([1.0] * 12)
+    assert s.cost[0].sum() == pytest.approx(share * 10_000 - 100)
+    assert s.balance[0, 6] == pytest.approx(106) and s.balance[0, 12] == 0
+
+
+def test_grant_in_tranches_with_admin_cost():
+    s = grant_schedules(1200, 0.1, 4, horizon=12)
+    assert s.cash[0, :5].tolist() == pytest.approx([270, 270, 270, 270, 0])
+    assert s.cost.sum() == pytest.approx(120)
+    summary = summarise(s, 0.1)
+    assert summary["effective_rate"][0] == 0
+    assert summary["pv_cost"][0] < -1000  # a net gift
+
+
+def test_equity_is_valued_at_exit():
+    s = equity_schedules(1, 4, 100, horizon=12)
+    assert s.dilution[0] == pytest.approx(0.2)
+    assert s.cash[0, -1] == pytest.approx(-20)
+    assert s.cost.sum() == pytest.approx(19)
+
+
+def test_revenue_based_financing_stops_at_the_cap():
+    s = revenue_based_schedules(100, 0.5, 1.5, 100, 0.0, horizon=12)
+    assert s.cash[0].tolist() == pytest.approx([100, -50, -50, -50] + [0] * 9)
+    assert s.balance[0, 3:].tolist() == pytest.approx([0] * 10)
+    assert s.cost.sum() == pytest.approx(50)
+
+
+def test_summary_pv_cost_discounts_monthly():
+    s = loan_schedules(1200, 0.0, 12, 0, horizon=12)
+    monthly = 1.1 ** (1 / 12) - 1
+    expected = -(1200 - sum(100 / (1 + monthly) ** m for m in range(1, 13)))
+    assert summarise(s, 0.1)["pv_cost"][0] == pytest.approx(expected)
+    assert np.isclose(summarise(s, 0.0)["pv_cost"][0], 0.0)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from utils.irr import irr, irr_batch, xirr
+
+
+def test_single_sign_change():
+    result = irr([-100, 110])
+    assert result.rate == pytest.approx(0.10, abs=1e-12)
+    assert result.roots == pytest.approx((0.10,), abs=1e-12)
+    assert result.converged and not result.multiple
+
+
+def test_multiple_roots_are_all_reported():
+    result = irr([-100, 230, -132])
+    assert result.multiple
+    assert result.roots == pytest.approx((0.10, 0.20), abs=1e-12)
+    assert result.rate == pytest.approx(0.10, abs=1e-12)  # closest to the default guess
+
+
+def test_no_sign_change_has_no_irr():
+    result = irr([100, 200, 300])
+    assert result.rate is None and result.roots == ()
+
+
+def test_sign_changes_without_a_real_root():
+    result = irr([-1, 3, -3])
+    assert result.rate is None and result.roots == ()
+
+
+def test_batch_matches_single_series():
+    flows = np.array([[-100, 110, 0], [-100, 230, -132], [100, 200, 300]], dtype=float)
+    result = irr_batch(flows)
+    assert result.rates[0] == pytest.approx(0.10, abs=1e-12)
+    assert result.rates[1] == pytest.approx(0.10, abs=1e-12)
+    assert np.isnan(result.rates[2])
+    assert result.root_counts.tolist() == [1, 2, 0]
+
+
+def test_xirr_uses_actual_dates():
+    dates = np.array(["2023-01-01", "2024-01-01"], dtype="datetime64[D]")  # 365 days apart
+    assert xirr([-100, 110], dates).rate == pytest.approx(0.10, abs=1e-12)
+
+    half_year = np.array(["2023-01-01", "2023-07-02"], dtype="datetime64[D]")  # 182 days
+    assert xirr([-100, 110], half_year).rate == pytest.approx(1.10 ** (365 / 182) - 1, rel=1e-9)
@@ -0,0 +1,107 @@
+import json
+import math
+import threading
+
+import numpy as np
+import pytest
+
+from utils import prior_art
+from utils.prior_art import Document, PriorArtIndex, minhash, read_corpus
+
+SOLAR = Document("A", "Solar panel", "")
+BATTERY = Document("B", "Battery panel", "")
+COLD_ROOM = Document("C", "Cold room", "solar cold room stores ice at night for cooling during the day")
+
+
+@pytest.fixture
+def index(tmp_path):
+    return PriorArtIndex(tmp_path / "index")
+
+
+def test_scores_are_lnc_ltc_cosines(index):
+    index.add([SOLAR, BATTERY])
+    # "panel" is in every document, so idf = 0 and only "solar" counts:
+    # query vector (1), document A (1/sqrt 2, 1/sqrt 2).
+    hits = index.search("solar panel", k=5)
+    assert [h.id for h in hits] == ["A"]
+    assert hits[0].score == pytest.approx(1 / math.sqrt(2), rel=1e-6)
+    assert index.search("panel") == []
+    assert index.search("the of and") == []  # stopwords only
+
+
+def test_add_skips_known_ids_and_reopens(index, tmp_path):
+    assert index.add([SOLAR, BATTERY, SOLAR]) == 2
+    assert index.add([SOLAR, Document("A", "Changed", "ignored")]) == 0
+    assert index.add([COLD_ROOM]) == 1
+    assert len(index.segments) == 2
+
+    reopened = PriorArtIndex(tmp_path / "index")
+    assert len(reopened) == 3
+    assert [h.id for h in reopened.search("battery")] == ["B"]
+    assert reopened.search("solar", k=1)[0].title == "Solar panel"
+
+
+def test_compact_keeps_results(index, tmp_path):
+    index.add([SOLAR])
+    index.add([BATTERY])
+    index.add([COLD_ROOM])
+    before = [(h.id, round(h.score, 6)) for h in index.search("solar cooling battery", k=3)]
+    index.compact()
+    assert len(index.segments) == 1
+    assert [p.name for p in sorted((tmp_path / "index").glob("seg-*"))] == ["seg-000004"]
+    assert [(h.id, round(h.score, 6)) for h in index.search("solar cooling battery", k=3)] == before
+    assert [h.id for h in PriorArtIndex(tmp_path / "index").search("ice")] == ["C"]
+
+
+def test_compact_while_a_search_holds_the_old_segments(index, tmp_path, monkeypatch):
+    index.add([SOLAR])
+    index.add([COLD_ROOM, BATTERY])
+    reading, compacted = threading.Event(), threading.Event()
+    original = index._hits
+
+    def slow_hits(ranked):
+        reading.set()
+        compacted.wait(5)  # compact() runs while this search still has the old segments
+        return original(ranked)
+
+    monkeypatch.setattr(index, "_hits", slow_hits)
+    results = []
+    search = threading.Thread(target=lambda: results.append(index.search("solar", k=5)))
+    search.start()
+    assert reading.wait(5)
+    index.compact()
+    assert (tmp_path / "index" / "seg-000001").exists()  # still in use
+    compacted.set()
+    search.join(5)
+
+    assert sorted(h.id for h in results[0]) == ["A", "C"]
+    assert [p.name for p in (tmp_path / "index").glob("seg-*")] == ["seg-000003"]
+
+
+def test_near_duplicates(index):
+    copied = Document("D", "Copy", COLD_ROOM.text + " with a small change")
+    index.add([COLD_ROOM, SOLAR, copied])
+    # Signatures cover the title and the text.
+    hits = index.near_duplicates(f"{COLD_ROOM.title} {COLD_ROOM.text}", threshold=0.5)
+    assert [h.id for h in hits][:1] == ["C"] and hits[0].score == 1.0
+    assert "A" not in [h.id for h in hits]
+
+
+def test_minhash_of_identical_texts_match():
+    assert np.array_equal(minhash("a b c d e"), minhash("a b c d e"))
+    assert not np.array_equal(minhash("a b c d e"), minhash("v w x y z"))
+
+
+def test_add_files_indexes_new_and_changed_files(index, tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.jsonl").write_text(
+        "\n".join(json.dumps({"id": d.id, "title": d.title, "abstract": d.text}) for d in (SOLAR, BATTERY)) + "\n"
+    )
+    (corpus / "note.txt").write_text("Cold room\nsolar cold room stores ice")
+    files = prior_art.corpus_files(corpus)
+    assert index.add_files(files) == 3
+    assert index.add_files(files) == 0  # unchanged files are skipped
+    (corpus / "a.jsonl").write_text(json.dumps({"id": "E", "title": "Heat pump", "abstract": "x"}) + "\n")
+    assert index.add_files(files) == 1
+    assert [d.id for d in read_corpus(corpus / "note.txt")] == ["note"]
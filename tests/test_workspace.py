@@ -0,0 +1,215 @@
+import hashlib
+import pickle
+import sqlite3
+import time
+
+import pytest
+import streamlit
+
+from utils import workspace
+from utils.workspace import MISSING, Workspace, persisted, result_digest
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "ws.db"
+
+
+@pytest.fixture
+def ws(db):
+    store = Workspace(db, debounce=60, max_delay=60)  # nothing commits until flush()
+    yield store
+    store.close()
+
+
+def committed_pages(db):
+    with sqlite3.connect(db) as conn:
+        return conn.execute("SELECT project, page FROM inputs ORDER BY project, page").fetchall()
+
+
+# ----------------------------
+# Debounced writer
+# ----------------------------
+def test_queued_writes_are_readable_before_commit(ws, db):
+    ws.save_inputs("A", "costs", {"x": 1})
+    assert committed_pages(db) == []
+    assert ws.load_inputs("A", "costs") == {"x": 1}
+    assert [p.name for p in ws.projects()] == ["A"]
+
+
+def test_writes_to_one_page_coalesce_and_survive_reopening(ws, db):
+    for x in range(5):
+        ws.save_inputs("A", "costs", {"x": x})
+    ws.save_inputs("B", "npv", {"rate": 12})
+    assert ws.flush(timeout=5)
+    assert committed_pages(db) == [("A", "costs"), ("B", "npv")]
+
+    reopened = Workspace(db)
+    try:
+        assert reopened.load_inputs("A", "costs") == {"x": 4}
+        assert reopened.load_inputs("A", "npv") is None
+        assert {p.name for p in reopened.projects()} == {"A", "B"}
+    finally:
+        reopened.close()
+
+
+def test_debounce_commits_without_flush(db):
+    store = Workspace(db, debounce=0.05, max_delay=0.2)
+    try:
+        store.save_inputs("A", "costs", {"x": 1})
+        deadline = time.monotonic() + 5
+        while not committed_pages(db) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert committed_pages(db) == [("A", "costs")]
+    finally:
+        store.close()
+
+
+def test_delete_drops_queued_and_stored_state(ws):
+    ws.save_inputs("A", "costs", {"x": 1})
+    ws.put_result("A", "f", "d1", 42)
+    ws.flush(timeout=5)
+    ws.save_inputs("A", "npv", {"y": 2})
+    ws.delete_project("A")
+    assert ws.load_inputs("A", "npv") is None
+    ws.flush(timeout=5)
+    assert ws.projects() == [] and ws.load_inputs("A", "costs") is None
+    assert ws.result("d1") is MISSING
+
+
+def test_closed_workspace_rejects_writes(db):
+    store = Workspace(db)
+    store.close()
+    with pytest.raises(RuntimeError):
+        store.save_inputs("A", "costs", {})
+
+
+# ----------------------------
+# Stored results
+# ----------------------------
+def test_digest_ignores_keyword_order_but_not_code_or_version(monkeypatch):
+    base = result_digest("f", (1, 2), {"a": 1, "b": 2}, "code")
+    assert result_digest("f", (1, 2), {"b": 2, "a": 1}, "code") == base
+    assert result_digest("f", (1, 2), {"a": 1, "b": 2}, "other code") != base
+    assert result_digest("g", (1, 2), {"a": 1, "b": 2}, "code") != base
+    monkeypatch.setattr(workspace, "FORMAT_VERSION", workspace.FORMAT_VERSION + 1)
+    assert result_digest("f", (1, 2), {"a": 1, "b": 2}, "code") != base
+
+
+def test_persisted_computes_once_and_serves_other_processes(ws, db):
+    calls = []
+
+    @persisted("square", project=lambda: "A", store=lambda: ws)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert (square(3), square(3), square(4)) == (9, 9, 16)
+    assert calls == [3, 4]
+    ws.flush(timeout=5)
+
+    reopened = Workspace(db)  # as a new server process would
+    try:
+        again = persisted("square", project=lambda: "A", store=lambda: reopened)(square.__wrapped__)
+        assert again(3) == 9 and again(4) == 16
+        assert calls == [3, 4]
+    finally:
+        reopened.close()
+
+
+def test_persisted_without_a_project_does_not_store(ws):
+    @persisted("double", project=lambda: None, store=lambda: ws)
+    def double(x):
+        return 2 * x
+
+    assert double(5) == 10
+    assert ws._pending() == []
+
+
+def test_editing_a_dependency_invalidates_stored_results(ws, tmp_path):
+    dependency = tmp_path / "model.py"
+    dependency.write_text("VERSION = 1\n")
+    calls = []
+
+    def decorate():
+        return persisted("f", depends=(dependency,), project=lambda: "A", store=lambda: ws)(
+            lambda x: calls.append(x) or x
+        )
+
+    decorate()(1)
+    decorate()(1)
+    assert calls == [1]
+    dependency.write_text("VERSION = 2\n")
+    decorate()(1)
+    assert calls == [1, 1]
+
+
+def test_unreadable_results_and_inputs_are_misses(ws, db):
+    ws.put_result("A", "f", "d1", 42)
+    ws.save_inputs("A", "costs", {"x": 1})
+    ws.flush(timeout=5)
+    with sqlite3.connect(db) as conn:
+        conn.execute("UPDATE results SET value = ?", (b"\x80\x04broken",))
+        conn.execute("UPDATE inputs SET state = ?", (b"\x80\x04broken",))
+    assert ws.result("d1") is MISSING
+    assert ws.load_inputs("A", "costs") is None
+
+
+# ----------------------------
+# Session state capture / restore
+# ----------------------------
+@pytest.fixture
+def session(monkeypatch):
+    state = {}
+    monkeypatch.setattr(streamlit, "session_state", state)
+    return state
+
+
+def test_capture_and_restore_round_trip(ws, db, session, monkeypatch):
+    monkeypatch.setattr(workspace, "default_workspace", lambda: ws)
+    session.update({
+        "cost_fixed": 60000.0, "cost_price": 600.0, "npv_rate": 12,
+        "npv_btn": True,            # buttons are never saved
+        "cf_table@3": object(),     # editor widget state is saved as a table instead
+        "bm_view": "Cards",         # another page's prefix
+        workspace.TABLES_KEY: {"hires": [[6, 30000.0]]},
+    })
+    state = workspace._capture(("cost_", "npv_"))
+    assert state == {
+        "widgets": {"cost_fixed": 60000.0, "cost_price": 600.0, "npv_rate": 12},
+        "tables": {"hires": [[6, 30000.0]]},
+    }
+    ws.save_inputs("Solar", "financial", state)
+    ws.flush(timeout=5)
+
+    session.clear()
+    session["ws_choice"] = "Solar"
+    workspace._open("financial")
+    assert session["cost_fixed"] == 60000.0 and session["npv_rate"] == 12
+    assert session[workspace.PROJECT_KEY] == "Solar"
+    assert session[workspace.BASE_KEY] == {"hires": [[6, 30000.0]]}
+    assert session[workspace.VERSION_KEY] == 1
+    digest = hashlib.sha256(pickle.dumps(state, protocol=4)).hexdigest()
+    assert session[workspace.SAVED_KEY] == {"financial": digest}
+
+
+def test_autosave_queues_only_changes(ws, session, monkeypatch):
+    monkeypatch.setattr(workspace, "default_workspace", lambda: ws)
+    session.update({"cost_fixed": 1.0})
+    workspace.autosave("financial", ("cost_",))
+    assert ws._pending() == []  # no project open
+
+    session[workspace.PROJECT_KEY] = "A"
+    workspace.autosave("financial", ("cost_",))
+    workspace.autosave("financial", ("cost_",))
+    assert len(ws._pending()) == 1
+    ws.flush(timeout=5)
+
+    session["cost_fixed"] = 2.0
+    workspace.autosave("financial", ("cost_",))
+    assert ws.load_inputs("A", "financial")["widgets"] == {"cost_fixed": 2.0}
+
+    session["ws_autosave"] = False
+    session["cost_fixed"] = 3.0
+    workspace.autosave("financial", ("cost_",))
+    assert ws.load_inputs("A", "financial")["widgets"] == {"cost_fixed": 2.0}
@@ -0,0 +1,94 @@
+"""
+Archetype definitions and the precomputed model-by-archetype score matrix.
+
+Archetypes are read from data/archetype_tags.json. A model's score for an
+archetype is the number of its tags that belong to that archetype. All
+scores are computed once into an integer matrix together with a sort key
+per cell, so picking the top N models for an archetype is a single
+argpartition over one precomputed column.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ARCHETYPE_TAGS_PATH = DATA_DIR / "archetype_tags.json"
+
+DEFAULT_DIFFICULTY = 3
+
+
+def load_archetypes(path: Path = ARCHETYPE_TAGS_PATH) -> Dict[str, List[str]]:
+    """
+    Archetype name -> list of tags, in file order.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ArchetypeMatrix:
+    """
+    Scores of every model against every archetype.
+
+    Ties are broken the same way the library always has: higher score
+    first, then easier difficulty, then name.
+    """
+
+    def __init__(self, models: Sequence[Dict[str, Any]], archetypes: Dict[str, List[str]]):
+        self.names: List[str] = list(archetypes)
+        self._column = {name: i for i, name in enumerate(self.names)}
+        n = len(models)
+
+        # Tag vocabulary -> which archetypes each tag belongs to.
+        tag_ids: Dict[str, int] = {}
+        for tags in archetypes.values():
+            for tag in tags:
+                tag_ids.setdefault(tag.lower(), len(tag_ids))
+        membership = np.zeros((len(tag_ids) + 1, len(self.names)), dtype=np.int16)
+        for col, tags in enumerate(archetypes.values()):
+            for tag in {t.lower() for t in tags}:
+                membership[tag_ids[tag], col] = 1
+        # The extra last row stands for "tag not used by any archetype".
+        unknown = len(tag_ids)
+
+        rows, ids = [], []
+        for i, bm in enumerate(models):
+            for tag in bm.get("tags", []):
+                rows.append(i)
+                ids.append(tag_ids.get(tag.lower(), unknown))
+        self.scores = np.zeros((n, len(self.names)), dtype=np.int16)
+        if rows:
+            np.add.at(self.scores, np.asarray(rows), membership[np.asarray(ids)])
+
+        # One int64 sort key per cell: (-score, difficulty, name rank).
+        difficulty = np.array(
+            [bm.get("difficulty", DEFAULT_DIFFICULTY) for bm in models], dtype=np.int64
+        )
+        name_rank = np.empty(n, dtype=np.int64)
+        name_rank[np.argsort([bm.get("name", "") for bm in models], kind="stable")] = np.arange(n)
+        tiebreak = (difficulty - difficulty.min(initial=0)) * max(n, 1) + name_rank
+        span = int(tiebreak.max(initial=0)) + 1
+        self._keys = -self.scores.astype(np.int64) * span + tiebreak[:, None]
+        self._keys[self.scores == 0] = np.iinfo(np.int64).max
+
+    def column(self, archetype: str) -> np.ndarray:
+        return self.scores[:, self._column[archetype]]
+
+    def top_n(self, archetype: str, n: int = 5) -> np.ndarray:
+        """
+        Positions of the N best-matching models, best first. Models with
+        no matching tag are never returned; if none match, the first N
+        models are returned instead.
+        """
+        if archetype not in self._column:
+            return np.arange(min(n, len(self.scores)))
+        col = self._column[archetype]
+        matching = int(np.count_nonzero(self.scores[:, col]))
+        if matching == 0:
+            return np.arange(min(n, len(self.scores)))
+
+        k = min(n, matching)
+        keys = self._keys[:, col]
+        best = np.argpartition(keys, k - 1)[:k]
+        return best[np.argsort(keys[best], kind="stable")]
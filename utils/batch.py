@@ -0,0 +1,197 @@
+"""
+Headless batch scoring of project portfolios.
+
+Streams a CSV or Parquet file of projects in chunks, computes every
+Financial Projections metric for each chunk on a process pool and
+appends the results to the output file as chunks complete (in input
+order), so memory stays bounded by a few chunks however large the file.
+
+    python -m utils.batch projects.csv -o scored.parquet --workers 8
+
+Recognised input columns (all optional; a metric is left out of the
+output when its inputs are missing):
+
+    fixed_costs, var_cost, price           -> margin, break_even_units
+    revenue, variable, fixed, cash         -> gross, net, burn, runway_months
+    initial, cf_1 .. cf_N, discount_rate   -> npv, irr, irr_multiple
+    team, ip, traction, market             -> valuation_score
+
+`discount_rate` is a fraction (0.12 for 12%). Any `id` column is copied
+through unchanged.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.finance import VALUATION_WEIGHTS, npv_rows
+from utils.irr import irr_batch
+
+CASH_FLOW_RE = re.compile(r"^cf_(\d+)$")
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _column(df: pd.DataFrame, name: str) -> Optional[np.ndarray]:
+    return df[name].to_numpy(dtype=float) if name in df.columns else None
+
+
+def score_chunk(df: pd.DataFrame, id_column: str = "id") -> pd.DataFrame:
+    """
+    Every metric for one chunk of projects, vectorised across rows.
+    """
+    out = pd.DataFrame(index=df.index)
+    if id_column in df.columns:
+        out[id_column] = df[id_column]
+
+    fixed_costs, var_cost, price = (_column(df, c) for c in ("fixed_costs", "var_cost", "price"))
+    if fixed_costs is not None and var_cost is not None and price is not None:
+        margin = price - var_cost
+        out["margin"] = margin
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["break_even_units"] = np.where(margin > 0, fixed_costs / margin, np.nan)
+
+    revenue, variable, fixed, cash = (_column(df, c) for c in ("revenue", "variable", "fixed", "cash"))
+    if revenue is not None and variable is not None and fixed is not None:
+        gross = revenue - variable
+        burn = np.maximum(variable + fixed - revenue, 0.0)
+        out["gross"] = gross
+        out["net"] = gross - fixed
+        out["burn"] = burn
+        if cash is not None:
+            with np.errstate(divide="ignore"):
+                out["runway_months"] = np.where(burn > 0, cash / burn, np.inf)
+
+    cf_columns = sorted(
+        (c for c in df.columns if CASH_FLOW_RE.match(str(c))),
+        key=lambda c: int(CASH_FLOW_RE.match(str(c)).group(1)),
+    )
+    initial = _column(df, "initial")
+    if initial is not None and cf_columns:
+        flows = np.column_stack([-initial, df[cf_columns].to_numpy(dtype=float)])
+        periods = [0] + [int(CASH_FLOW_RE.match(str(c)).group(1)) for c in cf_columns]
+        flows = np.nan_to_num(flows)
+        rate = _column(df, "discount_rate")
+        if rate is not None:
+            out["npv"] = npv_rows(flows, rate, periods=periods)
+        result = irr_batch(flows, periods=periods)
+        out["irr"] = result.rates
+        out["irr_multiple"] = result.multiple
+
+    scores = [_column(df, c) for c in ("team", "ip", "traction", "market")]
+    if all(s is not None for s in scores):
+        out["valuation_score"] = sum(w * s for w, s in zip(VALUATION_WEIGHTS, scores))
+
+    return out
+
+
+# ----------------------------
+# Streaming I/O
+# ----------------------------
+def read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.parquet = path.suffix.lower() in (".parquet", ".pq")
+        self._writer = None
+        self._wrote_header = False
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                # Later chunks take the first chunk's schema, e.g. an int column
+                # that reads as float because this chunk has gaps.
+                try:
+                    table = pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False)
+                except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+                    raise ValueError(f"{self.path.name}: a column changes type part-way through the input ({exc})") from exc
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run(
+    source: Path,
+    target: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    id_column: str = "id",
+    executor: Optional[Executor] = None,
+) -> int:
+    """
+    Score `source` into `target`; returns the number of projects written.
+    At most two chunks per worker are in flight at any time.
+    """
+    workers = workers or os.cpu_count() or 1
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    max_in_flight = 2 * workers
+
+    writer = ChunkWriter(target)
+    pending: deque = deque()
+    written = 0
+    try:
+        for chunk in read_chunks(source, chunk_size):
+            pending.append(executor.submit(score_chunk, chunk, id_column))
+            if len(pending) >= max_in_flight:
+                result = pending.popleft().result()
+                writer.write(result)
+                written += len(result)
+        while pending:
+            result = pending.popleft().result()
+            writer.write(result)
+            written += len(result)
+    finally:
+        writer.close()
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet portfolio of projects.")
+    parser.add_argument("source", type=Path, help="input .csv or .parquet file")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="output .csv or .parquet file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--id-column", default="id")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    n = run(args.source, args.output, args.chunk_size, args.workers, args.id_column)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {n:,} projects in {elapsed:.1f}s -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Break-even units and monthly profit over grids of price, variable cost
+and fixed cost.
+
+The whole (fixed, variable, price) grid is one broadcast of three axis
+vectors, so a few million points take milliseconds:
+
+    margin      = price - variable_cost
+    break_even  = fixed_costs / margin          (nan where margin <= 0)
+    profit      = units * margin - fixed_costs
+
+Charts cannot draw millions of cells, so heatmap_cells() reduces a 2-D
+slice adaptively: it starts from one block and keeps splitting the block
+whose values vary most (blocks that straddle zero profit first) until the
+cell budget is used. Flat regions end up as a few large rectangles and
+the break-even frontier keeps the full grid resolution.
+"""
+import heapq
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+DEFAULT_RESOLUTION = (200, 200, 21)  # price, variable cost, fixed cost
+MAX_POINTS = 5_000_000
+HEATMAP_CELLS = 2_500
+
+Range = Tuple[float, float]
+
+
+@dataclass(frozen=True)
+class BreakEvenGrid:
+    """Results indexed [fixed, variable, price]."""
+
+    prices: np.ndarray
+    variable_costs: np.ndarray
+    fixed_costs: np.ndarray
+    units: float
+    break_even: np.ndarray   # units per month; nan where price <= variable cost
+    profit: np.ndarray       # monthly profit at `units`
+
+    @property
+    def feasible(self) -> np.ndarray:
+        """Where the expected volume is profitable."""
+        return self.profit > 0
+
+    def min_price(self) -> np.ndarray:
+        """(fixed, variable) lowest price that breaks even at the expected volume."""
+        if self.units <= 0:
+            return np.full((self.fixed_costs.size, self.variable_costs.size), np.inf)
+        return self.variable_costs[None, :] + self.fixed_costs[:, None] / self.units
+
+
+def _axis(bounds: Range, n: int) -> np.ndarray:
+    lo, hi = bounds
+    if lo < 0 or hi < lo:
+        raise ValueError(f"invalid range {bounds}: need 0 <= from <= to")
+    axis = np.linspace(lo, hi, n if hi > lo else 1)
+    axis.setflags(write=False)
+    return axis
+
+
+def grid(
+    prices: Range,
+    variable_costs: Range,
+    fixed_costs: Range,
+    units: float,
+    resolution: Tuple[int, int, int] = DEFAULT_RESOLUTION,
+) -> BreakEvenGrid:
+    """Evaluate every (fixed, variable, price) combination in one pass."""
+    p = _axis(prices, resolution[0])
+    v = _axis(variable_costs, resolution[1])
+    f = _axis(fixed_costs, resolution[2])
+    if p.size * v.size * f.size > MAX_POINTS:
+        raise ValueError(f"grid has more than {MAX_POINTS:,} points; lower the resolution")
+
+    margin = p[None, :] - v[:, None]                      # (variable, price)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_margin = np.where(margin > 0, 1.0 / margin, np.nan)
+    break_even = f[:, None, None] * per_margin[None, :, :]
+    profit = units * margin[None, :, :] - f[:, None, None]
+    for array in (break_even, profit):
+        array.setflags(write=False)
+    return BreakEvenGrid(p, v, f, float(units), break_even, profit)
+
+
+# ----------------------------
+# Heatmap
+# ----------------------------
+def _edges(axis: np.ndarray) -> np.ndarray:
+    """Cell boundaries around each axis value."""
+    if axis.size == 1:
+        return np.array([axis[0] - 0.5, axis[0] + 0.5])
+    mid = (axis[1:] + axis[:-1]) / 2
+    return np.concatenate(([2 * axis[0] - mid[0]], mid, [2 * axis[-1] - mid[-1]]))
+
+
+def heatmap_cells(
+    values: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    max_cells: int = HEATMAP_CELLS,
+    tolerance: float = 0.01,
+) -> Dict[str, np.ndarray]:
+    """
+    Rectangles covering a (len(y), len(x)) array, at most `max_cells` of
+    them, each with the mean of the values it covers. Splitting stops early
+    once no block varies by more than `tolerance` of the overall range.
+    Returns x0, x1, y0, y1 (in axis units) and value arrays.
+    """
+    rows, cols = values.shape
+    finite = values[np.isfinite(values)]
+    span = float(finite.max() - finite.min()) if finite.size else 0.0
+
+    def error(r0: int, r1: int, c0: int, c1: int) -> float:
+        block = values[r0:r1, c0:c1]
+        if block.size == 1 or not np.isfinite(block).any():
+            return 0.0
+        lo, hi = np.nanmin(block), np.nanmax(block)
+        crosses = lo <= 0 < hi or np.isnan(block).any() and np.isfinite(block).any()
+        return (hi - lo) + (span if crosses else 0.0)
+
+    heap: List[Tuple[float, int, int, int, int]] = [(-error(0, rows, 0, cols), 0, rows, 0, cols)]
+    while heap and len(heap) + 3 <= max_cells:
+        worst, r0, r1, c0, c1 = heap[0]
+        if -worst <= tolerance * span:
+            break
+        heapq.heappop(heap)
+        rm, cm = (r0 + r1 + 1) // 2, (c0 + c1 + 1) // 2
+        for b in ((r0, rm, c0, cm), (r0, rm, cm, c1), (rm, r1, c0, cm), (rm, r1, cm, c1)):
+            if b[0] < b[1] and b[2] < b[3]:
+                heapq.heappush(heap, (-error(*b), *b))
+
+    blocks = np.array([b[1:] for b in heap], dtype=np.int64)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-nan blocks stay nan
+        means = np.array([np.nanmean(values[r0:r1, c0:c1]) for r0, r1, c0, c1 in blocks])
+    xe, ye = _edges(x), _edges(y)
+    return {
+        "x0": xe[blocks[:, 2]], "x1": xe[blocks[:, 3]],
+        "y0": ye[blocks[:, 0]], "y1": ye[blocks[:, 1]],
+        "value": means,
+    }
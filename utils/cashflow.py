@@ -0,0 +1,161 @@
+"""
+Monthly cash-flow and runway projection for many plans at once.
+
+A plan starts from one month's revenue, variable costs and fixed costs
+(the Cash Flow tab's inputs) and adds what changes over time:
+
+    revenue_m   = revenue * (1 + growth) ** ((m - 1) / 12)
+    variable_m  = revenue_m * variable_share
+    fixed_m     = fixed + monthly cost of every hire made by month m
+    semi_m      = cost of the highest semi-variable tier that revenue_m reaches
+    cash_m      = cash + sum over months <= m of
+                  (revenue - variable - fixed - semi + funding)
+
+Growth is yearly and compounded monthly. Hiring steps, tiers and funding
+injections are short per-plan lists; they are padded into
+(plans, steps) matrices so every plan and every month is computed in one
+vectorised pass. A month's step costs and tier costs are a step
+function's increments summed where the step is reached, so no Python
+loop runs over plans or months.
+"""
+import itertools
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_MONTHS = 60
+MAX_MONTHS = 120
+
+Step = Tuple[float, float]  # (month or revenue threshold, amount)
+
+
+@dataclass(frozen=True)
+class Plan:
+    """One plan. Money in rand per month unless stated otherwise."""
+
+    cash: float
+    revenue: float
+    variable_share: float           # variable costs as a share of revenue
+    fixed: float
+    growth: float = 0.0             # yearly revenue growth, as a fraction
+    hires: Tuple[Step, ...] = ()    # (first month, added monthly cost)
+    tiers: Tuple[Step, ...] = ()    # (monthly revenue from, monthly cost at that tier)
+    funding: Tuple[Step, ...] = ()  # (month received, amount)
+
+    def __post_init__(self) -> None:
+        if self.variable_share < 0:
+            raise ValueError("variable_share must be non-negative")
+        if self.growth <= -1:
+            raise ValueError("growth must be above -100%")
+        for month, _ in self.hires + self.funding:
+            if month < 1:
+                raise ValueError("hiring and funding months start at 1")
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Monthly results, one row per plan."""
+
+    months: np.ndarray        # (n_months,) 1, 2, ...
+    revenue: np.ndarray       # (n_plans, n_months)
+    costs: np.ndarray         # variable + fixed + semi-variable
+    funding: np.ndarray
+    cash: np.ndarray          # closing cash balance
+    runway_out: np.ndarray    # (n_plans,) first month closing below zero; nan if never
+    break_even: np.ndarray    # (n_plans,) first month revenue covers costs; nan if never
+
+    def __len__(self) -> int:
+        return self.cash.shape[0]
+
+    @property
+    def operating(self) -> np.ndarray:
+        """Monthly operating cash flow (before funding)."""
+        return self.revenue - self.costs
+
+    def runway_dates(self, start: date) -> List[Optional[date]]:
+        """The month in which each plan runs out of cash, counting `start` as month 1."""
+        out: List[Optional[date]] = []
+        for m in self.runway_out.tolist():
+            if np.isnan(m):
+                out.append(None)
+                continue
+            months = start.month - 1 + int(m) - 1
+            out.append(date(start.year + months // 12, months % 12 + 1, 1))
+        return out
+
+    def cash_percentiles(self, qs: Sequence[float] = (10, 50, 90)) -> np.ndarray:
+        """(len(qs), n_months) percentiles of the cash balance across plans."""
+        return np.percentile(self.cash, qs, axis=0)
+
+
+def _steps(rows: Sequence[Sequence[Step]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pad per-plan step lists into (n_plans, width) key and amount matrices."""
+    width = max((len(r) for r in rows), default=0)
+    keys = np.full((len(rows), width), np.inf)
+    amounts = np.zeros((len(rows), width))
+    for i, row in enumerate(rows):
+        if row:
+            keys[i, :len(row)], amounts[i, :len(row)] = zip(*row)
+    return keys, amounts
+
+
+def _tier_increments(rows: Sequence[Sequence[Step]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Tier thresholds sorted per plan, with the cost increase at each threshold."""
+    return _steps([
+        [(lo, cost - prev) for (lo, cost), prev in zip(tiers, (0.0,) + tuple(c for _, c in tiers))]
+        for tiers in (sorted(r) for r in rows)
+    ])
+
+
+def _first_month(mask: np.ndarray) -> np.ndarray:
+    hit = mask.any(axis=1)
+    return np.where(hit, mask.argmax(axis=1) + 1.0, np.nan)
+
+
+def project(plans: Sequence[Plan], months: int = DEFAULT_MONTHS) -> Projection:
+    """Project every plan over `months` months in one vectorised pass."""
+    if not 1 <= months <= MAX_MONTHS:
+        raise ValueError(f"months must be between 1 and {MAX_MONTHS}")
+    if not plans:
+        raise ValueError("at least one plan is required")
+    col = lambda attr: np.array([getattr(p, attr) for p in plans], dtype=float)[:, None]  # noqa: E731
+    m = np.arange(1, months + 1, dtype=float)
+
+    revenue = col("revenue") * (1 + col("growth")) ** ((m - 1) / 12)
+    costs = revenue * col("variable_share") + col("fixed")
+
+    hire_month, hire_cost = _steps([p.hires for p in plans])
+    costs += np.einsum("pmk,pk->pm", hire_month[:, None, :] <= m[None, :, None], hire_cost)
+
+    tier_from, tier_step = _tier_increments([p.tiers for p in plans])
+    costs += np.einsum("pmk,pk->pm", tier_from[:, None, :] <= revenue[:, :, None], tier_step)
+
+    fund_month, fund_amount = _steps([p.funding for p in plans])
+    funding = np.einsum("pmk,pk->pm", fund_month[:, None, :] == m[None, :, None], fund_amount)
+
+    cash = col("cash") + np.cumsum(revenue - costs + funding, axis=1)
+    projection = Projection(
+        months=m.astype(int),
+        revenue=revenue,
+        costs=costs,
+        funding=funding,
+        cash=cash,
+        runway_out=_first_month(cash < 0),
+        break_even=_first_month(revenue >= costs),
+    )
+    for array in (projection.revenue, projection.costs, projection.funding, projection.cash):
+        array.setflags(write=False)
+    return projection
+
+
+def grid(base: Plan, **values: Sequence[float]) -> Tuple[List[Plan], List[Dict[str, float]]]:
+    """
+    Every combination of the given field values applied to `base`, e.g.
+    grid(plan, growth=[0, 0.2, 0.4], revenue=[1e5, 2e5]) -> 6 plans, plus
+    the values each plan uses.
+    """
+    names = list(values)
+    combos = [dict(zip(names, combo)) for combo in itertools.product(*values.values())]
+    return [replace(base, **combo) for combo in combos], combos
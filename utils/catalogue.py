@@ -0,0 +1,400 @@
+"""
+Compact, columnar business model catalogue with lazily loaded details.
+
+Only the fields the library shows up front (id, name, description,
+difficulty, capital, time to revenue, maturity and tags) are kept in
+memory, as parallel columns: tuples of strings, small integer codes for
+categorical fields and a CSR-style tag column. The heavy teaching content
+(revenue streams, use cases, examples, risks) is written once to an
+indexed binary file next to the catalogue and read on demand through a
+memory map, one record at a time.
+
+Details file layout (little endian):
+
+    b"BMDT" | version u32 | count u64 | offsets u64[count + 1] | records
+
+Each record is the UTF-8 JSON of that model's detail fields.
+
+Cold starts skip JSON parsing entirely: the columnar summary is pickled
+into a snapshot beside the details file, stamped with the source's
+mtime, size and SHA-256. A matching mtime and size is trusted as is; a
+mismatch falls back to comparing the hash (so a touched but unchanged
+file is not rebuilt), and only a changed hash triggers a rebuild.
+
+A loaded Catalogue is read-only and meant to be shared by every session
+in the process: its arrays are non-writeable, its strings interned, and
+each model is also exposed as an immutable ModelRecord, created on first
+use. Filters hand out CatalogueViews (an array of positions) instead of
+copying records.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CATALOGUE_PATH = DATA_DIR / "business_models.json"
+CACHE_DIR = DATA_DIR / ".cache"
+
+DETAIL_FIELDS = ("revenue_streams", "use_cases", "examples", "risks")
+CATEGORY_FIELDS = ("capital_requirement", "time_to_revenue", "maturity_level")
+
+_MAGIC = b"BMDT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+
+# Sentinel code for a missing categorical value / difficulty.
+MISSING = -1
+
+_SNAPSHOT_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """How a catalogue was loaded and how long it took."""
+
+    source: str  # "snapshot" or "json"
+    seconds: float
+    models: int
+
+
+class ModelRecord(NamedTuple):
+    """
+    Immutable summary of one business model. `get` mirrors dict access so
+    code written against the raw JSON dicts keeps working.
+    """
+
+    position: int
+    id: str
+    name: str
+    description: str
+    tags: Tuple[str, ...]
+    difficulty: Optional[int]
+    capital_requirement: Optional[str]
+    time_to_revenue: Optional[str]
+    maturity_level: Optional[str]
+
+    def get(self, field: str, default: Any = None) -> Any:
+        value = getattr(self, field, None) if field in self._fields else None
+        return default if value is None else value
+
+
+def _encode(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """
+    Categorical column -> (codes, categories in first-seen order). Codes
+    are the narrowest signed integer type that holds every category.
+    """
+    categories: Dict[str, int] = {}
+    codes = [
+        MISSING if value is None else categories.setdefault(sys.intern(value), len(categories))
+        for value in values
+    ]
+    dtype = np.int8 if len(categories) <= np.iinfo(np.int8).max else (
+        np.int16 if len(categories) <= np.iinfo(np.int16).max else np.int32
+    )
+    return _readonly(np.array(codes, dtype=dtype)), tuple(categories)
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+def write_details(records: Sequence[Dict[str, Any]], path: Path) -> None:
+    """
+    Write the detail fields of every record to an indexed binary file.
+    The file is written beside its final name and swapped in atomically.
+    """
+    blobs = [
+        json.dumps({k: r[k] for k in DETAIL_FIELDS if k in r}, ensure_ascii=False).encode("utf-8")
+        for r in records
+    ]
+    offsets = np.zeros(len(blobs) + 1, dtype="<u8")
+    np.cumsum([len(b) for b in blobs], out=offsets[1:])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(blobs)))
+        f.write(offsets.tobytes())
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+
+
+class DetailStore:
+    """Random access to the records of a details file via mmap."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{self.path} is not a version {_VERSION} details file")
+        self._offsets = np.frombuffer(self._mm, dtype="<u8", count=count + 1, offset=_HEADER.size)
+        self._base = _HEADER.size + self._offsets.nbytes
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        start = self._base + int(self._offsets[i])
+        end = self._base + int(self._offsets[i + 1])
+        return json.loads(self._mm[start:end])
+
+
+class Catalogue:
+    """
+    Columnar summary of the catalogue plus a lazy DetailStore.
+
+    Positions (0..len-1) follow the order of the source file.
+    """
+
+    load_report: Optional[LoadReport] = None
+
+    def __init__(self, records: Sequence[Dict[str, Any]], details: DetailStore):
+        if len(records) != len(details):
+            raise ValueError("details file does not match the catalogue")
+        self._details = details
+
+        self.ids: Tuple[str, ...] = tuple(r.get("id", "") for r in records)
+        self.names: Tuple[str, ...] = tuple(r.get("name", "") for r in records)
+        self.descriptions: Tuple[str, ...] = tuple(r.get("description", "") for r in records)
+        self.difficulty = _readonly(np.array(
+            [r.get("difficulty", MISSING) for r in records], dtype=np.int8
+        ))
+        self.categories: Dict[str, Tuple[np.ndarray, Tuple[str, ...]]] = {
+            field: _encode([r.get(field) for r in records]) for field in CATEGORY_FIELDS
+        }
+
+        # Tags as CSR: codes into tag_vocabulary, sliced by tag_offsets.
+        vocab: Dict[str, int] = {}
+        codes: List[int] = []
+        offsets = [0]
+        for r in records:
+            codes.extend(vocab.setdefault(sys.intern(t), len(vocab)) for t in r.get("tags", []))
+            offsets.append(len(codes))
+        self.tag_vocabulary: Tuple[str, ...] = tuple(vocab)
+        self.tag_codes = _readonly(np.array(codes, dtype=np.int32))
+        self.tag_offsets = _readonly(np.array(offsets, dtype=np.int64))
+        self._index()
+
+    def _index(self) -> None:
+        """Derived lookups, rebuilt rather than pickled."""
+        self._positions = {id_: i for i, id_ in enumerate(self.ids)}
+        # ModelRecords are created on first access and then shared.
+        self._records: List[Optional[ModelRecord]] = [None] * len(self.ids)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The memory map is reattached after unpickling, never pickled.
+        state = self.__dict__.copy()
+        for derived in ("_details", "load_report", "_positions", "_records"):
+            state.pop(derived, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.tag_vocabulary = tuple(sys.intern(t) for t in self.tag_vocabulary)
+        self.categories = {
+            field: (_readonly(codes.copy()), tuple(sys.intern(c) for c in cats))
+            for field, (codes, cats) in self.categories.items()
+        }
+        for name in ("difficulty", "tag_codes", "tag_offsets"):
+            setattr(self, name, _readonly(getattr(self, name).copy()))
+        self._index()
+
+    def attach(self, details: DetailStore) -> "Catalogue":
+        if len(details) != len(self):
+            raise ValueError("details file does not match the catalogue")
+        self._details = details
+        return self
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def position(self, model_id: str) -> int:
+        return self._positions[model_id]
+
+    def model(self, i: int) -> ModelRecord:
+        """The shared, immutable record for position i."""
+        record = self._records[i]
+        if record is None:
+            # Concurrent sessions may race here; both build equal records.
+            record = self._records[i] = ModelRecord(
+                i,
+                self.ids[i],
+                self.names[i],
+                self.descriptions[i],
+                self.tags(i),
+                None if self.difficulty[i] == MISSING else int(self.difficulty[i]),
+                *(self.category(field, i) for field in CATEGORY_FIELDS),
+            )
+        return record
+
+    def tags(self, i: int) -> Tuple[str, ...]:
+        lo, hi = self.tag_offsets[i], self.tag_offsets[i + 1]
+        return tuple(self.tag_vocabulary[c] for c in self.tag_codes[lo:hi])
+
+    def category(self, field: str, i: int) -> Optional[str]:
+        codes, categories = self.categories[field]
+        code = codes[i]
+        return None if code == MISSING else categories[code]
+
+    def summary(self, i: int) -> Dict[str, Any]:
+        """The up-front fields of one model, as a plain dict."""
+        out: Dict[str, Any] = {
+            "id": self.ids[i],
+            "name": self.names[i],
+            "description": self.descriptions[i],
+            "tags": list(self.tags(i)),
+        }
+        if self.difficulty[i] != MISSING:
+            out["difficulty"] = int(self.difficulty[i])
+        for field in CATEGORY_FIELDS:
+            value = self.category(field, i)
+            if value is not None:
+                out[field] = value
+        return out
+
+    def details(self, i: int) -> Dict[str, Any]:
+        """Revenue streams, use cases, examples and risks, read on demand."""
+        return self._details[i]
+
+    def record(self, i: int) -> Dict[str, Any]:
+        out = self.summary(i)
+        out.update(self.details(i))
+        return out
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def view(self, positions: Optional[Sequence[int]] = None) -> "CatalogueView":
+        """A view over some (by default all) models, in the given order."""
+        if positions is None:
+            positions = np.arange(len(self), dtype=np.int32)
+        return CatalogueView(self, positions)
+
+
+class CatalogueView(Sequence):
+    """
+    An ordered selection of a Catalogue's models, held as positions only.
+    Indexing yields the shared ModelRecords; slicing yields another view.
+    """
+
+    __slots__ = ("catalogue", "positions")
+
+    def __init__(self, catalogue: Catalogue, positions: Sequence[int]):
+        self.catalogue = catalogue
+        self.positions = _readonly(np.asarray(positions, dtype=np.int32).copy())
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[ModelRecord, "CatalogueView"]:
+        if isinstance(i, slice):
+            return CatalogueView(self.catalogue, self.positions[i])
+        return self.catalogue.model(int(self.positions[i]))
+
+    def __iter__(self) -> Iterator[ModelRecord]:
+        model = self.catalogue.model
+        return (model(p) for p in self.positions.tolist())
+
+    def take(self, positions: Sequence[int]) -> "CatalogueView":
+        """Catalogue positions that are also in this view, in the given order."""
+        positions = np.asarray(positions, dtype=np.int32)
+        return CatalogueView(self.catalogue, positions[np.isin(positions, self.positions)])
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_snapshot(snapshot_path: Path, details_path: Path, source: Path) -> Optional[Catalogue]:
+    """The snapshot's catalogue if it still matches `source`, else None."""
+    if not snapshot_path.exists() or not details_path.exists():
+        return None
+    try:
+        with open(snapshot_path, "rb") as f:
+            snapshot = pickle.load(f)
+    except Exception:  # unreadable, truncated or written by other code: rebuild
+        logger.warning("Ignoring unreadable catalogue snapshot %s", snapshot_path, exc_info=True)
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != _SNAPSHOT_VERSION:
+        return None
+
+    stat = source.stat()
+    if (snapshot["mtime_ns"], snapshot["size"]) != (stat.st_mtime_ns, stat.st_size):
+        if snapshot["sha256"] != _sha256(source):
+            return None
+        # Same content, new timestamp: restamp so the next start is fast again.
+        snapshot["mtime_ns"], snapshot["size"] = stat.st_mtime_ns, stat.st_size
+        _write_snapshot(snapshot_path, snapshot)
+
+    try:
+        return snapshot["catalogue"].attach(DetailStore(details_path))
+    except ValueError:
+        return None
+
+
+def _write_snapshot(snapshot_path: Path, snapshot: Dict[str, Any]) -> None:
+    tmp = snapshot_path.with_suffix(snapshot_path.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, snapshot_path)
+
+
+def load_catalogue(path: Path = CATALOGUE_PATH, cache_dir: Path = CACHE_DIR) -> Catalogue:
+    """
+    Load the catalogue from its snapshot when it is current, otherwise
+    parse the JSON and (re)write the details file and snapshot. The
+    returned catalogue carries a LoadReport with the load time.
+    """
+    start = time.perf_counter()
+    path = Path(path).resolve()
+    cache_dir = Path(cache_dir)
+    details_path = cache_dir / (path.stem + ".details.bin")
+    snapshot_path = cache_dir / (path.stem + ".snapshot.pkl")
+
+    catalogue = _read_snapshot(snapshot_path, details_path, path)
+    source = "snapshot"
+    if catalogue is None:
+        source = "json"
+        stat = path.stat()
+        raw = path.read_bytes()  # read once for both the hash and the parse
+        sha256 = hashlib.sha256(raw).hexdigest()
+        records = json.loads(raw)
+        write_details(records, details_path)
+        catalogue = Catalogue(records, DetailStore(details_path))
+        _write_snapshot(snapshot_path, {
+            "version": _SNAPSHOT_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256,
+            "catalogue": catalogue,
+        })
+
+    catalogue.load_report = LoadReport(source, time.perf_counter() - start, len(catalogue))
+    logger.info(
+        "Loaded %d business models from %s in %.1f ms",
+        len(catalogue), source, catalogue.load_report.seconds * 1000,
+    )
+    return catalogue
@@ -0,0 +1,156 @@
+"""
+Bitmap facet index over the business model catalogue.
+
+Every value of every facet (difficulty, capital requirement, time to
+revenue, maturity, tags) gets a bitmap with one bit per model, built once
+from the catalogue's columnar codes and packed eight models to a byte.
+A filter is a bitmap too: values of one facet are OR-ed, facets are
+AND-ed. Rows are padded to whole 64-bit words so AND, OR and popcount
+run a word at a time.
+
+Counts are disjunctive: a facet's counts apply every *other* facet's
+selection (and the base set), so they say how many models each value
+would add. Counting all values of one facet is a single AND and popcount
+over a (values x bytes) matrix.
+"""
+import re
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.catalogue import CATEGORY_FIELDS, MISSING, Catalogue
+
+FACETS: Dict[str, str] = {
+    "difficulty": "Difficulty",
+    "capital_requirement": "Capital requirement",
+    "time_to_revenue": "Time to revenue",
+    "maturity_level": "Maturity",
+    "tags": "Tags",
+}
+NOT_SET = "Not set"
+
+# Natural orders for known values; anything else sorts after them.
+VALUE_ORDER: Dict[str, Tuple[str, ...]] = {
+    "capital_requirement": ("Low", "Medium", "High"),
+    "maturity_level": ("emerging", "established", "dominant"),
+}
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+_LEADING_NUMBER = re.compile(r"\d+")
+
+Selections = Mapping[str, Sequence[str]]
+
+
+def popcount(bits: np.ndarray, axis: Optional[int] = None) -> np.ndarray:
+    """Number of set bits in a packed bitmap (or per row along `axis`)."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(bits.view(np.uint64)).sum(axis=axis, dtype=np.int64)
+    return _POPCOUNT[bits].sum(axis=axis, dtype=np.int64)
+
+
+def _value_key(field: str, value: str) -> Tuple:
+    order = VALUE_ORDER.get(field, ())
+    if value == NOT_SET:
+        return (2, 0, "")
+    if value in order:
+        return (0, order.index(value), "")
+    number = _LEADING_NUMBER.match(value)
+    return (1, int(number.group()) if number else 0, value)
+
+
+class FacetIndex:
+    """
+    Packed bitmaps for every facet value of a catalogue. Bitmaps are
+    read-only and shared across sessions.
+    """
+
+    def __init__(self, catalogue: Catalogue):
+        n = self.size = len(catalogue)
+        self.nbytes = (n + 63) // 64 * 8
+        self.values: Dict[str, Tuple[str, ...]] = {}
+        self._bits: Dict[str, np.ndarray] = {}
+        self._row: Dict[str, Dict[str, int]] = {}
+        positions = np.arange(n, dtype=np.int64)
+
+        difficulty = catalogue.difficulty.astype(np.int64)
+        labels = [NOT_SET if d == MISSING else str(d) for d in np.unique(difficulty).tolist()]
+        self._add("difficulty", labels, np.searchsorted(np.unique(difficulty), difficulty), positions)
+
+        for field in CATEGORY_FIELDS:
+            codes, categories = catalogue.categories[field]
+            codes = codes.astype(np.int64)
+            labels = list(categories) + [NOT_SET]
+            self._add(field, labels, np.where(codes == MISSING, len(categories), codes), positions)
+
+        owners = np.repeat(positions, np.diff(catalogue.tag_offsets))
+        self._add("tags", list(catalogue.tag_vocabulary), catalogue.tag_codes.astype(np.int64), owners)
+
+        self._full = self.mask(positions)
+        self._full.setflags(write=False)
+
+    def _add(self, field: str, labels: Sequence[str], rows: np.ndarray, positions: np.ndarray) -> None:
+        """Set bit `positions[i]` in the bitmap of value `labels[rows[i]]`; drop empty values."""
+        bits = np.zeros((len(labels), self.nbytes), dtype=np.uint8)
+        np.bitwise_or.at(bits, (rows, positions >> 3), (128 >> (positions & 7)).astype(np.uint8))
+        counts = popcount(bits, axis=1)
+        keep = [i for i in range(len(labels)) if counts[i]]
+        if field == "tags":
+            keep.sort(key=lambda i: (-counts[i], labels[i].lower()))
+        else:
+            keep.sort(key=lambda i: _value_key(field, labels[i]))
+        self.values[field] = tuple(labels[i] for i in keep)
+        self._row[field] = {labels[i]: row for row, i in enumerate(keep)}
+        bits = bits[keep]
+        bits.setflags(write=False)
+        self._bits[field] = bits
+
+    # ----------------------------
+    # Bitmaps
+    # ----------------------------
+    def full(self) -> np.ndarray:
+        """Bitmap with every model set."""
+        return self._full.copy()
+
+    def mask(self, positions: Sequence[int]) -> np.ndarray:
+        """Bitmap of the given catalogue positions."""
+        bits = np.zeros(self.nbytes * 8, dtype=bool)
+        bits[np.asarray(positions, dtype=np.int64)] = True
+        return np.packbits(bits)
+
+    def contains(self, bits: np.ndarray, positions: Sequence[int]) -> np.ndarray:
+        """Whether each of `positions` is set in `bits`."""
+        return np.unpackbits(bits, count=self.size).astype(bool)[np.asarray(positions, dtype=np.int64)]
+
+    def facet_mask(self, field: str, values: Sequence[str]) -> Optional[np.ndarray]:
+        """OR of the bitmaps of `values`; None when nothing is selected."""
+        if not values:
+            return None
+        rows = [self._row[field][v] for v in values if v in self._row[field]]
+        if not rows:
+            return np.zeros(self.nbytes, dtype=np.uint8)
+        return np.bitwise_or.reduce(self._bits[field][rows], axis=0)
+
+    def select(self, selections: Selections, base: Optional[np.ndarray] = None, skip: Optional[str] = None) -> np.ndarray:
+        """AND of every facet's selection (except `skip`) and `base`."""
+        bits = self.full() if base is None else base.copy()
+        for field, values in selections.items():
+            if field != skip:
+                facet = self.facet_mask(field, values)
+                if facet is not None:
+                    bits &= facet
+        return bits
+
+    # ----------------------------
+    # Counts
+    # ----------------------------
+    def counts(self, selections: Selections, base: Optional[np.ndarray] = None) -> Dict[str, Dict[str, int]]:
+        """
+        For every facet value, how many models match it together with the
+        selections of the other facets and `base`.
+        """
+        out = {}
+        for field in self.values:
+            others = self.select(selections, base, skip=field)
+            totals = popcount(self._bits[field] & others, axis=1)
+            out[field] = dict(zip(self.values[field], totals.tolist()))
+        return out
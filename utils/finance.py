@@ -0,0 +1,194 @@
+"""
+Finance calculations used by the Financial Projections page.
+
+Everything here is plain NumPy so it can be reused outside Streamlit
+(batch runs, benchmarks) and evaluated over many projects at once. The
+per-tab calculations take only hashable scalars and tuples, and the ones
+that do real work are memoised on those inputs.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.irr import IRRResult, irr
+
+# Scorecard weights for team, IP strength, traction and market size.
+VALUATION_WEIGHTS = (0.3, 0.25, 0.2, 0.25)
+
+# Discount rates swept for the NPV profile chart.
+PROFILE_RATES = np.linspace(0.0, 0.60, 121)
+PROFILE_RATES.setflags(write=False)
+
+
+def npv_surface(
+    cash_flows: Sequence,
+    rates,
+    periods: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    NPV of every cash-flow series at every discount rate in one call.
+
+    `cash_flows` is a single series (n_periods,) or a matrix
+    (n_series, n_periods); `rates` is a scalar or a vector (n_rates,).
+    `periods` gives the time of each column and defaults to 0, 1, 2, ...
+
+    The result is (n_series, n_rates), with the series axis dropped for a
+    single series and the rate axis dropped for a scalar rate.
+    """
+    cf = np.asarray(cash_flows, dtype=float)
+    single_series = cf.ndim == 1
+    cf = np.atleast_2d(cf)
+
+    r = np.asarray(rates, dtype=float)
+    scalar_rate = r.ndim == 0
+    r = np.atleast_1d(r)
+
+    if periods is None:
+        t = np.arange(cf.shape[1], dtype=float)
+    else:
+        t = np.asarray(periods, dtype=float)
+        if t.shape != (cf.shape[1],):
+            raise ValueError("periods must have one entry per cash-flow column")
+
+    # Discount factors for every (rate, period) pair, then one matrix product.
+    discount = np.power(1.0 + r[:, None], -t[None, :])
+    surface = cf @ discount.T
+
+    if scalar_rate:
+        surface = surface[:, 0]
+    if single_series:
+        surface = surface[0]
+    return surface
+
+
+def npv_rows(cash_flows, rates, periods: Optional[Sequence[float]] = None) -> np.ndarray:
+    """
+    Row-wise NPV: each series in a (n_series, n_periods) matrix discounted
+    at its own rate from `rates` (n_series,).
+    """
+    cf = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    r = np.broadcast_to(np.asarray(rates, dtype=float), (cf.shape[0],))
+    t = np.arange(cf.shape[1], dtype=float) if periods is None else np.asarray(periods, dtype=float)
+    return np.einsum("ij,ij->i", cf, np.power(1.0 + r[:, None], -t[None, :]))
+
+
+def compute_npv(cash_flows: Iterable[Tuple[float, float]], discount_rate: float) -> float:
+    """
+    NPV of a list of (t, cash_flow) tuples at a single discount rate.
+    """
+    cash_flows = list(cash_flows)
+    if not cash_flows:
+        return 0.0
+    periods, values = zip(*cash_flows)
+    return float(npv_surface(values, discount_rate, periods=periods))
+
+
+def compute_irr(cash_flows: Iterable[Tuple[float, float]]) -> Optional[float]:
+    """
+    IRR of a list of (t, cash_flow) tuples, or None when there is none.
+    """
+    cash_flows = list(cash_flows)
+    if not cash_flows:
+        return None
+    periods, values = zip(*cash_flows)
+    return irr(values, periods=periods).rate
+
+
+# ----------------------------
+# Per-tab calculations
+# ----------------------------
+@dataclass(frozen=True)
+class BreakEven:
+    margin: float
+    units: Optional[float]  # None when price does not exceed variable cost
+
+
+@dataclass(frozen=True)
+class CashFlowSummary:
+    gross: float
+    net: float
+    burn: float
+    runway: float  # months; inf when there is no burn
+
+
+@dataclass(frozen=True)
+class NPVAnalysis:
+    npv: float
+    rates: np.ndarray
+    profile: np.ndarray
+
+
+@dataclass(frozen=True)
+class Scenarios:
+    best: float
+    expected: float
+    worst: float
+
+
+def break_even(fixed_costs: float, var_cost: float, price: float) -> BreakEven:
+    margin = price - var_cost
+    return BreakEven(margin, fixed_costs / margin if margin > 0 else None)
+
+
+def value_based_price(saving: float, pct: float, years: int) -> Tuple[float, float]:
+    """
+    (total value created, suggested price) for capturing `pct`% of it.
+    """
+    total_value = saving * years
+    return total_value, total_value * (pct / 100)
+
+
+def cash_flow_summary(revenue: float, variable: float, fixed: float, cash: float) -> CashFlowSummary:
+    gross = revenue - variable
+    net = gross - fixed
+    burn = max(variable + fixed - revenue, 0)
+    runway = cash / burn if burn > 0 else float("inf")
+    return CashFlowSummary(gross, net, burn, runway)
+
+
+@lru_cache(maxsize=512)
+def npv_analysis(initial: float, flows: Tuple[float, ...], rate: float) -> NPVAnalysis:
+    """
+    NPV at `rate` plus the NPV profile across PROFILE_RATES for an upfront
+    investment followed by yearly flows.
+    """
+    series = np.array((-initial,) + tuple(flows), dtype=float)
+    profile = npv_surface(series, PROFILE_RATES)
+    profile.setflags(write=False)
+    return NPVAnalysis(float(npv_surface(series, rate)), PROFILE_RATES, profile)
+
+
+@lru_cache(maxsize=512)
+def irr_analysis(initial: float, flows: Tuple[float, ...]) -> IRRResult:
+    """
+    IRR of an upfront investment followed by yearly flows.
+    """
+    return irr((-initial,) + tuple(flows))
+
+
+def valuation_score(team: float, ip: float, traction: float, market: float) -> float:
+    return sum(w * v for w, v in zip(VALUATION_WEIGHTS, (team, ip, traction, market)))
+
+
+def scenario_profits(
+    base_rev: float,
+    base_cost: float,
+    rev_up: float,
+    cost_down: float,
+    rev_down: float,
+    cost_up: float,
+) -> Scenarios:
+    """
+    Best, expected and worst profit from percentage moves in revenue and cost.
+    """
+    return Scenarios(
+        best=base_rev * (1 + rev_up / 100) - base_cost * (1 - cost_down / 100),
+        expected=base_rev - base_cost,
+        worst=base_rev * (1 - rev_down / 100) - base_cost * (1 + cost_up / 100),
+    )
+
+
+def adjusted_revenue(direct: float, savings: float, carbon: float, licensing: float) -> float:
+    return direct + savings + carbon + licensing
@@ -0,0 +1,240 @@
+"""
+Vectorised schedules for comparing ways to fund a venture.
+
+Every instrument is evaluated for a whole grid of term combinations at
+once: each builder takes its terms as arrays (one value per combination,
+see `term_grid`) and returns month-by-month matrices of shape
+(n_combinations, horizon + 1), month 0 being the day the money arrives.
+
+All schedules are seen from the founder's side. `cash` is money received
+(+) or paid out (-); `cost` is the part of each month's outflow that is
+the price of the capital rather than its return (interest, fees, the
+value of equity handed over); `balance` is what is still owed. Anything
+still owed at the horizon is settled in the final month, and equity is
+valued at the exit value on the horizon, so every instrument can be
+ranked by the same effective annual rate: the IRR of its cash schedule.
+"""
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+from utils.finance import npv_surface
+from utils.irr import irr_batch
+
+INSTRUMENTS = ("Loan", "Convertible note", "Grant", "Equity", "Revenue-based financing")
+
+
+@dataclass(frozen=True)
+class Schedules:
+    """Month-by-month schedules for many term combinations of one instrument."""
+
+    instrument: str
+    terms: Dict[str, np.ndarray]  # one value per combination
+    cash: np.ndarray              # (n, horizon + 1) received (+) / paid (-)
+    cost: np.ndarray              # (n, horizon + 1) cost of capital per month
+    balance: np.ndarray           # (n, horizon + 1) still owed at month end
+    dilution: np.ndarray          # (n,) share of the company given up
+
+    def __len__(self) -> int:
+        return self.cash.shape[0]
+
+    @property
+    def horizon(self) -> int:
+        return self.cash.shape[1] - 1
+
+
+def term_grid(**axes) -> Dict[str, np.ndarray]:
+    """
+    Every combination of the given term values, flattened:
+
+        term_grid(rate=[0.08, 0.1], tenor=[24, 36, 48])  # 6 combinations
+    """
+    names = list(axes)
+    mesh = np.meshgrid(*(np.asarray(axes[k], dtype=float) for k in names), indexing="ij")
+    return {name: m.ravel() for name, m in zip(names, mesh)}
+
+
+def _terms(*values) -> list:
+    """Broadcast scalar or array terms to flat float arrays of one length."""
+    return [a.astype(float).ravel() for a in np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values))]
+
+
+def _months(horizon: int) -> np.ndarray:
+    return np.arange(horizon + 1, dtype=float)[None, :]
+
+
+def _settle(cash: np.ndarray, balance: np.ndarray) -> None:
+    """Pay whatever is still owed at the horizon in the final month."""
+    cash[:, -1] -= balance[:, -1]
+    balance[:, -1] = 0.0
+
+
+# ----------------------------
+# Instruments
+# ----------------------------
+def loan_schedules(amount, annual_rate, tenor, grace, horizon: int) -> Schedules:
+    """
+    Amortising loans: interest only for `grace` months, then equal monthly
+    payments until month `tenor`.
+    """
+    amount, annual_rate, tenor, grace = _terms(amount, annual_rate, tenor, grace)
+    r = (annual_rate / 12)[:, None]
+    n = np.maximum(tenor - grace, 1)[:, None]
+    t = _months(horizon)
+
+    # Payments made on the amortising part by the end of each month.
+    k = np.clip(t - grace[:, None], 0, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth_n = (1 + r) ** n
+        balance = np.where(
+            r > 0,
+            amount[:, None] * (growth_n - (1 + r) ** k) / (growth_n - 1),
+            amount[:, None] * (1 - k / n),
+        )
+
+    interest = np.zeros_like(balance)
+    interest[:, 1:] = balance[:, :-1] * r
+    principal = np.zeros_like(balance)
+    principal[:, 1:] = balance[:, :-1] - balance[:, 1:]
+    cash = -(interest + principal)
+    cash[:, 0] += amount
+    _settle(cash, balance)
+
+    return Schedules(
+        "Loan",
+        {"amount": amount, "annual_rate": annual_rate, "tenor": tenor, "grace": grace},
+        cash, interest, balance, np.zeros(len(amount)),
+    )
+
+
+def convertible_note_schedules(
+    amount, interest, discount, cap, conversion_month, round_pre_money, exit_value, horizon: int
+) -> Schedules:
+    """
+    Notes that accrue simple interest until a priced round at
+    `conversion_month`, then convert at the lower of the valuation cap and
+    the discounted round price. The stake is valued at `exit_value`.
+    """
+    amount, interest, discount, cap, conversion_month, round_pre_money, exit_value = _terms(
+        amount, interest, discount, cap, conversion_month, round_pre_money, exit_value
+    )
+    t = _months(horizon)
+    converts = np.minimum(conversion_month, horizon)[:, None]
+
+    accrued = amount * (1 + interest * np.minimum(conversion_month, horizon) / 12)
+    pre_money = np.minimum(cap, round_pre_money * (1 - discount))
+    share = accrued / (pre_money + accrued)
+
+    cost = np.where((t >= 1) & (t <= converts), (amount * interest / 12)[:, None], 0.0)
+    balance = np.where(t < converts, amount[:, None] * (1 + interest[:, None] * t / 12), 0.0)
+    cash = np.zeros_like(cost)
+    cash[:, 0] = amount
+    cash[:, -1] -= share * exit_value
+    cost[:, -1] += share * exit_value - accrued
+
+    return Schedules(
+        "Convertible note",
+        {
+            "amount": amount, "interest": interest, "discount": discount, "cap": cap,
+            "conversion_month": conversion_month, "round_pre_money": round_pre_money,
+        },
+        cash, cost, balance, share,
+    )
+
+
+def grant_schedules(amount, admin, tranches, horizon: int) -> Schedules:
+    """
+    Non-repayable grants paid in equal monthly tranches; `admin` is the
+    share of the grant spent on applying and reporting.
+    """
+    amount, admin, tranches = _terms(amount, admin, tranches)
+    tranches = np.clip(np.round(tranches), 1, horizon + 1)
+    t = _months(horizon)
+    paid_out = t < tranches[:, None]
+    cost = np.where(paid_out, (amount * admin / tranches)[:, None], 0.0)
+    cash = np.where(paid_out, (amount / tranches)[:, None], 0.0) - cost
+
+    return Schedules(
+        "Grant",
+        {"amount": amount, "admin": admin, "tranches": tranches},
+        cash, cost, np.zeros_like(cash), np.zeros(len(amount)),
+    )
+
+
+def equity_schedules(amount, pre_money, exit_value, horizon: int) -> Schedules:
+    """
+    Priced equity rounds; the investor's stake is valued at `exit_value`.
+    """
+    amount, pre_money, exit_value = _terms(amount, pre_money, exit_value)
+    share = amount / (pre_money + amount)
+    cash = np.zeros((len(amount), horizon + 1))
+    cash[:, 0] = amount
+    cash[:, -1] -= share * exit_value
+    cost = np.zeros_like(cash)
+    cost[:, -1] = share * exit_value - amount
+
+    return Schedules(
+        "Equity",
+        {"amount": amount, "pre_money": pre_money},
+        cash, cost, np.zeros_like(cash), share,
+    )
+
+
+def revenue_based_schedules(amount, revenue_share, cap_multiple, revenue, growth, horizon: int) -> Schedules:
+    """
+    Revenue-based financing: `revenue_share` of each month's revenue is
+    paid until `cap_multiple` x amount has been repaid. Monthly revenue
+    starts at `revenue` and grows by `growth` a month.
+    """
+    amount, revenue_share, cap_multiple, revenue, growth = _terms(
+        amount, revenue_share, cap_multiple, revenue, growth
+    )
+    t = _months(horizon)
+    monthly = np.where(t >= 1, revenue[:, None] * (1 + growth[:, None]) ** (t - 1), 0.0)
+    due = (amount * cap_multiple)[:, None]
+    repaid = np.minimum(np.cumsum(revenue_share[:, None] * monthly, axis=1), due)
+    payments = np.diff(repaid, axis=1, prepend=0.0)
+
+    balance = due - repaid
+    cash = -payments
+    cash[:, 0] += amount
+    _settle(cash, balance)
+    cost = -np.minimum(cash, 0.0) * (1 - 1 / cap_multiple)[:, None]
+
+    return Schedules(
+        "Revenue-based financing",
+        {"amount": amount, "revenue_share": revenue_share, "cap_multiple": cap_multiple},
+        cash, cost, balance, np.zeros(len(amount)),
+    )
+
+
+# ----------------------------
+# Comparison
+# ----------------------------
+def summarise(schedules: Schedules, discount_rate: float) -> Dict[str, np.ndarray]:
+    """
+    Comparable metrics per combination.
+
+    effective_rate  annualised IRR of the cash schedule (0 when nothing is
+                    ever paid back, as for grants)
+    total_cost      everything paid beyond the money received
+    pv_cost         present value of everything paid less everything
+                    received, at the founder's annual `discount_rate`
+                    (negative when the instrument is a net gift)
+    peak_payment    largest single monthly outflow before the horizon
+    dilution        share of the company given up
+    """
+    cash = schedules.cash
+    monthly = (1 + discount_rate) ** (1 / 12) - 1
+    result = irr_batch(cash, guess=0.01)
+    repays = (cash < 0).any(axis=1)
+    effective = np.where(repays, (1 + result.rates) ** 12 - 1, 0.0)
+
+    return {
+        "effective_rate": effective,
+        "total_cost": schedules.cost.sum(axis=1),
+        "pv_cost": -np.atleast_1d(npv_surface(cash, monthly)),
+        "peak_payment": np.maximum(-cash[:, :-1], 0.0).max(axis=1, initial=0.0),
+        "dilution": schedules.dilution,
+    }
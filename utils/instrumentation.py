@@ -0,0 +1,287 @@
+"""
+Lightweight, process-wide instrumentation for the Streamlit pages.
+
+Records rerun latency histograms per page and per section (tab or
+fragment), cache hit/miss counts and how many sessions have been seen.
+Everything lives in one in-memory Registry shared by all sessions of the
+server process and can be exported as JSON or Prometheus text.
+
+If the DIAGNOSTICS_TEXTFILE environment variable names a file, the
+Prometheus text is also written there (at most every
+TEXTFILE_INTERVAL seconds), ready for node_exporter's textfile collector.
+"""
+import functools
+import hmac
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Latency bucket upper bounds, in seconds.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+# A session counts as active if it reran within this many seconds.
+ACTIVE_WINDOW = 300.0
+TEXTFILE_INTERVAL = 15.0
+
+WHOLE_PAGE = ""  # section name used for whole-page timings
+
+
+def _finite(value: float) -> Optional[float]:
+    return None if math.isinf(value) else value
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile."""
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= target and n:
+                return bound
+        return 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_seconds": self.total,
+            # None when the quantile falls in the +Inf bucket
+            **{f"p{q}": _finite(self.quantile(q / 100)) for q in (50, 95, 99)},
+            "buckets": {("+Inf" if math.isinf(b) else repr(b)): n for b, n in zip(BUCKETS, self.counts)},
+        }
+
+
+class Registry:
+    """Thread-safe store of every metric in the process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.cache_calls: Dict[str, int] = {}
+        self.cache_misses: Dict[str, int] = {}
+        self.sessions: Dict[str, float] = {}  # session id -> last seen
+        self._last_textfile = 0.0
+
+    def observe(self, page: str, section: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.latency.get((page, section))
+            if hist is None:
+                hist = self.latency[(page, section)] = Histogram()
+            hist.observe(seconds)
+        self._maybe_write_textfile()
+
+    def cache_call(self, name: str) -> None:
+        with self._lock:
+            self.cache_calls[name] = self.cache_calls.get(name, 0) + 1
+
+    def cache_miss(self, name: str) -> None:
+        with self._lock:
+            self.cache_misses[name] = self.cache_misses.get(name, 0) + 1
+
+    def seen_session(self, session_id: str) -> None:
+        with self._lock:
+            self.sessions[session_id] = time.time()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency.clear()
+            self.cache_calls.clear()
+            self.cache_misses.clear()
+            self.sessions.clear()
+            self.started = time.time()
+
+    # ----------------------------
+    # Exports
+    # ----------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            return {
+                "uptime_seconds": now - self.started,
+                "sessions": {
+                    "seen": len(self.sessions),
+                    "active": sum(1 for t in self.sessions.values() if now - t <= ACTIVE_WINDOW),
+                },
+                "latency": [
+                    {"page": page, "section": section or None, **hist.to_dict()}
+                    for (page, section), hist in sorted(self.latency.items())
+                ],
+                "cache": {
+                    name: {
+                        "hits": calls - self.cache_misses.get(name, 0),
+                        "misses": self.cache_misses.get(name, 0),
+                    }
+                    for name, calls in sorted(self.cache_calls.items())
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        data = self.to_dict()
+        lines: List[str] = [
+            "# HELP davoren_rerun_seconds Script and section rerun latency.",
+            "# TYPE davoren_rerun_seconds histogram",
+        ]
+        for entry in data["latency"]:
+            labels = f'page="{_escape(entry["page"])}",section="{_escape(entry["section"] or "")}"'
+            cumulative = 0
+            for bound, n in entry["buckets"].items():
+                cumulative += n
+                lines.append(f'davoren_rerun_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"davoren_rerun_seconds_sum{{{labels}}} {entry['sum_seconds']:.6f}")
+            lines.append(f"davoren_rerun_seconds_count{{{labels}}} {entry['count']}")
+
+        lines += ["# HELP davoren_cache_requests_total Cache lookups by result.", "# TYPE davoren_cache_requests_total counter"]
+        for name, counts in data["cache"].items():
+            for result in ("hits", "misses"):
+                lines.append(f'davoren_cache_requests_total{{cache="{_escape(name)}",result="{result[:-1]}"}} {counts[result]}')
+
+        lines += [
+            "# HELP davoren_sessions Sessions seen since start / active recently.",
+            "# TYPE davoren_sessions gauge",
+            f'davoren_sessions{{state="seen"}} {data["sessions"]["seen"]}',
+            f'davoren_sessions{{state="active"}} {data["sessions"]["active"]}',
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _maybe_write_textfile(self) -> None:
+        path = os.environ.get("DIAGNOSTICS_TEXTFILE")
+        if not path:
+            return
+        now = time.monotonic()
+        with self._lock:  # one session per interval claims the write
+            if now - self._last_textfile < TEXTFILE_INTERVAL:
+                return
+            self._last_textfile = now
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp, path)
+        except OSError:
+            pass  # metrics must never break a page
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+
+
+# ----------------------------
+# Helpers used by the pages
+# ----------------------------
+def _session_id() -> Optional[str]:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def diagnostics_allowed(token: str) -> bool:
+    """
+    Whether `token` (the ?token= query parameter) opens the diagnostics
+    page. Never when the DIAGNOSTICS_TOKEN environment variable is unset.
+    """
+    expected = os.environ.get("DIAGNOSTICS_TOKEN", "")
+    return bool(expected) and hmac.compare_digest(token.encode(), expected.encode())
+
+
+class PageTimer:
+    """
+    Times one script rerun: create it at the top of a page, call stop()
+    at the bottom. Reruns cut short by st.stop()/st.rerun() or an
+    exception are not recorded.
+    """
+
+    __slots__ = ("page", "start")
+
+    def __init__(self, page: str):
+        self.page = page
+        self.start = time.perf_counter()
+        session_id = _session_id()
+        if session_id:
+            REGISTRY.seen_session(session_id)
+
+    def stop(self) -> float:
+        seconds = time.perf_counter() - self.start
+        REGISTRY.observe(self.page, WHOLE_PAGE, seconds)
+        return seconds
+
+
+@contextmanager
+def timed(page: str, section: str) -> Iterator[None]:
+    """
+    Time a block as one run of a section of `page`.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe(page, section, time.perf_counter() - start)
+
+
+def timed_section(page: str, section: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator form of `timed`, for tab and fragment functions.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(page, section):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def counted_cache(cache: Callable, name: str) -> Callable[[Callable], Callable]:
+    """
+    Wrap a Streamlit cache decorator (st.cache_data / st.cache_resource)
+    so every lookup and every miss is counted under `name`:
+
+        @counted_cache(st.cache_resource, "catalogue")
+        def get_catalogue(): ...
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def on_miss(*args, **kwargs):
+            REGISTRY.cache_miss(name)
+            return fn(*args, **kwargs)
+
+        cached = cache(on_miss)
+
+        @functools.wraps(fn)
+        def lookup(*args, **kwargs):
+            REGISTRY.cache_call(name)
+            return cached(*args, **kwargs)
+
+        lookup.clear = cached.clear
+        return lookup
+    return decorator
@@ -0,0 +1,286 @@
+"""
+IRR / XIRR solver for single cash-flow series or whole batches.
+
+The NPV of a series is a generalised polynomial in x = 1 / (1 + r):
+
+    f(x) = sum(cf_t * x ** t),   x > 0  <=>  r > -1
+
+Working in x keeps every rate above -100% reachable (negative IRRs
+included) and makes the Newton steps well behaved. Each root is found by
+a safeguarded Newton iteration: a Newton step is taken when it stays
+inside the current sign-change bracket, otherwise the bracket is bisected,
+so convergence is quadratic near the root but never worse than bisection.
+Brackets are found automatically rather than fixed to a rate range.
+
+Series with more than one sign change (Descartes' rule of signs) can have
+several IRRs; those are scanned on a log grid and every root is reported.
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# x = 1 / (1 + r): X_MIN is a rate of ~+100,000%, X_MAX a rate of ~-99.9999%.
+X_MIN = 1e-3
+X_MAX = 1e6
+SCAN_POINTS = 400
+DAYS_PER_YEAR = 365.0
+
+
+@dataclass(frozen=True)
+class IRRResult:
+    """Outcome of solving one series."""
+
+    rate: Optional[float]
+    iterations: int
+    converged: bool
+    roots: Tuple[float, ...] = ()
+
+    @property
+    def multiple(self) -> bool:
+        return len(self.roots) > 1
+
+
+@dataclass(frozen=True)
+class IRRBatchResult:
+    """Outcome of solving a batch; arrays are aligned with the input rows."""
+
+    rates: np.ndarray        # NaN where no IRR exists
+    iterations: np.ndarray
+    converged: np.ndarray
+    root_counts: np.ndarray  # number of IRRs found per series
+
+    @property
+    def multiple(self) -> np.ndarray:
+        return self.root_counts > 1
+
+
+# ----------------------------
+# Internals
+# ----------------------------
+def _as_periods(n_periods: int, periods: Optional[Sequence[float]]) -> np.ndarray:
+    if periods is None:
+        return np.arange(n_periods, dtype=float)
+    t = np.asarray(periods, dtype=float)
+    if t.shape != (n_periods,):
+        raise ValueError("periods must have one entry per cash-flow column")
+    return t
+
+
+def _f_df(cf: np.ndarray, t: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """f(x) and f'(x) row-wise for cf (n, T) at x (n,)."""
+    powers = np.power(x[:, None], t[None, :])
+    weighted = cf * powers
+    f = weighted.sum(axis=1)
+    df = (weighted * t[None, :]).sum(axis=1) / x
+    return f, df
+
+
+def _sign_changes(cf: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Descartes' bound on the number of IRRs for each row."""
+    order = np.argsort(t, kind="stable")
+    signs = np.sign(cf[:, order])
+    # Carry the last non-zero sign forward so zero flows are skipped.
+    last = np.where(signs != 0, np.arange(signs.shape[1]), 0)
+    np.maximum.accumulate(last, axis=1, out=last)
+    filled = np.take_along_axis(signs, last, axis=1)
+    return np.count_nonzero(filled[:, 1:] * filled[:, :-1] < 0, axis=1)
+
+
+def _refine(
+    cf: np.ndarray,
+    t: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    x0: np.ndarray,
+    tol: float,
+    max_iter: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Safeguarded Newton on brackets [lo, hi] (f changes sign across each).
+    Returns x, iteration counts and convergence flags, all per row.
+    """
+    f_lo, _ = _f_df(cf, t, lo)
+    x = np.clip(x0, lo, hi)
+    iterations = np.zeros(len(x), dtype=int)
+    done = np.zeros(len(x), dtype=bool)
+
+    for _ in range(max_iter):
+        active = ~done
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        xa, la, ha = x[idx], lo[idx], hi[idx]
+        f, df = _f_df(cf[idx], t, xa)
+        iterations[idx] += 1
+
+        # Shrink the bracket around the current point.
+        same = np.sign(f) == np.sign(f_lo[idx])
+        la = np.where(same, xa, la)
+        ha = np.where(same, ha, xa)
+        f_lo[idx] = np.where(same, f, f_lo[idx])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(df != 0, f / df, np.inf)
+        x_new = xa - step
+        finished = (f == 0) | (np.abs(step) <= tol * np.maximum(1.0, xa))
+        outside = ~np.isfinite(x_new) | (x_new < la) | (x_new > ha)
+        x_new = np.where(finished, np.where(f == 0, xa, x_new),
+                         np.where(outside, 0.5 * (la + ha), x_new))
+        # A collapsed bracket pins the root even if Newton has stalled.
+        finished |= (ha - la) <= tol * np.maximum(1.0, xa)
+        x[idx], lo[idx], hi[idx] = x_new, la, ha
+        done[idx] = finished
+
+    return x, iterations, done
+
+
+def _x_to_rate(x: np.ndarray) -> np.ndarray:
+    return 1.0 / x - 1.0
+
+
+def _scan_roots(cf_row: np.ndarray, t: np.ndarray, tol: float, max_iter: int) -> Tuple[np.ndarray, int, bool]:
+    """All roots of one row found on a log grid in x, refined in parallel."""
+    grid = np.geomspace(X_MIN, X_MAX, SCAN_POINTS)
+    values = np.power(grid[:, None], t[None, :]) @ cf_row
+    sign = np.sign(values)
+    cells = np.flatnonzero(sign[:-1] * sign[1:] < 0)
+    exact = grid[sign == 0]
+    if len(cells) == 0:
+        roots = np.sort(_x_to_rate(exact))
+        return roots, 0, True
+
+    lo, hi = grid[cells].copy(), grid[cells + 1].copy()
+    rows = np.repeat(cf_row[None, :], len(cells), axis=0)
+    x, iterations, converged = _refine(rows, t, lo, hi, 0.5 * (lo + hi), tol, max_iter)
+    roots = np.sort(np.concatenate([_x_to_rate(x), _x_to_rate(exact)]))
+    return roots, int(iterations.max()), bool(converged.all())
+
+
+def _pick(roots: np.ndarray, guess: float) -> float:
+    return float(roots[np.argmin(np.abs(roots - guess))])
+
+
+# ----------------------------
+# Public API
+# ----------------------------
+def irr_batch(
+    cash_flows,
+    periods: Optional[Sequence[float]] = None,
+    guess: float = 0.1,
+    tol: float = 1e-12,
+    max_iter: int = 100,
+) -> IRRBatchResult:
+    """
+    IRR of every row of a (n_series, n_periods) matrix.
+
+    Rows with a single sign change are solved together in one vectorised
+    pass; rows that may have several IRRs are scanned individually and
+    report the root closest to `guess`.
+    """
+    cf = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n, n_periods = cf.shape
+    t = _as_periods(n_periods, periods)
+
+    rates = np.full(n, np.nan)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    root_counts = np.zeros(n, dtype=int)
+
+    changes = _sign_changes(cf, t)
+    simple = np.flatnonzero(changes == 1)
+    complex_rows = np.flatnonzero(changes > 1)
+    converged[changes == 0] = True  # no sign change: no IRR, nothing to solve
+
+    if len(simple):
+        rows = cf[simple]
+        # Walk the upper end of the bracket outward until f changes sign.
+        lo = np.full(len(simple), X_MIN)
+        hi = np.ones(len(simple))
+        f_lo, _ = _f_df(rows, t, lo)
+        f_hi, _ = _f_df(rows, t, hi)
+        while True:
+            need = (np.sign(f_lo) == np.sign(f_hi)) & (hi < X_MAX)
+            if not need.any():
+                break
+            hi[need] *= 4.0
+            f_hi[need], _ = _f_df(rows[need], t, hi[need])
+        bracketed = np.sign(f_lo) * np.sign(f_hi) < 0
+
+        if bracketed.any():
+            b = np.flatnonzero(bracketed)
+            x0 = np.full(len(b), 1.0 / (1.0 + guess))
+            x, its, ok = _refine(rows[b], t, lo[b], hi[b], x0, tol, max_iter)
+            target = simple[b]
+            rates[target] = _x_to_rate(x)
+            iterations[target] = its
+            converged[target] = ok
+            root_counts[target] = 1
+        exact = f_hi == 0
+        if exact.any():
+            target = simple[exact]
+            rates[target] = _x_to_rate(hi[exact])
+            converged[target] = True
+            root_counts[target] = 1
+
+    for i in complex_rows:
+        roots, its, ok = _scan_roots(cf[i], t, tol, max_iter)
+        iterations[i] = its
+        converged[i] = ok
+        root_counts[i] = len(roots)
+        if len(roots):
+            rates[i] = _pick(roots, guess)
+
+    return IRRBatchResult(rates, iterations, converged, root_counts)
+
+
+def irr(
+    cash_flows: Sequence[float],
+    periods: Optional[Sequence[float]] = None,
+    guess: float = 0.1,
+    tol: float = 1e-12,
+    max_iter: int = 100,
+) -> IRRResult:
+    """
+    IRR of a single series, with every root reported when there are several.
+    """
+    cf = np.asarray(cash_flows, dtype=float)
+    t = _as_periods(len(cf), periods)
+
+    if _sign_changes(cf[None, :], t)[0] > 1:
+        roots, its, ok = _scan_roots(cf, t, tol, max_iter)
+        rate = _pick(roots, guess) if len(roots) else None
+        return IRRResult(rate, its, ok, tuple(float(r) for r in roots))
+
+    res = irr_batch(cf[None, :], periods=t, guess=guess, tol=tol, max_iter=max_iter)
+    rate = res.rates[0]
+    if np.isnan(rate):
+        return IRRResult(None, int(res.iterations[0]), bool(res.converged[0]))
+    return IRRResult(float(rate), int(res.iterations[0]), bool(res.converged[0]), (float(rate),))
+
+
+def year_fractions(dates) -> np.ndarray:
+    """Years elapsed since the first date, on an actual/365 basis."""
+    d = np.asarray(dates, dtype="datetime64[D]")
+    return (d - d[0]).astype(float) / DAYS_PER_YEAR
+
+
+def xnpv(rate: float, cash_flows: Sequence[float], dates) -> float:
+    """
+    NPV of cash flows on actual dates, discounted to the first date.
+    """
+    cf = np.asarray(cash_flows, dtype=float)
+    return float(np.sum(cf * np.power(1.0 + rate, -year_fractions(dates))))
+
+
+def xirr(
+    cash_flows: Sequence[float],
+    dates,
+    guess: float = 0.1,
+    tol: float = 1e-12,
+    max_iter: int = 100,
+) -> IRRResult:
+    """
+    IRR of cash flows on actual dates (the XIRR convention).
+    """
+    return irr(cash_flows, periods=year_fractions(dates), guess=guess, tol=tol, max_iter=max_iter)
@@ -0,0 +1,315 @@
+"""
+Chunked TAM / SAM / SOM sizing over large local market datasets.
+
+Datasets (firm registries, household counts, energy use by region, ...)
+can be CSV or Parquet files of several GB, so nothing here ever loads a
+whole file. The first time a CSV is queried it is streamed once into a
+columnar Parquet snapshot under data/.cache/, named after a hash of the
+file's resolved path and keyed by its modification time and size; every
+later query on the same file reads only the columns it needs from that
+snapshot, batch by batch. Parquet inputs are read directly.
+
+A market size is a sum of `value` over rows:
+
+    value = rows[measure] * unit_value       (or unit_value per row)
+    TAM   = sum over every row
+    SAM   = sum over rows matching the segment filters
+    SOM   = SAM * obtainable share
+
+optionally broken down by one or more group columns. Aggregates are
+combined chunk by chunk, so memory is bounded by the batch size plus the
+number of groups.
+"""
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.catalogue import CACHE_DIR, DATA_DIR
+
+MARKET_DIR = DATA_DIR / "market"
+DEFAULT_CHUNK_SIZE = 250_000
+MAX_DISTINCT = 200  # distinct values kept per text column for filter pickers
+
+OPERATORS = ("in", "not in", "==", "!=", ">=", "<=", ">", "<")
+
+# (column, operator, value); value is a tuple for "in" / "not in".
+Filter = Tuple[str, str, Any]
+
+
+@dataclass(frozen=True)
+class ColumnStats:
+    """What a filter picker needs to know about one column."""
+
+    name: str
+    numeric: bool
+    minimum: Optional[float]
+    maximum: Optional[float]
+    values: Tuple[str, ...]  # distinct values of text columns, up to MAX_DISTINCT
+    truncated: bool
+
+
+@dataclass(frozen=True)
+class MarketSize:
+    tam: float
+    sam: float
+    som: float
+    rows: int          # rows scanned
+    matched: int       # rows in the segment
+    groups: Optional[pd.DataFrame]  # TAM / SAM / SOM per group, largest SAM first
+
+
+# ----------------------------
+# Columnar snapshot
+# ----------------------------
+def _is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in (".parquet", ".pq")
+
+
+def _snapshot_prefix(path: Path) -> str:
+    """File-name prefix shared by every snapshot of `path`, and only of `path`."""
+    source = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:12]
+    return f"{path.stem}-{source}."
+
+
+def snapshot_path(path: Path, cache_dir: Path = CACHE_DIR) -> Path:
+    """Where the Parquet snapshot of `path` lives for its current version."""
+    stat = path.stat()
+    version = hashlib.sha256(f"{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()[:16]
+    return cache_dir / f"{_snapshot_prefix(path)}{version}.parquet"
+
+
+def columnar(path: Path, cache_dir: Path = CACHE_DIR, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Path:
+    """
+    A Parquet file with the contents of `path`: the file itself for
+    Parquet inputs, otherwise a snapshot built by streaming the CSV once.
+    Snapshots of older versions of the same file are removed.
+    """
+    path = Path(path)
+    if _is_parquet(path):
+        return path
+    target = snapshot_path(path, cache_dir)
+    if target.exists():
+        return target
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    writer = None
+    schema = None
+    try:
+        for chunk in pd.read_csv(path, chunksize=chunk_size):
+            if schema is None:
+                # Integers become floats so later chunks with gaps still fit.
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                schema = pa.schema([
+                    f.with_type(pa.float64()) if pa.types.is_integer(f.type)
+                    else f.with_type(pa.string()) if pa.types.is_null(f.type) else f
+                    for f in schema
+                ])
+                writer = pq.ParquetWriter(tmp, schema)
+            try:
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+                raise ValueError(f"{path.name}: a column changes type part-way through the file ({exc})") from exc
+            writer.write_table(table)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    if writer is None:
+        raise ValueError(f"{path.name} has no rows")
+    writer.close()
+    os.replace(tmp, target)
+
+    prefix = _snapshot_prefix(path)
+    for old in cache_dir.glob("*.parquet"):
+        if old.name.startswith(prefix) and old != target:
+            old.unlink(missing_ok=True)
+    return target
+
+
+def iter_batches(path: Path, columns: Sequence[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Record batches of only `columns`, at most `chunk_size` rows each."""
+    import pyarrow.parquet as pq
+
+    yield from pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=list(columns))
+
+
+def _text(column) -> Any:
+    """A column as strings, the form text filters and pickers compare on."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    return column if pa.types.is_string(column.type) else pc.cast(column, pa.string())
+
+
+def column_stats(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, ColumnStats]:
+    """
+    Range of every numeric column and the distinct values of every other
+    column (as text), in one chunked pass over a columnar file.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    numeric = {f.name for f in schema if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)}
+    lo: Dict[str, float] = {}
+    hi: Dict[str, float] = {}
+    seen: Dict[str, set] = {f.name: set() for f in schema if f.name not in numeric}
+    truncated = set()
+
+    for batch in iter_batches(path, schema.names, chunk_size):
+        for name in numeric:
+            bounds = pc.min_max(batch.column(name)).as_py()
+            if bounds["min"] is not None:
+                lo[name] = min(lo.get(name, np.inf), bounds["min"])
+                hi[name] = max(hi.get(name, -np.inf), bounds["max"])
+        for name, values in seen.items():
+            if name in truncated:
+                continue
+            values.update(v for v in pc.unique(_text(batch.column(name))).to_pylist() if v is not None)
+            if len(values) > MAX_DISTINCT:
+                truncated.add(name)
+
+    return {
+        name: ColumnStats(
+            name,
+            name in numeric,
+            lo.get(name),
+            hi.get(name),
+            tuple(sorted(seen.get(name, ()))[:MAX_DISTINCT]),
+            name in truncated,
+        )
+        for name in schema.names
+    }
+
+
+# ----------------------------
+# Sizing
+# ----------------------------
+def _mask(batch, filters: Sequence[Filter]) -> np.ndarray:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    compare = {"==": pc.equal, "!=": pc.not_equal, ">=": pc.greater_equal,
+               "<=": pc.less_equal, ">": pc.greater, "<": pc.less}
+    mask = np.ones(batch.num_rows, dtype=bool)
+    for column, op, value in filters:
+        col = batch.column(column)
+        if op in ("in", "not in"):
+            hit = pc.is_in(_text(col), value_set=pa.array([str(v) for v in value], pa.string()))
+            if op == "not in":
+                hit = pc.invert(hit)
+        elif op in compare:
+            hit = compare[op](col, pa.scalar(value, col.type) if not isinstance(value, str) else value)
+        else:
+            raise ValueError(f"Unknown operator {op!r}; expected one of {OPERATORS}")
+        # Missing values never match a filter.
+        mask &= pc.fill_null(hit, False).to_numpy(zero_copy_only=False)
+    return mask
+
+
+def market_size(
+    path: Path,
+    measure: Optional[str] = None,
+    unit_value: float = 1.0,
+    filters: Sequence[Filter] = (),
+    share: float = 0.05,
+    group_by: Sequence[str] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache_dir: Path = CACHE_DIR,
+) -> MarketSize:
+    """
+    TAM / SAM / SOM of `path`, scanning it in chunks. Without a `measure`
+    every row counts as `unit_value` (e.g. one firm at an average deal
+    size); missing measure values count as zero.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    source = columnar(Path(path), cache_dir, chunk_size)
+    group_by = list(group_by)
+    columns = list(dict.fromkeys(group_by + [c for c, _, _ in filters] + ([measure] if measure else [])))
+    if not columns:
+        columns = pq.read_schema(source).names[:1]  # something to count rows with
+
+    tam = sam = 0.0
+    rows = matched = 0
+    groups: Optional[pd.DataFrame] = None
+    for batch in iter_batches(source, columns, chunk_size):
+        if measure:
+            value = pc.fill_null(pc.cast(batch.column(measure), pa.float64()), 0.0).to_numpy() * unit_value
+        else:
+            value = np.full(batch.num_rows, float(unit_value))
+        mask = _mask(batch, filters)
+        in_segment = np.where(mask, value, 0.0)
+        tam += float(value.sum())
+        sam += float(in_segment.sum())
+        rows += batch.num_rows
+        matched += int(mask.sum())
+
+        if group_by:
+            part = (
+                pa.table({**{g: batch.column(g) for g in group_by}, "tam": value, "sam": in_segment})
+                .group_by(group_by)
+                .aggregate([("tam", "sum"), ("sam", "sum")])
+                .to_pandas()
+                .rename(columns={"tam_sum": "tam", "sam_sum": "sam"})
+                .set_index(group_by)
+            )
+            groups = part if groups is None else groups.add(part, fill_value=0.0)
+
+    if groups is not None:
+        groups["som"] = groups["sam"] * share
+        groups = groups.sort_values("sam", ascending=False).reset_index()
+
+    return MarketSize(tam, sam, sam * share, rows, matched, groups)
+
+
+# ----------------------------
+# Sample data
+# ----------------------------
+def write_sample_dataset(path: Path, rows: int = 500_000, seed: int = 0) -> Path:
+    """
+    A synthetic household dataset to practise on: one row per area with
+    province, settlement type, income band, households and monthly
+    electricity use.
+    """
+    rng = np.random.default_rng(seed)
+    provinces = np.array(["Gauteng", "Western Cape", "KwaZulu-Natal", "Eastern Cape", "Limpopo",
+                          "Mpumalanga", "North West", "Free State", "Northern Cape"])
+    settlement = np.array(["Metro", "Town", "Rural"])
+    income = np.array(["Low", "Lower-middle", "Upper-middle", "High"])
+    households = rng.lognormal(5.5, 0.8, rows).round()
+    df = pd.DataFrame({
+        "area_id": np.arange(rows),
+        "province": provinces[rng.choice(len(provinces), rows, p=[.26, .12, .19, .11, .1, .08, .07, .05, .02])],
+        "settlement": settlement[rng.choice(3, rows, p=[.45, .3, .25])],
+        "income_band": income[rng.choice(4, rows, p=[.4, .3, .2, .1])],
+        "households": households,
+        "monthly_kwh": (households * rng.normal(350, 90, rows).clip(50)).round(),
+        "grid_connected": rng.random(rows) < 0.85,
+    })
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if _is_parquet(path):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def list_datasets(directory: Path = MARKET_DIR) -> List[Path]:
+    if not directory.exists():
+        return []
+    return sorted(p for p in directory.iterdir() if p.suffix.lower() in (".csv", ".parquet", ".pq"))
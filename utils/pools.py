@@ -0,0 +1,27 @@
+"""
+The process pool shared by every page and session of a server.
+
+Pages hand CPU-heavy batches (cohort reports, stage-gate simulations) to
+this one pool rather than each starting their own, so a server never runs
+more worker processes than it has CPUs. Workers are spawned, not forked:
+forking a threaded server can deadlock the child.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+WORKERS = os.cpu_count() or 1
+
+_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def process_pool() -> ProcessPoolExecutor:
+    """The server's pool, started on first use."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
@@ -0,0 +1,542 @@
+"""
+Persistent prior-art index over a local patent / abstract corpus.
+
+Documents are stored as a sparse TF-IDF matrix kept column-wise (one
+postings list of (document, weight) per term, in flat NumPy arrays), with
+SMART lnc.ltc weighting: documents carry log-tf weights normalised to
+unit length and no idf, the query carries log-tf x idf. Because idf lives
+only on the query side, documents never need re-weighting when the corpus
+grows, so new documents are added as a new immutable *segment* instead of
+rebuilding the index. Queries score every segment with one bincount per
+segment and merge the top k; compact() merges segments when many small
+additions have piled up.
+
+Each segment is a directory of .npy files opened memory-mapped, so a
+corpus of hundreds of thousands of abstracts opens instantly and only the
+postings a query touches are paged in. Optional MinHash signatures with
+LSH banding find near-duplicate texts (re-filings, copied abstracts).
+
+Corpus files can be CSV (id, title, abstract columns), JSON Lines (same
+keys) or plain .txt files (one document each, id = file name).
+"""
+import json
+import math
+import os
+import shutil
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from utils.catalogue import DATA_DIR
+from utils.search import tokenize
+
+# PRIOR_ART_DIR points the collection, and an index beside it, somewhere
+# else (the load test uses a synthetic one).
+if os.environ.get("PRIOR_ART_DIR"):
+    CORPUS_DIR = Path(os.environ["PRIOR_ART_DIR"])
+    INDEX_DIR = CORPUS_DIR.with_name(CORPUS_DIR.name + ".index")
+else:
+    CORPUS_DIR = DATA_DIR / "prior_art"
+    INDEX_DIR = DATA_DIR / ".cache" / "prior_art_index"
+
+_FORMAT_VERSION = 1
+SNIPPET_CHARS = 400
+TEXT_FIELDS = ("abstract", "text", "description", "claims")
+
+STOPWORDS = frozenset("""
+a an and are as at be been by can for from has have in into is it its may of on or such that the
+their then there these this to was were which with within wherein whereby thereof said least one
+further comprising comprises comprise including includes include provided providing
+invention present embodiment embodiments disclosed method methods system systems apparatus device
+""".split())
+
+# MinHash: NUM_PERM hash functions, split into BANDS bands for LSH.
+NUM_PERM = 64
+BANDS = 16
+SHINGLE = 3
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_rng = np.random.default_rng(20240607)
+_HASH_A = _rng.integers(1, 2**32, NUM_PERM, dtype=np.uint64)
+_HASH_B = _rng.integers(0, 2**32, NUM_PERM, dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 2**63, NUM_PERM // BANDS, dtype=np.uint64) | np.uint64(1)
+_SHINGLE_MIX = _rng.integers(1, 2**63, SHINGLE, dtype=np.uint64) | np.uint64(1)
+_MINHASH_BLOCK = 100_000  # shingles hashed per pass: NUM_PERM x block uint64 in memory
+
+
+@dataclass(frozen=True)
+class Document:
+    id: str
+    title: str
+    text: str
+
+
+@dataclass(frozen=True)
+class Hit:
+    id: str
+    title: str
+    snippet: str
+    score: float  # cosine similarity for search(), estimated Jaccard for near_duplicates()
+
+
+def terms(text: str) -> List[str]:
+    return [t for t in tokenize(text) if t not in STOPWORDS and len(t) > 1]
+
+
+# ----------------------------
+# Reading corpus files
+# ----------------------------
+def _document(record: Dict, fallback_id: str) -> Optional[Document]:
+    text = next((str(record[f]) for f in TEXT_FIELDS if record.get(f) not in (None, "")), "")
+    title = str(record.get("title") or "")
+    if not text and not title:
+        return None
+    return Document(str(record.get("id") or fallback_id), title, text)
+
+
+def read_corpus(path: Path, chunk_size: int = 50_000) -> Iterator[Document]:
+    """Stream the documents in one corpus file."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        import pandas as pd
+
+        for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+            for i, record in zip(chunk.index, chunk.to_dict("records")):
+                doc = _document(record, f"{path.stem}:{i}")
+                if doc:
+                    yield doc
+    elif suffix in (".jsonl", ".ndjson"):
+        with open(path, "r", encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                if line.strip():
+                    doc = _document({k.lower(): v for k, v in json.loads(line).items()}, f"{path.stem}:{i}")
+                    if doc:
+                        yield doc
+    elif suffix == ".txt":
+        text = path.read_text(encoding="utf-8", errors="replace")
+        title, _, body = text.strip().partition("\n")
+        yield Document(path.stem, title.strip(), body.strip() or title.strip())
+    else:
+        raise ValueError(f"Unsupported corpus file {path.name}; use .csv, .jsonl or .txt")
+
+
+def corpus_files(directory: Path = CORPUS_DIR) -> List[Path]:
+    if not directory.exists():
+        return []
+    return sorted(p for p in directory.rglob("*") if p.suffix.lower() in (".csv", ".jsonl", ".ndjson", ".txt"))
+
+
+# ----------------------------
+# MinHash
+# ----------------------------
+def minhash_many(texts: Iterable[str]) -> np.ndarray:
+    """
+    MinHash signatures, (n, NUM_PERM) uint32, of the word shingles of each
+    text. Shingles of every text are hashed together in large NumPy blocks.
+    """
+    codes: List[int] = []
+    lengths: List[int] = []
+    seen: Dict[str, int] = {}
+    for text in texts:
+        words = tokenize(text)
+        if 0 < len(words) < SHINGLE:
+            words += [""] * (SHINGLE - len(words))
+        lengths.append(len(words))
+        for w in words:
+            code = seen.get(w)
+            if code is None:
+                code = seen[w] = zlib.crc32(w.encode())
+            codes.append(code)
+
+    n = len(lengths)
+    out = np.full((n, NUM_PERM), np.iinfo(np.uint32).max, dtype=np.uint32)
+    c = np.array(codes, dtype=np.uint64)
+    owner = np.repeat(np.arange(n), lengths)
+    ends = np.cumsum(lengths)
+    start = np.flatnonzero(np.arange(len(c)) + SHINGLE <= ends[owner]) if n else np.zeros(0, dtype=np.int64)
+    x = sum(c[start + j] * _SHINGLE_MIX[j] for j in range(SHINGLE)) if len(start) else np.zeros(0, np.uint64)
+    x = (x >> np.uint64(32)) ^ (x & np.uint64(0xFFFFFFFF))
+    owner = owner[start]
+
+    for lo in range(0, len(x), _MINHASH_BLOCK):
+        block, o = x[lo:lo + _MINHASH_BLOCK], owner[lo:lo + _MINHASH_BLOCK]
+        hashed = (_HASH_A[:, None] * block[None, :] + _HASH_B[:, None]) % _PRIME
+        first = np.flatnonzero(np.r_[True, o[1:] != o[:-1]])
+        rows = o[first]
+        out[rows] = np.minimum(out[rows], np.minimum.reduceat(hashed, first, axis=1).T.astype(np.uint32))
+    return out
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32) of the word shingles of `text`."""
+    return minhash_many([text])[0]
+
+
+def lsh_bands(signatures: np.ndarray) -> np.ndarray:
+    """One uint64 bucket key per band per signature: (n, BANDS)."""
+    rows = NUM_PERM // BANDS
+    sig = np.asarray(signatures, dtype=np.uint64).reshape(-1, BANDS, rows)
+    return (sig * _BAND_MIX).sum(axis=2, dtype=np.uint64)
+
+
+# ----------------------------
+# Segments
+# ----------------------------
+class Segment:
+    """One immutable, memory-mapped slice of the index."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        load = lambda name: np.load(path / f"{name}.npy", mmap_mode="r")  # noqa: E731
+        self.terms = load("terms")
+        self.offsets = load("offsets")
+        self.postings = load("postings")
+        self.weights = load("weights")
+        self.ids = load("ids")
+        self.doc_offsets = load("doc_offsets")
+        self.signatures = load("minhash") if (path / "minhash.npy").exists() else None
+        self.bands = load("bands") if (path / "bands.npy").exists() else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def postings_for(self, term: str) -> Optional[slice]:
+        i = int(np.searchsorted(self.terms, term))
+        if i < len(self.terms) and self.terms[i] == term:
+            return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+        return None
+
+    def document(self, local: int) -> Dict[str, str]:
+        start, end = int(self.doc_offsets[local]), int(self.doc_offsets[local + 1])
+        with open(self.path / "docs.jsonl", "rb") as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+    @staticmethod
+    def write(path: Path, docs: Sequence[Document], with_minhash: bool) -> None:
+        """Build a segment for `docs` in `path` (which must not exist yet)."""
+        term_ids: Dict[str, int] = {}
+        tokens: List[int] = []
+        lengths: List[int] = []
+        for doc in docs:
+            found = terms(f"{doc.title} {doc.text}")
+            tokens.extend(term_ids.setdefault(t, len(term_ids)) for t in found)
+            lengths.append(len(found))
+
+        # Renumber terms alphabetically, then count (term, doc) pairs; the
+        # pair keys sort term-major, which is postings order.
+        vocab = sorted(term_ids)
+        remap = np.empty(len(vocab), dtype=np.int64)
+        remap[[term_ids[t] for t in vocab]] = np.arange(len(vocab))
+        n = len(docs)
+        owner = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        pairs, tf = np.unique(remap[np.array(tokens, dtype=np.int64)] * n + owner, return_counts=True)
+        term, local = np.divmod(pairs, n)
+        w = 1 + np.log(tf)
+        w /= np.sqrt(np.bincount(local, w * w, minlength=n))[local]
+
+        lines = [
+            json.dumps({"id": d.id, "title": d.title, "snippet": d.text[:SNIPPET_CHARS]}).encode() + b"\n"
+            for d in docs
+        ]
+        signatures = minhash_many(f"{d.title} {d.text}" for d in docs) if with_minhash else None
+        _save(
+            path,
+            np.array(vocab, dtype=str),
+            np.bincount(term, minlength=len(vocab)),
+            local.astype(np.int32),
+            w.astype(np.float32),
+            np.array([d.id for d in docs], dtype=str),
+            [lines],
+            signatures,
+        )
+
+    @staticmethod
+    def merge(path: Path, segments: Sequence["Segment"], with_minhash: bool) -> None:
+        """
+        Write the union of `segments` as one segment. Document weights do
+        not depend on the rest of the corpus, so postings are concatenated
+        as they are, without re-reading any text.
+        """
+        vocab = np.unique(np.concatenate([np.asarray(s.terms) for s in segments]))
+        term_ids, docs, weights = [], [], []
+        base = 0
+        for seg in segments:
+            lengths = np.diff(np.asarray(seg.offsets))
+            term_ids.append(np.repeat(np.searchsorted(vocab, seg.terms), lengths))
+            docs.append(np.asarray(seg.postings) + base)
+            weights.append(np.asarray(seg.weights))
+            base += len(seg)
+        term_ids = np.concatenate(term_ids)
+        # Stable: documents stay ascending within each term.
+        order = np.argsort(term_ids, kind="stable")
+        blobs, doc_offsets, start = [], [np.zeros(1, dtype=np.int64)], 0
+        for seg in segments:
+            with open(seg.path / "docs.jsonl", "rb") as f:
+                blobs.append([f.read()])
+            doc_offsets.append(np.asarray(seg.doc_offsets[1:]) + start)
+            start += len(blobs[-1][0])
+        _save(
+            path,
+            vocab,
+            np.bincount(term_ids, minlength=len(vocab)),
+            np.concatenate(docs)[order].astype(np.int32),
+            np.concatenate(weights)[order],
+            np.concatenate([np.asarray(s.ids) for s in segments]),
+            blobs,
+            np.concatenate([np.asarray(s.signatures) for s in segments]) if with_minhash else None,
+            doc_offsets=np.concatenate(doc_offsets),
+        )
+
+
+def _save(
+    path: Path,
+    vocab: np.ndarray,
+    lengths: np.ndarray,
+    postings: np.ndarray,
+    weights: np.ndarray,
+    ids: np.ndarray,
+    doc_blobs: Sequence[Sequence[bytes]],
+    signatures: Optional[np.ndarray],
+    doc_offsets: Optional[np.ndarray] = None,
+) -> None:
+    """Write segment arrays to a temporary directory, then move it into place."""
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    np.save(tmp / "terms.npy", vocab if len(vocab) else np.array([], dtype="<U1"))
+    np.save(tmp / "offsets.npy", offsets)
+    np.save(tmp / "postings.npy", postings)
+    np.save(tmp / "weights.npy", weights)
+    np.save(tmp / "ids.npy", ids)
+
+    sizes = []
+    with open(tmp / "docs.jsonl", "wb") as f:
+        for blob in (b for group in doc_blobs for b in group):
+            f.write(blob)
+            sizes.append(len(blob))
+    if doc_offsets is None:
+        doc_offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=doc_offsets[1:])
+    np.save(tmp / "doc_offsets.npy", np.asarray(doc_offsets, dtype=np.int64))
+
+    if signatures is not None:
+        np.save(tmp / "minhash.npy", signatures)
+        np.save(tmp / "bands.npy", lsh_bands(signatures))
+    os.replace(tmp, path)
+
+
+# ----------------------------
+# Index
+# ----------------------------
+class PriorArtIndex:
+    """
+    A directory of segments plus meta.json listing them. Opening is cheap;
+    add() writes one new segment per call.
+    """
+
+    def __init__(self, path: Path = INDEX_DIR, minhash: bool = True):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            if meta.get("version") != _FORMAT_VERSION:
+                raise ValueError(f"{self.path} was written by an incompatible version; rebuild it")
+        else:
+            meta = {"version": _FORMAT_VERSION, "minhash": minhash, "next_segment": 1, "segments": [], "sources": {}}
+        self.meta = meta
+        self.segments = [Segment(self.path / name) for name in meta["segments"]]
+        self._ids: Optional[set] = None
+        # Segments replaced by compact() are deleted once no query still reads them.
+        self._readers = 0
+        self._stale: List[Path] = []
+
+    # -- state ------------------------------------------------------
+    def __len__(self) -> int:
+        return sum(len(s) for s in self.segments)
+
+    @property
+    def has_minhash(self) -> bool:
+        return bool(self.meta["minhash"])
+
+    def _known_ids(self) -> set:
+        if self._ids is None:
+            self._ids = {str(i) for s in self.segments for i in s.ids}
+        return self._ids
+
+    @contextmanager
+    def _reading(self) -> Iterator[List[Segment]]:
+        """The current segments, kept on disk until the caller is done with them."""
+        with self._lock:
+            self._readers += 1
+            segments = self.segments
+        try:
+            yield segments
+        finally:
+            with self._lock:
+                self._readers -= 1
+                self._remove_stale()
+
+    def _remove_stale(self) -> None:
+        """Delete replaced segments if no query is reading; the lock must be held."""
+        if self._readers == 0:
+            for path in self._stale:
+                shutil.rmtree(path, ignore_errors=True)
+            self._stale.clear()
+
+    def _save_meta(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / f"meta.json.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_text(json.dumps(self.meta, indent=2))
+        os.replace(tmp, self.path / "meta.json")
+
+    # -- writing ----------------------------------------------------
+    def add(self, docs: Iterable[Document]) -> int:
+        """
+        Index the documents whose ids are not in the index yet, as one new
+        segment. Returns how many were added.
+        """
+        with self._lock:
+            known = self._known_ids()
+            fresh: Dict[str, Document] = {}
+            for doc in docs:
+                if doc.id not in known and doc.id not in fresh:
+                    fresh[doc.id] = doc
+            if not fresh:
+                return 0
+            name = f"seg-{self.meta['next_segment']:06d}"
+            self.path.mkdir(parents=True, exist_ok=True)
+            Segment.write(self.path / name, list(fresh.values()), self.has_minhash)
+            self.meta["next_segment"] += 1
+            self.meta["segments"].append(name)
+            self._save_meta()
+            self.segments.append(Segment(self.path / name))
+            known.update(fresh)
+            return len(fresh)
+
+    def add_files(self, files: Iterable[Path], batch_size: int = 100_000) -> int:
+        """
+        Index the documents of new or changed corpus files, in segments of
+        at most `batch_size` documents. Unchanged files are skipped, and so
+        is every document whose id is already indexed: editing a file adds
+        its new documents but does not re-index the ones it already had.
+        """
+        added = 0
+        for path in files:
+            stat = path.stat()
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            if self.meta["sources"].get(str(path)) == stamp:
+                continue
+            batch: List[Document] = []
+            for doc in read_corpus(path):
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    added += self.add(batch)
+                    batch = []
+            added += self.add(batch)
+            with self._lock:
+                self.meta["sources"][str(path)] = stamp
+                self._save_meta()
+        return added
+
+    def compact(self) -> None:
+        """Merge every segment into one."""
+        with self._lock:
+            if len(self.segments) < 2:
+                return
+            name = f"seg-{self.meta['next_segment']:06d}"
+            Segment.merge(self.path / name, self.segments, self.has_minhash)
+            old = self.meta["segments"]
+            self.meta["next_segment"] += 1
+            self.meta["segments"] = [name]
+            self._save_meta()
+            self.segments = [Segment(self.path / name)]
+            self._stale.extend(self.path / stale for stale in old)
+            self._remove_stale()
+
+    # -- reading ----------------------------------------------------
+    def _hits(self, ranked: List[tuple]) -> List[Hit]:
+        hits = []
+        for score, seg, local in ranked:
+            d = seg.document(local)
+            hits.append(Hit(d["id"], d["title"], d["snippet"], float(score)))
+        return hits
+
+    def search(self, text: str, k: int = 10) -> List[Hit]:
+        """Top-k documents by cosine similarity to `text` (lnc.ltc)."""
+        counts = Counter(terms(text))
+        if not counts:
+            return []
+        with self._reading() as segments:
+            return self._search(segments, counts, k)
+
+    def _search(self, segments: List[Segment], counts: Counter, k: int) -> List[Hit]:
+        n = sum(len(s) for s in segments)
+        if n == 0:
+            return []
+        located = {t: [seg.postings_for(t) for seg in segments] for t in counts}
+        weights = {}
+        for t, c in counts.items():
+            df = sum(sl.stop - sl.start for sl in located[t] if sl is not None)
+            if df:
+                weights[t] = (1 + math.log(c)) * math.log(n / df)
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+
+        candidates = []
+        for j, seg in enumerate(segments):
+            docs, vals = [], []
+            for t, w in weights.items():
+                sl = located[t][j]
+                if sl is not None:
+                    docs.append(seg.postings[sl])
+                    vals.append(seg.weights[sl] * np.float32(w / norm))
+            if not docs:
+                continue
+            scores = np.bincount(np.concatenate(docs), np.concatenate(vals), minlength=len(seg))
+            top = min(k, int(np.count_nonzero(scores)))
+            if top == 0:
+                continue
+            best = np.argpartition(-scores, top - 1)[:top]
+            candidates.extend((scores[i], seg, int(i)) for i in best)
+
+        candidates.sort(key=lambda c: -c[0])
+        return self._hits(candidates[:k])
+
+    def near_duplicates(self, text: str, threshold: float = 0.5, k: int = 10) -> List[Hit]:
+        """
+        Documents whose word shingles overlap `text` by an estimated
+        Jaccard similarity of at least `threshold`, found through LSH.
+        """
+        if not self.has_minhash:
+            raise ValueError("This index was built without MinHash signatures")
+        signature = minhash(text)
+        bands = lsh_bands(signature[None, :])[0]
+        with self._reading() as segments:
+            return self._near_duplicates(segments, signature, bands, threshold, k)
+
+    def _near_duplicates(
+        self, segments: List[Segment], signature: np.ndarray, bands: np.ndarray, threshold: float, k: int
+    ) -> List[Hit]:
+        candidates = []
+        for seg in segments:
+            if seg.bands is None or len(seg) == 0:
+                continue
+            rows = np.flatnonzero((seg.bands == bands).any(axis=1))
+            if rows.size == 0:
+                continue
+            jaccard = (seg.signatures[rows] == signature).mean(axis=1)
+            keep = jaccard >= threshold
+            candidates.extend(zip(jaccard[keep], [seg] * int(keep.sum()), rows[keep].tolist()))
+        candidates.sort(key=lambda c: -c[0])
+        return self._hits(candidates[:k])
@@ -0,0 +1,497 @@
+"""
+Project reports in Markdown, HTML and PDF, one at a time or for a cohort.
+
+A report combines a project's TRL stage (with the typical next gate), the
+business models that match its archetype or keywords, and a financial
+snapshot from the same unit-economics model as the Risk page. Markdown
+and HTML come from string.Template files in data/report_templates/,
+read and compiled once per process. PDFs are written directly by a small
+built-in writer (A4, standard Helvetica fonts), so no PDF library is
+needed.
+
+Cohort runs read a CSV of projects (one column per Project field), render
+reports in chunks on a process pool and stream them into a zip archive as
+chunks complete, in input order:
+
+    python -m utils.reports cohort.csv -o reports.zip --formats pdf,html --workers 8
+"""
+import argparse
+import html
+import io
+import os
+import re
+import sys
+import textwrap
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.archetypes import ArchetypeMatrix, load_archetypes
+from utils.catalogue import DATA_DIR, Catalogue, load_catalogue
+from utils.finance import break_even, irr_analysis
+from utils.search import SearchIndex
+from utils.sensitivity import evaluate
+from utils.stage_gate import DEFAULT_GATES, MARKET_TRL
+from utils.trl import level
+
+TEMPLATE_DIR = DATA_DIR / "report_templates"
+FORMATS: Dict[str, str] = {"pdf": "application/pdf", "md": "text/markdown", "html": "text/html"}
+MATCHED_MODELS = 3
+REPORTS_PER_TASK = 25
+
+
+@dataclass(frozen=True)
+class Project:
+    """One project's inputs; money in rand, costs and units per month."""
+
+    name: str
+    trl: int
+    id: str = ""
+    archetype: str = ""
+    keywords: str = ""
+    price: float = 0.0
+    variable_cost: float = 0.0
+    fixed_costs: float = 0.0
+    units: float = 0.0
+    growth: float = 0.0          # yearly growth in units, as a fraction
+    initial: float = 0.0
+    discount_rate: float = 0.12
+    years: int = 5
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.trl <= MARKET_TRL:
+            raise ValueError(f"{self.name or self.id}: TRL must be between 1 and {MARKET_TRL}")
+        if self.years < 1:
+            raise ValueError(f"{self.name or self.id}: years must be at least 1")
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Project":
+        """A Project from a CSV row; unknown columns and blank cells are ignored."""
+        cells = {}
+        for f in fields(cls):
+            value = row.get(f.name)
+            if value is None or (isinstance(value, float) and np.isnan(value)) or str(value).strip() == "":
+                continue
+            cells[f] = str(value).strip() if f.type is str else value
+        label = next((v for f, v in cells.items() if f.name in ("name", "id")), "Unnamed project")
+        values = {f.name: value if f.type is str else _number(label, f.name, value, f.type) for f, value in cells.items()}
+        values.setdefault("name", values.get("id", "Unnamed project"))
+        if "trl" not in values:
+            raise ValueError(f"{values['name']}: trl is required")
+        return cls(**values)
+
+
+def _number(label: str, name: str, value: Any, kind: type) -> Union[int, float]:
+    """`value` as a float or a whole number, with an error naming the project and column."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{label}: {name} must be a number, not {value!r}") from None
+    if kind is int:
+        if not number.is_integer():
+            raise ValueError(f"{label}: {name} must be a whole number, not {value!r}")
+        return int(number)
+    return number
+
+
+PROJECT_COLUMNS = tuple(f.name for f in fields(Project))
+
+
+@dataclass(frozen=True)
+class Report:
+    """Everything a report shows, independent of the output format."""
+
+    title: str
+    subtitle: str
+    trl: int
+    trl_title: str
+    trl_points: Tuple[str, ...]
+    next_step: str
+    models: Tuple[Tuple[str, ...], ...]      # (name, id, capital, difficulty, time to revenue)
+    metrics: Tuple[Tuple[str, str], ...]     # (label, formatted value)
+    footer: str
+
+
+MODEL_COLUMNS = ("Model", "ID", "Capital", "Difficulty", "Time to revenue")
+
+
+# ----------------------------
+# Building a report
+# ----------------------------
+@lru_cache(maxsize=1)
+def _catalogue() -> Catalogue:
+    return load_catalogue()
+
+
+@lru_cache(maxsize=1)
+def _archetype_matrix() -> ArchetypeMatrix:
+    return ArchetypeMatrix(_catalogue().view(), load_archetypes())
+
+
+@lru_cache(maxsize=1)
+def _search_index() -> SearchIndex:
+    return SearchIndex(list(_catalogue().iter_records()))
+
+
+def matched_models(project: Project, limit: int = MATCHED_MODELS) -> List[int]:
+    """Catalogue positions: keyword matches first, then the archetype's best models."""
+    positions: List[int] = []
+    if project.keywords.strip():
+        positions.extend(pos for pos, _ in _search_index().search(project.keywords, limit))
+    if project.archetype:
+        matrix = _archetype_matrix()
+        if project.archetype in matrix.names:
+            positions.extend(matrix.top_n(project.archetype, limit).tolist())
+    return list(dict.fromkeys(positions))[:limit]
+
+
+def _money(value: Optional[float]) -> str:
+    if value is None or not np.isfinite(value):
+        return "n/a"
+    return f"-R{-value:,.0f}" if value < 0 else f"R{value:,.0f}"
+
+
+def build_report(project: Project, today: Optional[date] = None) -> Report:
+    title, points = level(project.trl)
+    if project.trl < MARKET_TRL:
+        gate = DEFAULT_GATES[project.trl - 1]
+        next_step = (
+            f"Next gate (TRL {project.trl} to {project.trl + 1}) typically takes "
+            f"{gate.duration[0]:.0f}-{gate.duration[2]:.0f} months and "
+            f"R{gate.cost[0]:,.0f}-R{gate.cost[2]:,.0f}; about {gate.pass_rate:.0%} of projects pass."
+        )
+    else:
+        next_step = "The technology is deployed: focus on scaling, replication and growth."
+
+    catalogue = _catalogue()
+    models = tuple(
+        (
+            catalogue.names[i],
+            catalogue.ids[i],
+            catalogue.category("capital_requirement", i) or "-",
+            "-" if catalogue.difficulty[i] < 0 else f"{catalogue.difficulty[i]} / 5",
+            catalogue.category("time_to_revenue", i) or "-",
+        )
+        for i in matched_models(project)
+    )
+
+    metrics: List[Tuple[str, str]] = []
+    if project.price or project.units:
+        be = break_even(project.fixed_costs, project.variable_cost, project.price)
+        year1, npv = evaluate(
+            project.price, project.variable_cost, project.fixed_costs, project.units,
+            project.discount_rate, project.growth, project.initial, project.years,
+        )
+        y = np.arange(project.years)
+        flows = project.units * 12 * (1 + project.growth) ** y * be.margin - 12 * project.fixed_costs
+        rate = irr_analysis(project.initial, tuple(float(f) for f in flows)).rate if project.initial else None
+        metrics = [
+            ("Contribution margin per unit", _money(be.margin)),
+            ("Break-even volume", f"{be.units:,.0f} units / month" if be.units is not None else "not reached"),
+            ("Monthly profit", _money(project.units * be.margin - project.fixed_costs)),
+            ("Year-1 profit", _money(float(year1))),
+            (f"NPV over {project.years} years at {project.discount_rate:.0%}", _money(float(npv))),
+            ("IRR", f"{rate:.1%}" if rate is not None else "n/a"),
+        ]
+
+    today = today or date.today()
+    return Report(
+        title=project.name,
+        subtitle=" · ".join(p for p in (project.id, project.archetype, f"TRL {project.trl}") if p),
+        trl=project.trl,
+        trl_title=title,
+        trl_points=tuple(points),
+        next_step=next_step,
+        models=models,
+        metrics=tuple(metrics),
+        footer=f"Davoren Insights · generated {today:%d %B %Y} · figures are estimates from the inputs given.",
+    )
+
+
+# ----------------------------
+# Markdown and HTML
+# ----------------------------
+@lru_cache(maxsize=None)
+def template(fmt: str) -> Template:
+    """The compiled template for "md" or "html", read once per process."""
+    return Template((TEMPLATE_DIR / f"trl_report.{fmt}").read_text(encoding="utf-8"))
+
+
+def _md_cell(text: str) -> str:
+    return str(text).replace("|", "\\|")
+
+
+def _md_table(header: Sequence[str], rows: Sequence[Sequence[str]]) -> str:
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines += ["| " + " | ".join(_md_cell(c) for c in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def _html_table(header: Sequence[str], rows: Sequence[Sequence[str]], numeric: Sequence[int] = ()) -> str:
+    head = "".join(f"<th>{html.escape(h)}</th>" for h in header)
+    body = "".join(
+        "<tr>" + "".join(
+            f'<td class="num">{html.escape(c)}</td>' if i in numeric else f"<td>{html.escape(c)}</td>"
+            for i, c in enumerate(row)
+        ) + "</tr>"
+        for row in rows
+    )
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def render_markdown(report: Report) -> str:
+    return template("md").substitute(
+        title=report.title,
+        subtitle=report.subtitle,
+        trl=report.trl,
+        trl_title=report.trl_title,
+        trl_points="\n".join(f"- {p}" for p in report.trl_points),
+        next_step=report.next_step,
+        models=_md_table(MODEL_COLUMNS, report.models) if report.models else "_No archetype or keywords given._",
+        metrics=_md_table(("Metric", "Value"), report.metrics) if report.metrics else "_No financial inputs given._",
+        footer=report.footer,
+    )
+
+
+def render_html(report: Report) -> str:
+    e = html.escape
+    return template("html").substitute(
+        title=e(report.title),
+        subtitle=e(report.subtitle),
+        trl=report.trl,
+        trl_title=e(report.trl_title),
+        trl_points="<ul>" + "".join(f"<li>{e(p)}</li>" for p in report.trl_points) + "</ul>",
+        next_step=e(report.next_step),
+        models=_html_table(MODEL_COLUMNS, report.models) if report.models else "<p><em>No archetype or keywords given.</em></p>",
+        metrics=_html_table(("Metric", "Value"), report.metrics, numeric=(1,)) if report.metrics else "<p><em>No financial inputs given.</em></p>",
+        footer=e(report.footer),
+    )
+
+
+# ----------------------------
+# PDF
+# ----------------------------
+_PAGE_WIDTH, _PAGE_HEIGHT, _MARGIN = 595.28, 841.89, 56.0  # A4, in points
+# style -> (font resource, size, line height, indent)
+_PDF_STYLES = {
+    "title": ("F2", 20, 28, 0),
+    "subtitle": ("F1", 10, 22, 0),
+    "heading": ("F2", 13, 26, 0),
+    "body": ("F1", 10, 14, 0),
+    "bullet": ("F1", 10, 14, 14),
+    "small": ("F1", 8, 12, 0),
+}
+_AVERAGE_CHAR_WIDTH = 0.52  # of the font size, for Helvetica body text
+
+
+def _pdf_string(text: str) -> bytes:
+    data = text.replace("→", "->").encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def pdf_document(blocks: Sequence[Tuple[str, str]]) -> bytes:
+    """
+    A PDF of (style, text) blocks laid out top to bottom, wrapping lines
+    and starting new pages as needed. Styles are the keys of _PDF_STYLES.
+    """
+    pages: List[List[bytes]] = [[]]
+    y = _PAGE_HEIGHT - _MARGIN
+    for style, text in blocks:
+        font, size, leading, indent = _PDF_STYLES[style]
+        width = int((_PAGE_WIDTH - 2 * _MARGIN - indent) / (size * _AVERAGE_CHAR_WIDTH))
+        for i, line in enumerate(textwrap.wrap(text, width) or [""]):
+            if y - leading < _MARGIN:
+                pages.append([])
+                y = _PAGE_HEIGHT - _MARGIN
+            y -= leading
+            if style == "bullet" and i == 0:
+                pages[-1].append(b"BT /F1 %d Tf %.2f %.2f Td (\x95) Tj ET" % (size, _MARGIN + 2, y))
+            pages[-1].append(b"BT /%s %d Tf %.2f %.2f Td %s Tj ET" % (
+                font.encode(), size, _MARGIN + indent, y, _pdf_string(line)))
+
+    # Objects: 1 catalog, 2 page tree, 3-4 fonts, then a (page, content) pair per page.
+    objects: List[bytes] = [b"", b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for ops in pages:
+        stream = b"\n".join(ops)
+        page_id, content_id = len(objects) + 1, len(objects) + 2
+        kids.append(b"%d 0 R" % page_id)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+            % (_PAGE_WIDTH, _PAGE_HEIGHT, content_id)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def render_pdf(report: Report) -> bytes:
+    blocks: List[Tuple[str, str]] = [("title", report.title), ("subtitle", report.subtitle)]
+    blocks.append(("heading", "Technology readiness"))
+    blocks.append(("body", f"TRL {report.trl} - {report.trl_title}"))
+    blocks += [("bullet", p.replace("*", "")) for p in report.trl_points]
+    blocks.append(("body", report.next_step))
+    blocks.append(("heading", "Matched business models"))
+    if report.models:
+        blocks += [
+            ("bullet", f"{name} ({model_id}) - capital {capital}, difficulty {difficulty}, revenue in {ttr}")
+            for name, model_id, capital, difficulty, ttr in report.models
+        ]
+    else:
+        blocks.append(("body", "No archetype or keywords given."))
+    blocks.append(("heading", "Financial snapshot"))
+    if report.metrics:
+        blocks += [("body", f"{label}: {value}") for label, value in report.metrics]
+    else:
+        blocks.append(("body", "No financial inputs given."))
+    blocks += [("body", ""), ("small", report.footer)]
+    return pdf_document(blocks)
+
+
+def render(project: Project, fmt: str, today: Optional[date] = None) -> bytes:
+    """One report as bytes in `fmt` ("pdf", "md" or "html")."""
+    report = build_report(project, today)
+    if fmt == "pdf":
+        return render_pdf(report)
+    if fmt == "md":
+        return render_markdown(report).encode("utf-8")
+    if fmt == "html":
+        return render_html(report).encode("utf-8")
+    raise ValueError(f"Unknown format {fmt!r}; expected one of {tuple(FORMATS)}")
+
+
+# ----------------------------
+# Cohorts
+# ----------------------------
+def report_name(number: int, project: Project, fmt: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", project.id or project.name).strip("_")[:60] or "project"
+    return f"{number:04d}_{slug}.{fmt}"
+
+
+def render_chunk(
+    first: int, projects: Sequence[Project], formats: Sequence[str], today: date
+) -> List[Tuple[str, bytes]]:
+    """(file name, bytes) for every project and format in one chunk."""
+    return [
+        (report_name(first + i, project, fmt), render(project, fmt, today))
+        for i, project in enumerate(projects)
+        for fmt in formats
+    ]
+
+
+def read_projects(source: Union[Path, IO[bytes]], chunk_size: int = 10_000) -> Iterator[Project]:
+    """Projects from a CSV (path or binary file) with one column per Project field."""
+    import pandas as pd
+
+    # Everything is read as text: inferred types would turn an id column with
+    # a blank cell into floats ("1.0"). from_row parses the numeric fields.
+    for chunk in pd.read_csv(source, chunksize=chunk_size, dtype=str):
+        chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+        for row in chunk.to_dict("records"):
+            yield Project.from_row(row)
+
+
+def write_zip(
+    projects: Iterable[Project],
+    target: Union[Path, IO[bytes]],
+    formats: Sequence[str] = ("pdf",),
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    chunk_size: int = REPORTS_PER_TASK,
+) -> int:
+    """
+    Render every project in every format into a zip at `target` (a path
+    or a binary file object); returns the number of reports written.
+    Chunks run on `executor`, or on a process pool of `workers` created for
+    this call. At most two chunks per worker are in flight.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown formats {sorted(unknown)}; expected {tuple(FORMATS)}")
+    workers = workers or os.cpu_count() or 1
+    own_executor = executor is None and workers > 1
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    today = date.today()
+
+    def chunks() -> Iterator[Tuple[int, List[Project]]]:
+        batch: List[Project] = []
+        first = 1
+        for project in projects:
+            batch.append(project)
+            if len(batch) == chunk_size:
+                yield first, batch
+                first += len(batch)
+                batch = []
+        if batch:
+            yield first, batch
+
+    written = 0
+    pending: deque = deque()
+    try:
+        with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            def drain(result: List[Tuple[str, bytes]]) -> None:
+                nonlocal written
+                for name, data in result:
+                    # PDFs and HTML compress well; stored PDFs would be 3-4x larger.
+                    archive.writestr(name, data)
+                written += len(result)
+
+            for first, batch in chunks():
+                if executor is None:
+                    drain(render_chunk(first, batch, formats, today))
+                    continue
+                pending.append(executor.submit(render_chunk, first, batch, formats, today))
+                if len(pending) >= 2 * workers:
+                    drain(pending.popleft().result())
+            while pending:
+                drain(pending.popleft().result())
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Render TRL reports for a cohort of projects into a zip.")
+    parser.add_argument("source", type=Path, help=f"CSV with columns {', '.join(PROJECT_COLUMNS)}")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="output .zip file")
+    parser.add_argument("--formats", default="pdf", help="comma-separated: pdf, md, html")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    n = write_zip(read_projects(args.source), args.output, formats, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {n:,} reports in {elapsed:.1f}s -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Ranked full-text search over the business model catalogue.
+
+The index is built once per catalogue: every field is tokenised, each
+token's occurrences are summed with a per-field boost (BM25F style), and
+the result is stored as compact postings arrays. Queries are scored with
+BM25 over those postings. Every query word may also match as a prefix of
+a longer token (looked up by bisection in the sorted vocabulary), which
+is what makes search-as-you-type work.
+"""
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+FIELD_BOOSTS: Dict[str, float] = {
+    "id": 3.0,
+    "name": 3.0,
+    "tags": 2.0,
+    "description": 1.0,
+    "use_cases": 0.7,
+    "examples": 0.7,
+}
+
+# Prefix matches count for less than whole-word matches.
+PREFIX_WEIGHT = 0.6
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+class SearchIndex:
+    """
+    BM25F-style inverted index over a list of catalogue entries.
+
+    Results are (position, score) pairs, where position indexes the list
+    the index was built from.
+    """
+
+    def __init__(
+        self,
+        models: Sequence[Dict[str, Any]],
+        boosts: Optional[Dict[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.boosts = dict(FIELD_BOOSTS if boosts is None else boosts)
+        self.k1 = k1
+        self.b = b
+        self.size = len(models)
+
+        raw: Dict[str, Dict[int, float]] = {}
+        lengths = np.zeros(self.size, dtype=np.float64)
+        for doc, bm in enumerate(models):
+            for field, boost in self.boosts.items():
+                for token in tokenize(_field_text(bm.get(field))):
+                    postings = raw.setdefault(token, {})
+                    postings[doc] = postings.get(doc, 0.0) + boost
+                    lengths[doc] += boost
+
+        self.vocabulary: List[str] = sorted(raw)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for token, postings in raw.items():
+            docs = np.fromiter(postings.keys(), dtype=np.int32, count=len(postings))
+            tf = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+            self.postings[token] = (docs, tf)
+
+        avg = lengths.mean() if self.size else 1.0
+        # Per-document BM25 length normalisation, computed once.
+        self._norm = (k1 * (1 - b + b * lengths / (avg or 1.0))).astype(np.float32)
+
+    def _idf(self, df: int) -> float:
+        return math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+
+    def expand(self, word: str) -> List[Tuple[str, float]]:
+        """Vocabulary terms matched by a query word, with their weights."""
+        matches = []
+        vocab = self.vocabulary
+        i = bisect_left(vocab, word)
+        while i < len(vocab) and vocab[i].startswith(word):
+            matches.append((vocab[i], 1.0 if vocab[i] == word else PREFIX_WEIGHT))
+            i += 1
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Rank entries against a query. Every query word has to match (as a
+        word or a prefix); scores are summed BM25 contributions.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words or not self.size:
+            return []
+
+        scores = np.zeros(self.size, dtype=np.float32)
+        hits = np.zeros(self.size, dtype=np.int16)
+        for word in words:
+            matched = np.zeros(self.size, dtype=bool)
+            for term, weight in self.expand(word):
+                docs, tf = self.postings[term]
+                idf = self._idf(len(docs))
+                scores[docs] += weight * idf * tf * (self.k1 + 1) / (tf + self._norm[docs])
+                matched[docs] = True
+            hits += matched
+
+        candidates = np.flatnonzero(hits == len(words))
+        if len(candidates) == 0:
+            return []
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        if limit is not None:
+            order = order[:limit]
+        return [(int(i), float(scores[i])) for i in order]
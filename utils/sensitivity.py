@@ -0,0 +1,123 @@
+"""
+One-at-a-time sensitivity analysis of the profit / NPV model.
+
+Every driver is moved across a range of relative changes while the others
+stay at their base values. All those what-ifs (plus the base case and a
++/-1% nudge per driver for point elasticities) are stacked into one input
+matrix and evaluated in a single vectorised pass of the model, so a full
+analysis costs about as much as one evaluation of a long cash-flow series.
+
+The model is a simple unit-economics projection over whole years:
+
+    units_y   = units * 12 * (1 + growth) ** (y - 1)
+    profit_y  = units_y * (price - variable_cost) - 12 * fixed_costs
+    NPV       = -initial + sum(profit_y / (1 + discount_rate) ** y)
+
+with price, variable cost and fixed costs per month as on the Financial
+Projections page. Growth is the yearly growth of units sold.
+"""
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+DRIVERS: Dict[str, str] = {
+    "price": "Selling price",
+    "variable_cost": "Variable cost per unit",
+    "fixed_costs": "Monthly fixed costs",
+    "units": "Units sold per month",
+    "discount_rate": "Discount rate",
+    "growth": "Yearly unit growth",
+}
+
+# Relative change used for point elasticities.
+NUDGE = 0.01
+
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    """Model outputs for every driver at every relative change."""
+
+    drivers: Tuple[str, ...]
+    changes: np.ndarray        # (n_changes,) relative changes, e.g. -0.2 .. 0.2
+    base: Dict[str, float]     # base inputs
+    base_profit: float         # year-1 profit in the base case
+    base_npv: float
+    profit: np.ndarray         # (n_drivers, n_changes) year-1 profit
+    npv: np.ndarray            # (n_drivers, n_changes)
+    profit_elasticity: np.ndarray  # (n_drivers,) % change in profit per % change in driver
+    npv_elasticity: np.ndarray
+
+
+def evaluate(
+    price, variable_cost, fixed_costs, units, discount_rate, growth, initial: float, years: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Year-1 profit and NPV for arrays of inputs (all broadcast together).
+    """
+    price, variable_cost, fixed_costs, units, discount_rate, growth = (
+        np.asarray(a, dtype=float)[..., None]
+        for a in np.broadcast_arrays(price, variable_cost, fixed_costs, units, discount_rate, growth)
+    )
+    y = np.arange(1, years + 1, dtype=float)
+    units_y = units * 12 * (1 + growth) ** (y - 1)
+    profit_y = units_y * (price - variable_cost) - 12 * fixed_costs
+    npv = -initial + (profit_y * (1 + discount_rate) ** -y).sum(axis=-1)
+    return profit_y[..., 0], npv
+
+
+def analyse(
+    base: Dict[str, float],
+    initial: float,
+    years: int,
+    spread: float = 0.2,
+    steps: int = 9,
+) -> SensitivityResult:
+    """
+    Move each driver in `base` (one value per key of DRIVERS) from -spread
+    to +spread of its base value in `steps` points, one driver at a time.
+    """
+    drivers = tuple(DRIVERS)
+    changes = np.linspace(-spread, spread, steps)
+    # Columns: the swept changes, then -NUDGE and +NUDGE for elasticities.
+    factors = 1 + np.concatenate([changes, [-NUDGE, NUDGE]])
+    n, m = len(drivers), len(factors)
+
+    # Row block i moves driver i only; one extra row holds the base case.
+    inputs = {d: np.full((n * m + 1,), float(base[d])) for d in drivers}
+    for i, d in enumerate(drivers):
+        inputs[d][i * m:(i + 1) * m] *= factors
+
+    profit, npv = evaluate(
+        inputs["price"], inputs["variable_cost"], inputs["fixed_costs"], inputs["units"],
+        inputs["discount_rate"], inputs["growth"], initial, years,
+    )
+    base_profit, base_npv = float(profit[-1]), float(npv[-1])
+    profit, npv = profit[:-1].reshape(n, m), npv[:-1].reshape(n, m)
+
+    def elasticity(out: np.ndarray, ref: float) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ref != 0, (out[:, -1] - out[:, -2]) / abs(ref) / (2 * NUDGE), np.nan)
+
+    return SensitivityResult(
+        drivers=drivers,
+        changes=changes,
+        base={d: float(base[d]) for d in drivers},
+        base_profit=base_profit,
+        base_npv=base_npv,
+        profit=profit[:, :steps],
+        npv=npv[:, :steps],
+        profit_elasticity=elasticity(profit, base_profit),
+        npv_elasticity=elasticity(npv, base_npv),
+    )
+
+
+def tornado(result: SensitivityResult, metric: str = "npv") -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+    """
+    Drivers ordered by swing (largest first), with the metric when each
+    driver is at the low and at the high end of its range.
+    """
+    values = result.npv if metric == "npv" else result.profit
+    low, high = values[:, 0], values[:, -1]
+    order = np.argsort(-np.abs(high - low), kind="stable")
+    return tuple(result.drivers[i] for i in order), low[order], high[order]
@@ -0,0 +1,319 @@
+"""
+"Similar models" recommendations: a precomputed k-nearest-neighbour table.
+
+Two models are compared on their tags (Jaccard overlap of the tag sets)
+and on their description and use cases (cosine of TF-IDF vectors); the
+similarity is a weighted mix of the two. Every model's k best neighbours
+are computed once and kept in a table, so showing them on a card is a
+row lookup.
+
+Scoring one model never compares it with the whole catalogue: candidates
+come from inverted postings (models sharing at least one tag or word),
+and features shared by more than `max_postings` models are left out, as
+they say little about similarity and would make every model a candidate.
+
+The table is pickled beside the catalogue snapshot. When the catalogue
+file changes, only the models whose tags or text changed are rescored:
+a new or edited model gets a fresh row and is offered to the rows of its
+candidates, and rows that pointed at an edited or removed model are
+recomputed. IDF weights are frozen at the last full build (new words get
+the highest weight) and refreshed when more than REBUILD_FRACTION of the
+catalogue has changed.
+"""
+import hashlib
+import json
+import math
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.catalogue import CACHE_DIR, CATALOGUE_PATH, Catalogue
+from utils.search import tokenize
+
+DEFAULT_K = 5
+TAG_WEIGHT = 0.5          # share of the similarity from tags; the rest is text
+MAX_POSTINGS = 5_000      # features on more models than this are not used
+REBUILD_FRACTION = 0.25
+
+TEXT_FIELDS = ("description", "use_cases")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from in into is it of on or that the their this to with without via
+""".split())
+
+_SNAPSHOT_VERSION = 1
+
+
+def _text(record: Dict[str, Any]) -> str:
+    parts = []
+    for field in TEXT_FIELDS:
+        value = record.get(field)
+        parts.extend(value if isinstance(value, (list, tuple)) else [value or ""])
+    return " ".join(str(p) for p in parts)
+
+
+def fingerprint(record: Dict[str, Any]) -> str:
+    """Hash of everything similarity depends on."""
+    tags = sorted(t.lower() for t in record.get("tags", []))
+    return hashlib.sha1(json.dumps([tags, _text(record)]).encode()).hexdigest()
+
+
+class SimilarityIndex:
+    """
+    Tag and TF-IDF features of every model plus its k nearest neighbours.
+
+    Models live in slots; an edited model gets a new slot and its old one
+    is retired, so postings only ever grow until the next full build.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, tag_weight: float = TAG_WEIGHT, max_postings: int = MAX_POSTINGS):
+        self.k = k
+        self.tag_weight = tag_weight
+        self.max_postings = max_postings
+
+        self.ids: List[str] = []
+        self.fingerprints: List[str] = []
+        self._slot: Dict[str, int] = {}
+
+        self._tag_ids: Dict[str, int] = {}
+        self._term_ids: Dict[str, int] = {}
+        self._idf: Dict[str, float] = {}
+        self._default_idf = 1.0
+
+        self._tags: List[np.ndarray] = []                       # tag ids per slot
+        self._terms: List[Tuple[np.ndarray, np.ndarray]] = []   # (term ids, unit-length weights)
+        self._tag_postings: Dict[int, List[int]] = {}
+        self._term_postings: Dict[int, Tuple[List[int], List[float]]] = {}
+
+        # Per-slot arrays, grown in blocks.
+        self._alive = np.zeros(0, dtype=bool)
+        self._tag_len = np.zeros(0, dtype=np.float64)
+        self._knn = np.full((0, k), -1, dtype=np.int32)
+        self._knn_scores = np.full((0, k), -np.inf, dtype=np.float32)
+
+    # ----------------------------
+    # Building
+    # ----------------------------
+    @classmethod
+    def build(cls, models: Iterable[Tuple[str, Dict[str, Any]]], **kwargs) -> "SimilarityIndex":
+        """Index (id, record) pairs from scratch and fill the whole table."""
+        index = cls(**kwargs)
+        models = list(models)
+        documents = [[t for t in tokenize(_text(r)) if t not in STOPWORDS] for _, r in models]
+        df: Dict[str, int] = {}
+        for words in documents:
+            for term in set(words):
+                df[term] = df.get(term, 0) + 1
+        n = len(models)
+        index._idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+        index._default_idf = math.log(1 + n) + 1
+
+        for (model_id, record), words in zip(models, documents):
+            index._add_features(model_id, record, words)
+        for slot in range(len(index.ids)):
+            index._fill_row(slot)
+        return index
+
+    def _add_features(self, model_id: str, record: Dict[str, Any], words: Optional[List[str]] = None) -> int:
+        slot = len(self.ids)
+        self.ids.append(model_id)
+        self.fingerprints.append(fingerprint(record))
+        self._slot[model_id] = slot
+        if slot >= len(self._alive):
+            grow = max(len(self._alive), 16)
+            self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+            self._tag_len = np.concatenate([self._tag_len, np.zeros(grow)])
+            self._knn = np.vstack([self._knn, np.full((grow, self.k), -1, dtype=np.int32)])
+            self._knn_scores = np.vstack([self._knn_scores, np.full((grow, self.k), -np.inf, dtype=np.float32)])
+        self._alive[slot] = True
+
+        tags = np.array(sorted({
+            self._tag_ids.setdefault(t.lower(), len(self._tag_ids)) for t in record.get("tags", [])
+        }), dtype=np.int32)
+        for tag in tags.tolist():
+            self._tag_postings.setdefault(tag, []).append(slot)
+        self._tags.append(tags)
+        self._tag_len[slot] = len(tags)
+
+        if words is None:
+            words = [t for t in tokenize(_text(record)) if t not in STOPWORDS]
+        counts: Dict[str, int] = {}
+        for term in words:
+            counts[term] = counts.get(term, 0) + 1
+        weights = {t: (1 + math.log(c)) * self._idf.get(t, self._default_idf) for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        term_ids = np.array([self._term_ids.setdefault(t, len(self._term_ids)) for t in weights], dtype=np.int32)
+        values = np.array([w / norm for w in weights.values()], dtype=np.float32)
+        for term, value in zip(term_ids.tolist(), values.tolist()):
+            slots, vals = self._term_postings.setdefault(term, ([], []))
+            slots.append(slot)
+            vals.append(value)
+        self._terms.append((term_ids, values))
+        return slot
+
+    # ----------------------------
+    # Scoring
+    # ----------------------------
+    def _scores(self, slot: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate slots for `slot` and their similarity to it."""
+        tags = self._tags[slot]
+        lists = [self._tag_postings[t] for t in tags.tolist() if len(self._tag_postings[t]) <= self.max_postings]
+        if lists:
+            tag_cands, shared = np.unique(np.concatenate(lists), return_counts=True)
+            jaccard = shared / (len(tags) + self._tag_len[tag_cands] - shared)
+        else:
+            tag_cands, jaccard = np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        terms, weights = self._terms[slot]
+        slots, products = [], []
+        for term, weight in zip(terms.tolist(), weights.tolist()):
+            posting_slots, posting_values = self._term_postings[term]
+            if len(posting_slots) <= self.max_postings:
+                slots.append(np.asarray(posting_slots))
+                products.append(np.asarray(posting_values, dtype=np.float64) * weight)
+        if slots:
+            text_cands, inverse = np.unique(np.concatenate(slots), return_inverse=True)
+            cosine = np.bincount(inverse, np.concatenate(products))
+        else:
+            text_cands, cosine = np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        cands = np.union1d(tag_cands, text_cands)
+        score = np.zeros(len(cands))
+        score[np.searchsorted(cands, tag_cands)] += self.tag_weight * jaccard
+        score[np.searchsorted(cands, text_cands)] += (1 - self.tag_weight) * cosine
+        keep = self._alive[cands] & (cands != slot) & (score > 0)
+        return cands[keep], score[keep]
+
+    def _fill_row(self, slot: int) -> None:
+        cands, score = self._scores(slot)
+        top = min(self.k, len(cands))
+        best = np.argpartition(-score, top - 1)[:top] if top else np.zeros(0, dtype=np.int64)
+        best = best[np.argsort(-score[best], kind="stable")]
+        self._knn[slot] = -1
+        self._knn_scores[slot] = -np.inf
+        self._knn[slot, :top] = cands[best]
+        self._knn_scores[slot, :top] = score[best]
+
+    def _offer(self, slot: int, cands: np.ndarray, score: np.ndarray) -> None:
+        """Insert `slot` into the rows of candidates it now beats."""
+        for row, value in zip(cands.tolist(), score.tolist()):
+            if value <= self._knn_scores[row, -1]:
+                continue
+            at = int(np.searchsorted(-self._knn_scores[row], -value, side="right"))
+            self._knn[row, at + 1:] = self._knn[row, at:-1].copy()
+            self._knn_scores[row, at + 1:] = self._knn_scores[row, at:-1].copy()
+            self._knn[row, at] = slot
+            self._knn_scores[row, at] = value
+
+    # ----------------------------
+    # Incremental updates
+    # ----------------------------
+    def _retire(self, model_id: str) -> np.ndarray:
+        """Retire the slot of `model_id`; returns the rows that listed it."""
+        slot = self._slot.pop(model_id)
+        self._alive[slot] = False
+        self._knn[slot] = -1
+        self._knn_scores[slot] = -np.inf
+        return np.flatnonzero((self._knn[:len(self.ids)] == slot).any(axis=1))
+
+    def upsert(self, model_id: str, record: Dict[str, Any]) -> bool:
+        """Add or update one model; False when nothing it is compared on changed."""
+        if model_id in self._slot and self.fingerprints[self._slot[model_id]] == fingerprint(record):
+            return False
+        stale = self._retire(model_id) if model_id in self._slot else np.zeros(0, dtype=np.int64)
+        slot = self._add_features(model_id, record)
+        self._fill_row(slot)
+        self._offer(slot, *self._scores(slot))
+        for row in stale.tolist():
+            self._fill_row(row)
+        return True
+
+    def remove(self, model_id: str) -> None:
+        for row in self._retire(model_id).tolist():
+            self._fill_row(row)
+
+    # ----------------------------
+    # Lookups
+    # ----------------------------
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, model_id: str) -> bool:
+        return model_id in self._slot
+
+    def neighbours(self, model_id: str) -> List[Tuple[str, float]]:
+        """The k most similar models as (id, similarity), best first."""
+        slot = self._slot.get(model_id)
+        if slot is None:
+            return []
+        return [
+            (self.ids[s], float(v))
+            for s, v in zip(self._knn[slot].tolist(), self._knn_scores[slot].tolist())
+            if s >= 0
+        ]
+
+
+# ----------------------------
+# Catalogue integration
+# ----------------------------
+def _models(catalogue: Catalogue, positions: Optional[Sequence[int]] = None) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    for i in range(len(catalogue)) if positions is None else positions:
+        yield catalogue.ids[i], {**catalogue.summary(i), **catalogue.details(i)}
+
+
+def load_similarity(
+    catalogue: Catalogue,
+    source: Path = CATALOGUE_PATH,
+    cache_dir: Path = CACHE_DIR,
+    k: int = DEFAULT_K,
+) -> SimilarityIndex:
+    """
+    The k-NN table for `catalogue`: from its snapshot when the catalogue
+    file is unchanged, patched for the models that changed, or rebuilt.
+    """
+    source = Path(source).resolve()
+    snapshot_path = Path(cache_dir) / (source.stem + ".similar.pkl")
+    stat = source.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    index: Optional[SimilarityIndex] = None
+    if snapshot_path.exists():
+        try:
+            with open(snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+            if snapshot.get("version") == _SNAPSHOT_VERSION and snapshot["index"].k == k:
+                if snapshot["stamp"] == stamp and len(snapshot["index"]) == len(catalogue):
+                    return snapshot["index"]
+                index = snapshot["index"]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+            index = None
+
+    if index is not None:
+        current = set(catalogue.ids)
+        removed = [model_id for model_id in list(index._slot) if model_id not in current]
+        models = list(_models(catalogue))
+        changed = [
+            (model_id, record) for model_id, record in models
+            if model_id not in index or index.fingerprints[index._slot[model_id]] != fingerprint(record)
+        ]
+        if len(removed) + len(changed) > REBUILD_FRACTION * max(len(catalogue), 1):
+            index = None
+        else:
+            for model_id in removed:
+                index.remove(model_id)
+            for model_id, record in changed:
+                index.upsert(model_id, record)
+
+    if index is None:
+        index = SimilarityIndex.build(_models(catalogue), k=k)
+
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    tmp = snapshot_path.with_suffix(snapshot_path.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump({"version": _SNAPSHOT_VERSION, "stamp": stamp, "index": index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, snapshot_path)
+    return index
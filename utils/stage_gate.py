@@ -0,0 +1,214 @@
+"""
+Stage-gate simulation of an innovation portfolio moving up the TRL scale.
+
+Every project starts at some TRL and must pass each gate to the next
+level until it reaches TRL 9 (market). A gate takes a random time and
+costs a random amount (both triangular), then passes with a fixed
+probability; a project that fails a gate stops there, having spent what
+that gate cost. Projects move through their own gates one after another
+and in parallel with each other.
+
+One *trajectory* is one possible future of the whole cohort. Trajectories
+are simulated in chunks, each fully vectorised over (trajectory, project,
+gate), and the chunks run on a process pool with independent random
+streams spawned from one seed, so the result does not depend on how many
+workers ran it. Chunks come back as small, mergeable summaries:
+per-trajectory funding, launches and spend per year, plus time-to-market
+histograms per starting TRL.
+"""
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MARKET_TRL = 9
+YEARS = 20            # yearly spend buckets; the last one holds everything later
+MAX_MONTHS = 360      # time-to-market histogram range, 1-month bins
+CHUNK_ELEMENTS = 2_000_000  # trajectory x project x gate cells per chunk
+
+
+@dataclass(frozen=True)
+class Gate:
+    """
+    Moving from one TRL to the next: duration in months and cost in rand as
+    (minimum, most likely, maximum), and the chance of passing the review.
+    """
+
+    duration: Tuple[float, float, float]
+    cost: Tuple[float, float, float]
+    pass_rate: float
+
+    def __post_init__(self) -> None:
+        for name, (lo, mode, hi) in (("duration", self.duration), ("cost", self.cost)):
+            if not 0 <= lo <= mode <= hi:
+                raise ValueError(f"{name} must satisfy 0 <= min <= most likely <= max")
+        if not 0 <= self.pass_rate <= 1:
+            raise ValueError("pass_rate must be between 0 and 1")
+
+
+# Gate i moves a project from TRL i + 1 to TRL i + 2. Typical figures for
+# hardware-led innovation; programmes should replace them with their own.
+DEFAULT_GATES: Tuple[Gate, ...] = (
+    Gate((2, 4, 8), (50e3, 100e3, 250e3), 0.80),
+    Gate((3, 6, 12), (100e3, 250e3, 600e3), 0.70),
+    Gate((4, 8, 14), (250e3, 600e3, 1.5e6), 0.65),
+    Gate((6, 10, 18), (500e3, 1.2e6, 3e6), 0.60),
+    Gate((6, 12, 24), (1e6, 2.5e6, 6e6), 0.55),
+    Gate((9, 15, 30), (2e6, 5e6, 12e6), 0.55),
+    Gate((6, 12, 24), (3e6, 8e6, 20e6), 0.65),
+    Gate((3, 9, 18), (2e6, 6e6, 15e6), 0.75),
+)
+
+
+@dataclass(frozen=True)
+class PortfolioResult:
+    """Merged outcome of every simulated trajectory."""
+
+    trajectories: int
+    cohort: Dict[int, int]        # starting TRL -> number of projects
+    funding: np.ndarray           # (trajectories,) total spend of the cohort
+    launches: np.ndarray          # (trajectories,) projects that reached the market
+    first_launch: np.ndarray      # (trajectories,) months to the first launch (nan if none)
+    yearly_spend: np.ndarray      # (trajectories, YEARS)
+    ttm_hist: np.ndarray          # (MARKET_TRL + 1, MAX_MONTHS + 1) time to market by starting TRL
+    launched: np.ndarray          # (MARKET_TRL + 1,) launches by starting TRL, over all trajectories
+
+    def launch_probability(self, trl: int) -> float:
+        """Chance that one project starting at `trl` reaches the market."""
+        projects = self.cohort.get(trl, 0) * self.trajectories
+        return float(self.launched[trl] / projects) if projects else float("nan")
+
+    def time_to_market(self, trl: int, q: float) -> float:
+        """Quantile `q` of months to market for launched projects starting at `trl`."""
+        counts = self.ttm_hist[trl]
+        total = counts.sum()
+        if total == 0:
+            return float("nan")
+        return float(np.searchsorted(np.cumsum(counts), q * total))
+
+
+# ----------------------------
+# Sampling
+# ----------------------------
+def _triangular(u: np.ndarray, lo: np.ndarray, mode: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Inverse CDF of the triangular distribution; also valid when lo == hi."""
+    width = hi - lo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        split = np.where(width > 0, (mode - lo) / width, 0.0)
+    left = lo + np.sqrt(u * width * (mode - lo))
+    right = hi - np.sqrt((1 - u) * width * (hi - mode))
+    return np.where(u < split, left, right)
+
+
+def _gate_arrays(gates: Sequence[Gate]) -> np.ndarray:
+    """(7, n_gates): duration min/mode/max, cost min/mode/max, pass rate."""
+    return np.array([[*g.duration, *g.cost, g.pass_rate] for g in gates], dtype=float).T
+
+
+def simulate_chunk(gates: np.ndarray, start: np.ndarray, n: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """
+    `n` trajectories of projects starting at TRLs `start`, as a mergeable
+    summary. `gates` comes from _gate_arrays().
+    """
+    rng = np.random.default_rng(seed)
+    p, g = len(start), gates.shape[1]
+    shape = (n, p, g)
+
+    needed = np.arange(g)[None, :] >= (start[:, None] - 1)   # (p, g) gates above the starting TRL
+    duration = _triangular(rng.random(shape), *gates[0:3, None, None, :])
+    cost = _triangular(rng.random(shape), *gates[3:6, None, None, :])
+    passed = (rng.random(shape) < gates[6]) | ~needed
+
+    # A gate is attempted (and paid for) if every earlier gate was passed.
+    reached = np.cumprod(passed, axis=2, dtype=bool)
+    attempted = np.concatenate([np.ones((n, p, 1), dtype=bool), reached[..., :-1]], axis=2) & needed
+    duration = duration * attempted
+    cost = cost * attempted
+
+    launched = reached[..., -1]                                     # (n, p)
+    months = duration.sum(axis=2)
+    ttm = np.where(launched, months, np.nan)
+
+    begins = np.cumsum(duration, axis=2) - duration                 # month each gate starts
+    year = np.minimum(begins // 12, YEARS - 1).astype(np.int64)
+    rows = np.broadcast_to(np.arange(n)[:, None, None], shape)
+    yearly = np.bincount((rows * YEARS + year).ravel(), cost.ravel(), minlength=n * YEARS).reshape(n, YEARS)
+
+    ttm_hist = np.zeros((MARKET_TRL + 1, MAX_MONTHS + 1), dtype=np.int64)
+    launched_by_trl = np.zeros(MARKET_TRL + 1, dtype=np.int64)
+    for trl in np.unique(start):
+        cols = start == trl
+        hit = launched[:, cols]
+        launched_by_trl[trl] = hit.sum()
+        bins = np.minimum(np.ceil(months[:, cols][hit]), MAX_MONTHS).astype(np.int64)
+        ttm_hist[trl] = np.bincount(bins, minlength=MAX_MONTHS + 1)
+
+    with np.errstate(all="ignore"):
+        first = np.where(launched.any(axis=1), np.nanmin(np.where(launched, ttm, np.inf), axis=1), np.nan)
+    return {
+        "funding": cost.sum(axis=(1, 2)),
+        "launches": launched.sum(axis=1),
+        "first_launch": first,
+        "yearly_spend": yearly,
+        "ttm_hist": ttm_hist,
+        "launched": launched_by_trl,
+    }
+
+
+# ----------------------------
+# Portfolio runs
+# ----------------------------
+def simulate(
+    cohort: Dict[int, int],
+    gates: Sequence[Gate] = DEFAULT_GATES,
+    trajectories: int = 10_000,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> PortfolioResult:
+    """
+    Simulate `trajectories` futures of a cohort given as {starting TRL:
+    number of projects}. Chunks run on `executor`, or on a process pool of
+    `workers` created for this call when there is more than one chunk.
+    """
+    if len(gates) != MARKET_TRL - 1:
+        raise ValueError(f"Expected {MARKET_TRL - 1} gates (TRL 1 -> 2 ... TRL 8 -> 9)")
+    cohort = {int(trl): int(n) for trl, n in cohort.items() if n > 0}
+    if any(not 1 <= trl <= MARKET_TRL for trl in cohort):
+        raise ValueError(f"Starting TRLs must be between 1 and {MARKET_TRL}")
+    start = np.repeat(np.array(list(cohort), dtype=np.int64), list(cohort.values()))
+    if start.size == 0:
+        raise ValueError("The cohort has no projects")
+
+    arrays = _gate_arrays(gates)
+    per_chunk = max(1, CHUNK_ELEMENTS // (start.size * len(gates)))
+    sizes = [min(per_chunk, trajectories - lo) for lo in range(0, trajectories, per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    own_executor = executor is None and len(sizes) > 1 and (workers or os.cpu_count() or 1) > 1
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(sizes)))
+    try:
+        if executor is None:
+            parts: List[Dict[str, np.ndarray]] = [simulate_chunk(arrays, start, n, s) for n, s in zip(sizes, seeds)]
+        else:
+            parts = list(executor.map(simulate_chunk, [arrays] * len(sizes), [start] * len(sizes), sizes, seeds))
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+    def stack(key: str) -> np.ndarray:
+        return np.concatenate([part[key] for part in parts])
+
+    return PortfolioResult(
+        trajectories=trajectories,
+        cohort=cohort,
+        funding=stack("funding"),
+        launches=stack("launches"),
+        first_launch=stack("first_launch"),
+        yearly_spend=stack("yearly_spend"),
+        ttm_hist=sum(part["ttm_hist"] for part in parts),
+        launched=sum(part["launched"] for part in parts),
+    )
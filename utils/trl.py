@@ -0,0 +1,70 @@
+"""
+The nine Technology Readiness Levels, as taught on the TRL page and
+quoted in generated reports.
+"""
+from typing import Dict, List, Tuple
+
+TRL_LEVELS: Dict[str, str] = {
+    "TRL 1 — Basic Principles Observed": """
+    • Pure scientific exploration  
+    • Curiosity-driven research  
+    • No prototype, no design, no concept yet  
+    """,
+
+    "TRL 2 — Technology Concept Formulated": """
+    • You've seen something interesting  
+    • You can define a potential application  
+    • Still no experimental proof  
+    """,
+
+    "TRL 3 — Experimental Proof-of-Concept": """
+    • Laboratory validation  
+    • Simulations, modelling, early experiments  
+    • Digital twin or computational model is allowed  
+    • You can *prove* the idea might work  
+    """,
+
+    "TRL 4 — Lab Validation of Components": """
+    • Components tested together  
+    • Bench setups  
+    • Early integration begins  
+    • Still controlled environment  
+    """,
+
+    "TRL 5 — Relevant Environment Validation": """
+    • More representative conditions  
+    • Environmental factors introduced  
+    • Higher fidelity prototype  
+    """,
+
+    "TRL 6 — Prototype Demonstration": """
+    • Full prototype  
+    • Demonstrated in a relevant environment  
+    • Can show performance under partial real-world conditions  
+    """,
+
+    "TRL 7 — System Prototype in Operational Environment": """
+    • Pilot plant  
+    • Live operational testing  
+    • Integrated with real-world interfaces  
+    """,
+
+    "TRL 8 — Completed & Certified System": """
+    • Technology is complete  
+    • Certifications, compliance, validation tests  
+    • Manufacturing process established  
+    """,
+
+    "TRL 9 — Market Deployment": """
+    • Technology is in full operation  
+    • Commercial adoption  
+    • Scaling, replication, and business growth  
+    """
+}
+
+
+def level(trl: int) -> Tuple[str, List[str]]:
+    """(title, bullet points) of TRL `trl`, e.g. ("Experimental Proof-of-Concept", [...])."""
+    heading, text = list(TRL_LEVELS.items())[trl - 1]
+    points = [line.strip().lstrip("•").strip() for line in text.strip().splitlines()]
+    return heading.split("—", 1)[1].strip(), [p for p in points if p]
@@ -0,0 +1,528 @@
+"""
+Local workspace store: named projects holding page inputs and results.
+
+Everything lives in one SQLite database under data/workspace/, opened in
+WAL mode so readers never wait for the writer. Reads go through a small
+pool of shared connections. Writes never block a page: they are queued
+and one writer thread per process commits them in batches, after the
+queue has been quiet for DEBOUNCE seconds (or MAX_DELAY after the first
+queued change). Repeated writes of the same page state or result are
+coalesced, so a burst of reruns costs one row write. Reads look at the
+queue first, so a session always sees its own latest state.
+
+Results are stored by a digest of the function name, its arguments, the
+store's FORMAT_VERSION and a fingerprint of the source files the result
+depends on. persisted() wraps an expensive function: restoring a
+project's inputs reproduces the same arguments, so its results come back
+from the store instead of being computed again, even in a fresh server
+process. Editing the function's module or a listed dependency changes
+the fingerprint, so results computed by older code are never served.
+
+Values are pickled; the database is local to the app and only ever
+written by it. A value that no longer unpickles (a class changed shape)
+is treated as missing.
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Empty, LifoQueue
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.catalogue import DATA_DIR
+
+WORKSPACE_PATH = DATA_DIR / "workspace" / "workspace.db"
+POOL_SIZE = 4
+DEBOUNCE = 0.5   # seconds without new writes before a batch commits
+MAX_DELAY = 2.0  # longest a queued write waits
+BUSY_TIMEOUT_MS = 5000
+FORMAT_VERSION = 1  # bump when the pickled state or result layout changes
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inputs (
+    project TEXT NOT NULL REFERENCES projects(name) ON DELETE CASCADE,
+    page TEXT NOT NULL,
+    state BLOB NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (project, page)
+);
+CREATE TABLE IF NOT EXISTS results (
+    project TEXT NOT NULL REFERENCES projects(name) ON DELETE CASCADE,
+    digest TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value BLOB NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (project, digest)
+);
+CREATE INDEX IF NOT EXISTS results_digest ON results(digest);
+"""
+
+MISSING = object()  # result() when nothing is stored
+
+
+@dataclass(frozen=True)
+class ProjectInfo:
+    name: str
+    created: float
+    updated: float
+
+
+def result_digest(name: str, args: Sequence[Any], kwargs: Dict[str, Any], code: str = "") -> str:
+    """Stable key for a call: `name` with these arguments, computed by `code` (a fingerprint)."""
+    payload = pickle.dumps((FORMAT_VERSION, code, name, tuple(args), sorted(kwargs.items())), protocol=4)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def code_fingerprint(*objects: Any) -> str:
+    """Digest of the source files defining `objects` (functions, classes or modules)."""
+    digest = hashlib.sha256()
+    for obj in objects:
+        path = inspect.getsourcefile(obj) if not isinstance(obj, (str, Path)) else obj
+        digest.update(Path(path).read_bytes() if path and Path(path).is_file() else repr(obj).encode())
+    return digest.hexdigest()
+
+
+def _unpickle(data: bytes, what: str) -> Any:
+    """pickle.loads, or MISSING when the stored bytes no longer load."""
+    try:
+        return pickle.loads(data)
+    except Exception:
+        logger.warning("Ignoring a stored %s that no longer unpickles", what, exc_info=True)
+        return MISSING
+
+
+# ----------------------------
+# Connections
+# ----------------------------
+class ConnectionPool:
+    """
+    Up to `size` SQLite connections shared between threads, each handed
+    to one thread at a time. Connections are opened on first use.
+    """
+
+    def __init__(self, path: Path, size: int = POOL_SIZE):
+        self.path = Path(path)
+        self.size = size
+        self._idle: LifoQueue = LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False,
+                               isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            conn = self._open() if can_open else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                return
+
+
+# ----------------------------
+# Store
+# ----------------------------
+class Workspace:
+    """
+    Named projects with per-page input state and stored results. Safe to
+    share between sessions and threads; one instance per process.
+    """
+
+    def __init__(self, path: Path = WORKSPACE_PATH, pool_size: int = POOL_SIZE,
+                 debounce: float = DEBOUNCE, max_delay: float = MAX_DELAY):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.pool = ConnectionPool(self.path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+
+        # Queued operations by target, in arrival order:
+        # ("inputs", project, page) / ("result", project, digest) -> args,
+        # ("delete", project) -> None.
+        self._queue: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._inflight: "OrderedDict[Tuple, Any]" = OrderedDict()  # batch being committed
+        self._first = self._last = 0.0
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._writer = threading.Thread(target=self._run, name="workspace-writer", daemon=True)
+        self._writer.start()
+
+    # Writes ------------------------------------------------------
+    def _enqueue(self, key: Tuple, value: Any) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("workspace is closed")
+            now = time.monotonic()
+            if not self._queue:
+                self._first = now
+            self._last = now
+            self._queue.pop(key, None)
+            self._queue[key] = value
+            self._cond.notify_all()
+
+    def save_inputs(self, project: str, page: str, state: Dict[str, Any]) -> None:
+        """Queue `page`'s input state for `project`, creating the project if needed."""
+        self._enqueue(("inputs", project, page), (pickle.dumps(state, protocol=4), time.time()))
+
+    def put_result(self, project: str, name: str, digest: str, value: Any) -> None:
+        self._enqueue(("result", project, digest), (name, pickle.dumps(value, protocol=4), time.time()))
+
+    def delete_project(self, project: str) -> None:
+        with self._cond:
+            for key in [k for k in self._queue if k[1] == project]:
+                del self._queue[key]
+        self._enqueue(("delete", project), None)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._queue:
+                        now = time.monotonic()
+                        due = min(self._last + self.debounce, self._first + self.max_delay)
+                        if now >= due or self._closed:
+                            break
+                        self._cond.wait(due - now)
+                    elif self._closed:
+                        return
+                    else:
+                        self._cond.wait()
+                self._inflight, self._queue = self._queue, OrderedDict()
+                self._busy = True
+            try:
+                self._write(self._inflight)
+            except Exception:
+                logger.exception("Workspace write of %d changes failed", len(self._inflight))
+            finally:
+                with self._cond:
+                    self._inflight = OrderedDict()
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, batch: "OrderedDict[Tuple, Any]") -> None:
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key, value in batch.items():
+                    kind, project = key[0], key[1]
+                    if kind == "delete":
+                        conn.execute("DELETE FROM projects WHERE name = ?", (project,))
+                        continue
+                    stamp = value[-1]
+                    conn.execute(
+                        "INSERT INTO projects (name, created, updated) VALUES (?, ?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET updated = excluded.updated",
+                        (project, stamp, stamp),
+                    )
+                    if kind == "inputs":
+                        conn.execute("INSERT OR REPLACE INTO inputs VALUES (?, ?, ?, ?)", (project, key[2], *value))
+                    else:
+                        conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", (project, key[2], *value))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Commit queued writes now and wait for them; False on timeout."""
+        with self._cond:
+            self._first = self._last = float("-inf")
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        self.pool.close()
+
+    # Reads -------------------------------------------------------
+    def _pending(self) -> List[Tuple[Tuple, Any]]:
+        """Queued and in-flight changes, oldest first."""
+        with self._cond:
+            return list(self._inflight.items()) + list(self._queue.items())
+
+    def _queued(self, key: Tuple) -> Any:
+        """The newest pending value for `key`: MISSING if none, None if its project is being deleted."""
+        found = MISSING
+        for k, value in self._pending():
+            if k == ("delete", key[1]):
+                found = None
+            elif k == key:
+                found = value
+        return found
+
+    def projects(self) -> List[ProjectInfo]:
+        """Saved projects, most recently updated first, including queued ones."""
+        with self.pool.connection() as conn:
+            found = {row[0]: ProjectInfo(*row) for row in conn.execute("SELECT name, created, updated FROM projects")}
+        for key, value in self._pending():
+            if key[0] == "delete":
+                found.pop(key[1], None)
+            else:
+                old = found.get(key[1])
+                found[key[1]] = ProjectInfo(key[1], old.created if old else value[-1], value[-1])
+        return sorted(found.values(), key=lambda p: -p.updated)
+
+    def load_inputs(self, project: str, page: str) -> Optional[Dict[str, Any]]:
+        """The last saved state of `page` in `project`, or None."""
+        queued = self._queued(("inputs", project, page))
+        if queued is None:
+            return None
+        if queued is MISSING:
+            with self.pool.connection() as conn:
+                queued = conn.execute(
+                    "SELECT state FROM inputs WHERE project = ? AND page = ?", (project, page)
+                ).fetchone()
+            if queued is None:
+                return None
+        state = _unpickle(queued[0], "page state")
+        return None if state is MISSING else state
+
+    def result(self, digest: str) -> Any:
+        """A stored result from any project, or MISSING."""
+        for key, value in reversed(self._pending()):
+            if key[0] == "result" and key[2] == digest:
+                return _unpickle(value[1], "result")
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT value FROM results WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+        return _unpickle(row[0], "result") if row else MISSING
+
+
+@functools.lru_cache(maxsize=1)
+def default_workspace() -> Workspace:
+    return Workspace()
+
+
+# ----------------------------
+# Helpers used by the pages
+# ----------------------------
+PROJECT_KEY = "ws_project"
+VERSION_KEY = "ws_version"
+TABLES_KEY = "ws_tables"      # latest edited tables, by editor name
+BASE_KEY = "ws_table_base"    # tables restored from the store, by editor name
+SAVED_KEY = "ws_saved"        # digest of what autosave last queued, per page
+OPENED_KEY = "ws_opened"      # pages restored for the open project
+
+
+def active_project() -> Optional[str]:
+    """The project open in this session, if any."""
+    try:
+        import streamlit as st
+        return st.session_state.get(PROJECT_KEY)
+    except Exception:
+        return None
+
+
+def persisted(name: str, depends: Sequence[Any] = (), project: Callable[[], Optional[str]] = active_project,
+              store: Callable[[], Workspace] = default_workspace) -> Callable[[Callable], Callable]:
+    """
+    Look calls up in the store before computing them, and store new
+    results under the open project. `depends` lists the modules (or
+    functions) doing the real work; together with the function's own
+    module they fingerprint the code, so editing any of them invalidates
+    stored results. Goes inside the Streamlit cache:
+
+        @counted_cache(st.cache_data, "simulate")
+        @persisted("simulate", depends=(montecarlo,))
+        def simulate(...): ...
+    """
+    def decorator(fn: Callable) -> Callable:
+        code = code_fingerprint(fn, *depends)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            digest = result_digest(name, args, kwargs, code)
+            value = store().result(digest)
+            if value is MISSING:
+                value = fn(*args, **kwargs)
+                current = project()
+                if current:
+                    store().put_result(current, name, digest, value)
+            return value
+        return wrapper
+    return decorator
+
+
+def _capture(prefixes: Tuple[str, ...]) -> Dict[str, Any]:
+    import streamlit as st
+
+    state = {
+        key: st.session_state[key]
+        for key in st.session_state
+        if key.startswith(prefixes) and "@" not in key and not key.endswith("_btn")
+    }
+    return {"widgets": state, "tables": dict(st.session_state.get(TABLES_KEY, {}))}
+
+
+def _restore(project: str, page: str, state: Optional[Dict[str, Any]]) -> None:
+    import streamlit as st
+
+    st.session_state[PROJECT_KEY] = project
+    st.session_state[OPENED_KEY] = {page}
+    st.session_state["ws_name"] = project
+    if state:
+        for key, value in state["widgets"].items():
+            st.session_state[key] = value
+        st.session_state[BASE_KEY] = dict(state["tables"])
+        st.session_state[TABLES_KEY] = dict(state["tables"])
+        st.session_state[SAVED_KEY] = {page: hashlib.sha256(pickle.dumps(state, protocol=4)).hexdigest()}
+    st.session_state[VERSION_KEY] = st.session_state.get(VERSION_KEY, 0) + 1
+
+
+def _open(page: str) -> None:
+    import streamlit as st
+
+    project = st.session_state.get("ws_choice")
+    if project:
+        _restore(project, page, default_workspace().load_inputs(project, page))
+
+
+def _save(page: str, prefixes: Tuple[str, ...]) -> None:
+    import streamlit as st
+
+    project = st.session_state.get("ws_name", "").strip()
+    if project:
+        default_workspace().save_inputs(project, page, _capture(prefixes))
+        st.session_state[PROJECT_KEY] = project
+        st.session_state[OPENED_KEY] = {page}
+        st.session_state["ws_choice"] = project
+        st.toast(f"Saved to {project}")
+
+
+def _delete() -> None:
+    import streamlit as st
+
+    project = st.session_state.get("ws_choice")
+    if project:
+        default_workspace().delete_project(project)
+        if st.session_state.get(PROJECT_KEY) == project:
+            st.session_state[PROJECT_KEY] = None
+            st.session_state["ws_name"] = ""
+        st.session_state["ws_choice"] = None
+
+
+def sidebar(page: str, prefixes: Tuple[str, ...]) -> Optional[str]:
+    """
+    Workspace controls in the sidebar. Call at the top of a page, before
+    its widgets: restores the open project's state for `page` on first
+    visit and autosaves the page's widgets (keys starting with
+    `prefixes`) and editor tables on every full rerun that changed them.
+    Widgets inside fragments need @autosaved on the fragment as well.
+    """
+    import streamlit as st
+
+    store = default_workspace()
+    project = st.session_state.get(PROJECT_KEY)
+    if project and page not in st.session_state.get(OPENED_KEY, set()):
+        state = store.load_inputs(project, page)
+        opened = st.session_state.get(OPENED_KEY, set()) | {page}
+        _restore(project, page, state)
+        st.session_state[OPENED_KEY] = opened
+
+    with st.sidebar:
+        st.markdown("### Workspace")
+        names = [p.name for p in store.projects()]
+        if st.session_state.get("ws_choice") not in names:
+            st.session_state["ws_choice"] = project if project in names else None
+        st.selectbox("Saved projects", names, placeholder="No project open", key="ws_choice")
+        col1, col2 = st.columns(2)
+        chosen = st.session_state.get("ws_choice")
+        col1.button("Open", on_click=_open, args=(page,), disabled=not chosen, key="ws_open")
+        col2.button("Delete", on_click=_delete, disabled=not chosen, key="ws_delete")
+        name = st.text_input("Save as", placeholder="Project name", key="ws_name")
+        st.button("Save", on_click=_save, args=(page, prefixes), disabled=not name.strip(), key="ws_save")
+        st.toggle("Autosave changes", value=True, key="ws_autosave")
+        if project:
+            st.caption(f"Open project: **{project}**")
+
+    autosave(page, prefixes)
+    return project
+
+
+def autosave(page: str, prefixes: Tuple[str, ...]) -> None:
+    """
+    Queue the page's state for the open project if autosave is on and the
+    state changed since it was last queued. sidebar() calls this on full
+    reruns; fragments call it too (see autosaved), since a widget inside
+    a fragment reruns only the fragment.
+    """
+    import streamlit as st
+
+    project = st.session_state.get(PROJECT_KEY)
+    if not project or not st.session_state.get("ws_autosave", True):
+        return
+    state = _capture(prefixes)
+    digest = hashlib.sha256(pickle.dumps(state, protocol=4)).hexdigest()
+    saved = st.session_state.setdefault(SAVED_KEY, {})
+    if saved.get(page) != digest:
+        default_workspace().save_inputs(project, page, state)
+        saved[page] = digest
+
+
+def autosaved(page: str, prefixes: Tuple[str, ...]) -> Callable[[Callable], Callable]:
+    """
+    Decorator for fragment functions: autosave after every run, including
+    early returns. Goes under @st.fragment.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                autosave(page, prefixes)
+        return wrapper
+    return decorator
+
+
+def editor(name: str, default: Any, **kwargs: Any) -> Any:
+    """
+    st.data_editor whose table is saved with the project. Opening a
+    project replaces `default` with the saved table.
+    """
+    import streamlit as st
+
+    base = st.session_state.get(BASE_KEY, {}).get(name, default)
+    table = st.data_editor(base, key=f"{name}@{st.session_state.get(VERSION_KEY, 0)}", **kwargs)
+    st.session_state.setdefault(TABLES_KEY, {})[name] = table
+    return table